@@ -45,6 +45,7 @@ import xRedUtils.maths as maths
 import xRedUtils.modules as modules
 import xRedUtils.objects as objects
 import xRedUtils.paths as paths
+import xRedUtils.probabilistic as probabilistic
 import xRedUtils.regexes as regexes
 import xRedUtils.strings as strings
 import xRedUtils.system as system
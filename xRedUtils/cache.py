@@ -4,9 +4,23 @@ This module provides classes/objects made for memory cache.
 ### Objects:
 - `Cache` - Same as `dict` just renamed for better typing.
 - `LimitedCache` - Classic limited cache, cannot exceed `max_capacity`.
-- `BetterLimitedCache` - Better limited cache, can manipulate with `max_capacity` in the runtime.
-- `LRUCache` - Classic LRU cache.
-- `BetterLRU` - Better LRU cache, can manipulate with `max_capacity` in the runtime.
+- `BetterLimitedCache` - Better limited cache, can manipulate with `max_capacity` and optional `max_weight` in the runtime.
+- `LRUCache` - Classic LRU cache, O(1) with `hits`/`misses`/`inserts`/`evictions` counters.
+- `BetterLRU` - Better LRU cache, can manipulate with `max_capacity` and optional `max_weight` in the runtime.
+- `ConcurrentLimitedCache` - Thread-safe limited cache with lock striping, can manipulate with `max_capacity` in the runtime.
+- `ConcurrentLRU` - Thread-safe, sharded LRU cache with lock striping, can manipulate with `max_capacity` in the runtime.
+- `TTLCache` - Time expiring LRU cache with per key TTL, can manipulate with `max_capacity` in the runtime.
+- `TinyLFUCache` - Scan resistant W-TinyLFU cache, same API as `LRUCache`.
+- `ARCCache` - Adaptive replacement cache, can manipulate with `max_capacity` in the runtime.
+- `TwoQueueCache` - 2Q cache, can manipulate with `max_capacity` in the runtime.
+- `DiskCache` - Persistent cache, append-only log with a memory mapped index and an `LRUCache` front.
+- `SharedMemoryCache` - Cache shared by processes of one host, CLOCK eviction.
+- `CacheInfo` - Statistics returned by `cache_info()` of memoized functions.
+- `CacheStats` - Opt-in counters, hit ratio series and latency histograms, see `enable_stats` of every cache.
+
+### Functions:
+- `default_weigher` - Estimates memory size of a value in bytes, used by `max_weight`.
+- `memoize` - Memoization decorator backed by `BetterLRU`/`TTLCache`, shares in-flight computations.
 
 ### Usage:
 ```py
@@ -16,21 +30,208 @@ from xRedUtils import cache
 ```
 """
 
-import sys
+import sys, threading, time, math, functools, inspect, itertools, os, io, mmap, struct, zlib, pickle, multiprocessing, copyreg
 sys.dont_write_bytecode = True
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from collections.abc import ItemsView, ValuesView
+from multiprocessing import shared_memory
 
-from .annotations import K, V, Iterator
+from .annotations import K, V, F, Any, NUMBER, Callable, Generic, Hashable, Iterator, Mapping, MutableMapping, NamedTuple
+from .times import convert_to_seconds, OPTIONS
+from .files import open_file, save_file
+from .hashing import digest
 
 __all__: tuple[str, ...] = (
-    "Cache", "LimitedCache", "BetterLimitedCache", "LRUCache", "BetterLRU"
+    "Cache", "LimitedCache", "BetterLimitedCache", "LRUCache", "BetterLRU",
+    "ConcurrentLimitedCache", "ConcurrentLRU", "TTLCache", "TinyLFUCache", "ARCCache", "TwoQueueCache", "DiskCache", "SharedMemoryCache", "CacheInfo", "CacheStats",
+    "default_weigher", "memoize"
 )
 
+# sentinel for `pop`, `None` is a valid cached value
+_MISSING: Any = object()
+
+
+def default_weigher(value: Any) -> int:
+    """
+    Estimates memory size of a value in bytes.
+
+    `str`, `bytes` and `bytearray` are exact (`sys.getsizeof`), `memoryview` counts its buffer.
+    `list`, `tuple`, `set`, `frozenset` and `dict` add the average size of up to 8 sampled items per item,
+    so big containers are weighed in constant time. Anything else is `sys.getsizeof`.
+
+    ### Parameters:
+    - `value` - Value to weigh.
+
+    ### Returns:
+    - Estimated size in bytes.
+    """
+    size: int = sys.getsizeof(value)
+    kind: type = type(value)
+
+    if kind is str or kind is bytes or kind is bytearray:
+        return size
+    
+    if kind is memoryview:
+        return size + value.nbytes
+
+    if kind is list or kind is tuple or kind is set or kind is frozenset or kind is dict:
+        if not (length := len(value)):
+            return size
+        
+        sample: list[Any] = list(itertools.islice(value.items() if kind is dict else value, 8))
+        sampled: int = sum(sys.getsizeof(item) if kind is not dict else sys.getsizeof(item[0]) + sys.getsizeof(item[1]) for item in sample)
+        return size + sampled * length // len(sample)
+
+    return size
+
+class CacheStats:
+    def __init__(self, window: int = 1_000, series_length: int = 60) -> None:
+        """
+        Counters, hit ratio time series and latency histograms of one cache. Made by `enable_stats`.
+
+        ### Parameters:
+        - `window` - Number of lookups per hit ratio sample.
+        - `series_length` - Number of kept hit ratio samples, oldest are dropped.
+
+        Latencies are counted in power of two nanosecond buckets (`le` bounds), like Prometheus histograms.
+        Updates are not locked, under heavy thread contention counts can be slightly off.
+        """
+        self.hits: int = 0
+        self.misses: int = 0
+        self.inserts: int = 0
+        self.evictions: int = 0
+        
+        self._window: int = window
+        self._window_hits: int = 0
+        self._window_lookups: int = 0
+        self.series: deque[tuple[float, float]] = deque(maxlen=series_length)
+
+        # bucket `i` counts latencies below `2 ** i` ns
+        self.latency: dict[str, list[int]] = {"get": [0] * 64, "put": [0] * 64}
+        self.latency_sum: dict[str, int] = {"get": 0, "put": 0}
+
+    def record_get(self, hit: bool, elapsed: int) -> None:
+        if hit:
+            self.hits += 1
+            self._window_hits += 1
+        else:
+            self.misses += 1
+
+        self.latency["get"][min(elapsed.bit_length(), 63)] += 1
+        self.latency_sum["get"] += elapsed
+
+        self._window_lookups += 1
+        if self._window_lookups == self._window:
+            self.series.append((time.time(), self._window_hits / self._window))
+            self._window_hits = self._window_lookups = 0
+
+    def record_put(self, inserted: int, evicted: int, elapsed: int) -> None:
+        self.inserts += inserted
+        self.evictions += evicted
+        self.latency["put"][min(elapsed.bit_length(), 63)] += 1
+        self.latency_sum["put"] += elapsed
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def reset(self) -> None:
+        self.__init__(self._window, self.series.maxlen)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Plain `dict` copy of every counter, safe to serialize or export."""
+        latency: dict[str, dict[str, Any]] = {}
+        
+        for operation, buckets in self.latency.items():
+            latency[operation] = {
+                "count": sum(buckets),
+                "sum_ns": self.latency_sum[operation],
+                "buckets": {1 << index: count for index, count in enumerate(buckets) if count}
+            }
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "inserts": self.inserts,
+            "evictions": self.evictions,
+            "hit_ratio": self.hit_ratio,
+            "hit_ratio_series": list(self.series),
+            "latency": latency
+        }
+
+class _Instrumented:
+    """Opt-in `CacheStats` for caches with `get(key, default)` and `put(key, value)`."""
+    _stats: CacheStats | None = None
+    # kept by `put` and eviction paths of every cache, instrumented `put` only reads the difference
+    inserts: int = 0
+    evictions: int = 0
+
+    def enable_stats(self, window: int = 1_000, series_length: int = 60) -> CacheStats:
+        """
+        Starts recording `CacheStats` of `get`/`put` (and `cache[key] = value`).
+
+        Instrumented `get`/`put` are set on the instance, shadowing the class methods,
+        so a cache without stats runs the exact same code as before.
+
+        ### Returns:
+        - `CacheStats` object, also available as `stats`.
+        """
+        if self._stats is not None:
+            return self._stats
+        
+        stats: CacheStats = CacheStats(window, series_length)
+        get, put = type(self).get.__get__(self), type(self).put.__get__(self)
+        clock: Callable[[], int] = time.perf_counter_ns
+
+        def instrumented_get(key: Any, default: Any = None) -> Any:
+            start: int = clock()
+            value: Any = get(key, _MISSING)
+            stats.record_get(value is not _MISSING, clock() - start)
+            return default if value is _MISSING else value
+
+        def instrumented_put(key: Any, value: Any, *args, **kwargs) -> None:
+            start: int = clock()
+            inserts, evictions = self.inserts, self.evictions
+            
+            put(key, value, *args, **kwargs)
+            stats.record_put(self.inserts - inserts, self.evictions - evictions, clock() - start)
+
+        self.get = functools.update_wrapper(instrumented_get, get)
+        self.put = functools.update_wrapper(instrumented_put, put)
+        self._stats = stats
+        return stats
+
+    def disable_stats(self) -> None:
+        """Stops recording and restores the plain `get`/`put`."""
+        if self._stats is None:
+            return
+        
+        del self.get, self.put
+        self._stats = None
+
+    @property
+    def stats(self) -> CacheStats | None:
+        """`CacheStats` if enabled, otherwise `None`."""
+        return self._stats
+
+    def stats_snapshot(self) -> dict[str, Any]:
+        """
+        `CacheStats.snapshot` with current `size` and `max_capacity` of the cache.
+
+        ### Raises:
+        - `RuntimeError` - If stats are not enabled.
+        """
+        if self._stats is None:
+            raise RuntimeError("Stats are disabled. Use `enable_stats`.")
+
+        return self._stats.snapshot() | {"size": len(self), "max_capacity": getattr(self, "max_capacity", None)}
+
 class Cache(dict[K, V]):
     """Same as `dict` just renamed for better typing."""
 
 
-class LimitedCache(Cache[K, V]):
+class LimitedCache(Cache[K, V], _Instrumented):
     def __init__(self, max_capacity: int) -> None:
         """Classic limited cache, cannot exceed `max_capacity`."""
         super().__init__()
@@ -51,16 +252,29 @@ class LimitedCache(Cache[K, V]):
         if len(self) == self._max_capacity:
             raise MemoryError(f"Max capacty reached! Limit: {self._max_capacity}")
         else:
+            size: int = len(self)
             super().__setitem__(key, value)
+            self.inserts += len(self) - size
 
     def __setitem__(self, key: K, value: V) -> None:
         """Overrides standard dictionary assignment to ensure LimitedCache behavior."""
         return self.put(key, value)
 
 class BetterLimitedCache(LimitedCache[K, V]):
-    def __init__(self, max_capacity: int) -> None:
-        """Better limited cache, can manipulate with `max_capacity` in the runtime."""
+    def __init__(self, max_capacity: int, max_weight: int | None = None, weigher: Callable[[V], int] | None = None) -> None:
+        """
+        Better limited cache, can manipulate with `max_capacity` in the runtime.
+
+        ### Parameters:
+        - `max_capacity` - Max number of items.
+        - `max_weight` - Optional max total weight of values (bytes with the default `weigher`).
+        - `weigher` - Function returning weight of a value, defaults to `default_weigher`.
+        """
         super().__init__(max_capacity)
+        self._max_weight: int | None = max_weight
+        self._weigher: Callable[[V], int] = weigher or default_weigher
+        self._weights: dict[K, int] | None = None if max_weight is None else {}
+        self._weight: int = 0
 
     @property
     def max_capacity(self) -> int:
@@ -69,25 +283,133 @@ class BetterLimitedCache(LimitedCache[K, V]):
     @max_capacity.setter
     def max_capacity(self, size: int) -> None:
         return self.change_size(int(size))
+
+    @property
+    def max_weight(self) -> int | None:
+        return self._max_weight
+
+    @max_weight.setter
+    def max_weight(self, weight: int) -> None:
+        return self.change_size(max_weight=int(weight))
+
+    @property
+    def weight(self) -> int:
+        """Total weight of stored values, `0` if `max_weight` is not used."""
+        return self._weight
+
+    def put(self, key: K, value: V) -> None:
+        """
+        Adds a new key-value pair, returns error if `max_capacity` or `max_weight` is reached.
+        """
+        if self._weights is None:
+            return super().put(key, value)
+
+        weight: int = self._weigher(value)
+        old: int = self._weights.get(key, 0)
+        
+        if self._weight - old + weight > self._max_weight:
+            raise MemoryError(f"Max weight reached! Limit: {self._max_weight}")
+        
+        super().put(key, value)
+        self._weights[key] = weight
+        self._weight += weight - old
+
+    def pop(self, key: K, default: V = _MISSING) -> V:
+        if self._weights is not None and key in self:
+            self._weight -= self._weights.pop(key)
+
+        return super().pop(key) if default is _MISSING else super().pop(key, default)
+
+    def popitem(self) -> tuple[K, V]:
+        key, value = super().popitem()
+        if self._weights is not None:
+            self._weight -= self._weights.pop(key)
+        return key, value
+
+    def clear(self) -> None:
+        super().clear()
+        if self._weights is not None:
+            self._weights.clear()
+            self._weight = 0
+
+    def __delitem__(self, key: K) -> None:
+        self.pop(key)
     
-    def change_size(self, new_max_capacity: int) -> None:
+    def change_size(self, new_max_capacity: int | None = None, max_weight: int | None = None) -> None:
         """
-        Adjusts cache size. If shrinking, evicts first items.
+        Adjusts cache size and/or weight budget. If shrinking, evicts first items.
+        Setting `max_weight` on a cache without one weighs every stored value.
         ### WARNING: shrinking can lead to data loss! Use with your own risk.
         """
-        self._max_capacity = new_max_capacity
+        if new_max_capacity is not None:
+            self._max_capacity = new_max_capacity
+
+        if max_weight is not None:
+            if self._weights is None:
+                self._weights = {key: self._weigher(value) for key, value in self.items()}
+                self._weight = sum(self._weights.values())
+            self._max_weight = max_weight
         
         # using iter for faster and more optimized removal
-        keys: Iterator[K] = iter(self)
-        while len(self) > new_max_capacity:
+        keys: Iterator[K] = iter(list(self))
+        while len(self) > self._max_capacity or (self._weights is not None and self._weight > self._max_weight):
             self.pop(next(keys))
 
 
-class LRUCache(OrderedDict[K, V]):
+class _LRUValuesView(ValuesView):
+    """Values from the least recently used, does not update cache order."""
+    __slots__ = ()
+
+    def __contains__(self, value: object) -> bool:
+        return any(link[3] is value or link[3] == value for link in self._mapping._links())
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter([link[3] for link in self._mapping._links()])
+
+    def __reversed__(self) -> Iterator[Any]:
+        return iter([link[3] for link in self._mapping._links(reverse=True)])
+
+class _LRUItemsView(ItemsView):
+    """Key-value pairs from the least recently used, does not update cache order."""
+    __slots__ = ()
+
+    def __contains__(self, item: object) -> bool:
+        key, value = item
+        link: list[Any] | None = self._mapping._map.get(key)
+        return link is not None and (link[3] is value or link[3] == value)
+
+    def __iter__(self) -> Iterator[tuple[Any, Any]]:
+        return iter([(link[2], link[3]) for link in self._mapping._links()])
+
+    def __reversed__(self) -> Iterator[tuple[Any, Any]]:
+        return iter([(link[2], link[3]) for link in self._mapping._links(reverse=True)])
+
+class LRUCache(MutableMapping[K, V], _Instrumented):
+    # instance attributes that are rebuilt by `__setstate__` (links) or bound to the original (stats)
+    _TRANSIENT: frozenset[str] = frozenset(("_map", "_root", "_stats", "get", "put"))
+
     def __init__(self, max_capacity: int) -> None:
-        """Classic LRU cache."""    
-        super().__init__()
+        """
+        Classic LRU cache.
+
+        Backed by a `dict` of links and a circular doubly linked list, so a hit costs
+        a single hash lookup. Keeps `hits`, `misses`, `inserts` and `evictions` counters.
+
+        It is a `MutableMapping`, not a `dict` subclass: `isinstance(cache, dict)` is `False`
+        and `json.dumps` needs `dict(cache)`. `keys`/`values`/`items` are live views, `copy`,
+        `copy.deepcopy`, `pickle` and `|` keep the cache order. Stats are not copied.
+        """
         self._max_capacity: int = max_capacity
+        self._map: dict[K, list[Any]] = {}
+
+        # links are `[prev, next, key, value]`, root.next is the least recently used
+        self._root: list[Any] = []
+        self._root[:] = [self._root, self._root, None, None]
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.inserts: int = 0
+        self.evictions: int = 0
 
     @property
     def max_capacity(self) -> int:
@@ -99,42 +421,246 @@ class LRUCache(OrderedDict[K, V]):
 
     def touch(self, key: K, default: V | None = None) -> V | None:
         """Gets value without updating cache order."""
-        return super().get(key, default)
+        link: list[Any] | None = self._map.get(key)
+        return default if link is None else link[3]
 
     def get(self, key: K, default: V | None = None) -> V | None:
         """Retrieves a value and moves it to the top (most recently used)."""
-        if key in self:
-            self.move_to_end(key, last=True)
-            return super().get(key)
-        
-        return default
+        link: list[Any] | None = self._map.get(key)
+        if link is None:
+            self.misses += 1
+            return default
+
+        # unlink and re-insert right before root
+        prev, nxt, _, value = link
+        prev[1] = nxt
+        nxt[0] = prev
+
+        root: list[Any] = self._root
+        last: list[Any] = root[0]
+        last[1] = root[0] = link
+        link[0] = last
+        link[1] = root
+
+        self.hits += 1
+        return value
 
     def put(self, key: K, value: V) -> None:
         """
         Adds a new key-value pair, moves it to the top, 
         and removes the least recently used item if `max_capacity` is exceeded.
         """
-        if key in self:
-            self.move_to_end(key, last=True)
+        root: list[Any] = self._root
+        link: list[Any] | None = self._map.get(key)
+
+        if link is not None:
+            link[3] = value
+            
+            prev, nxt = link[0], link[1]
+            prev[1] = nxt
+            nxt[0] = prev
+            
+            last: list[Any] = root[0]
+            last[1] = root[0] = link
+            link[0] = last
+            link[1] = root
+            return
+
+        last = root[0]
+        last[1] = root[0] = self._map[key] = [last, root, key, value]
+        self.inserts += 1
+
+        if len(self._map) > self._max_capacity:
+            self._evict()
 
-        self
-        super().__setitem__(key, value)
+    def move_to_end(self, key: K, last: bool = True) -> None:
+        """Moves an existing key to the top (`last=True`) or to the bottom (`last=False`)."""
+        link: list[Any] = self._map[key]
+        self._unlink(link)
+        self._link(link, last)
 
-        if len(self) > self._max_capacity:
-            self.popitem(last=False)
+    def popitem(self, last: bool = True) -> tuple[K, V]:
+        """Removes and returns the most recently used (`last=True`) or the least recently used (`last=False`) pair."""
+        if not self._map:
+            raise KeyError("popitem(): cache is empty")
+
+        link: list[Any] = self._root[0] if last else self._root[1]
+        self._remove(link)
+        return link[2], link[3]
+
+    def pop(self, key: K, default: V = _MISSING) -> V:
+        """Removes the key and returns its value, or `default` if it does not exist."""
+        link: list[Any] | None = self._map.get(key)
+        if link is None:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+
+        self._remove(link)
+        return link[3]
+
+    def clear(self) -> None:
+        """Removes all items. Counters are kept."""
+        self._map.clear()
+        self._root[:] = [self._root, self._root, None, None]
+
+    def _evict(self) -> None:
+        """Removes the least recently used item and counts it as an eviction."""
+        self._remove(self._root[1])
+        self.evictions += 1
+
+    def _remove(self, link: list[Any]) -> None:
+        """Unlinks the item and forgets its key. Every removal goes through here."""
+        self._unlink(link)
+        del self._map[link[2]]
+
+    def _unlink(self, link: list[Any]) -> None:
+        prev, nxt = link[0], link[1]
+        prev[1] = nxt
+        nxt[0] = prev
+
+    def _link(self, link: list[Any], last: bool = True) -> None:
+        root: list[Any] = self._root
+        if last:
+            prev, nxt = root[0], root
+        else:
+            prev, nxt = root, root[1]
+        
+        prev[1] = nxt[0] = link
+        link[0] = prev
+        link[1] = nxt
 
     def __setitem__(self, key: K, value: V) -> None:
         """Overrides standard dictionary assignment to ensure LRU behavior."""
         return self.put(key, value)
 
     def __getitem__(self, key: K) -> V:
-        """Overrides standard dictionary retrieval to maintain LRU order."""
-        return self.get(key)
+        """Overrides standard dictionary retrieval to maintain LRU order. Raises `KeyError` if the key does not exist."""
+        link: list[Any] | None = self._map.get(key)
+        if link is None:
+            self.misses += 1
+            raise KeyError(key)
+
+        prev, nxt, _, value = link
+        prev[1] = nxt
+        nxt[0] = prev
+
+        root: list[Any] = self._root
+        last: list[Any] = root[0]
+        last[1] = root[0] = link
+        link[0] = last
+        link[1] = root
+
+        self.hits += 1
+        return value
+
+    def __delitem__(self, key: K) -> None:
+        self._remove(self._map[key])
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._map
+
+    def __len__(self) -> int:
+        return len(self._map)
+
+    def __iter__(self) -> Iterator[K]:
+        """Iterates from the least recently used to the most recently used key."""
+        # snapshot, so `get` in the loop body cannot reorder what we are walking
+        return iter([link[2] for link in self._links()])
+
+    def __reversed__(self) -> Iterator[K]:
+        return iter([link[2] for link in self._links(reverse=True)])
+
+    def values(self) -> ValuesView[V]:
+        """Values from the least recently used, does not update cache order."""
+        return _LRUValuesView(self)
+
+    def items(self) -> ItemsView[K, V]:
+        """Key-value pairs from the least recently used, does not update cache order."""
+        return _LRUItemsView(self)
+
+    def _links(self, reverse: bool = False) -> list[list[Any]]:
+        direction: int = 0 if reverse else 1
+        root: list[Any] = self._root
+        link: list[Any] = root[direction]
+        links: list[list[Any]] = []
+        
+        while link is not root:
+            links.append(link)
+            link = link[direction]
+        return links
+
+    def __getstate__(self) -> dict[str, Any]:
+        # link tails (`key, value, ...`) instead of the linked list, nested links hit the recursion limit of pickle/deepcopy
+        state: dict[str, Any] = {name: value for name, value in self.__dict__.items() if name not in self._TRANSIENT}
+        state["_links"] = [link[2:] for link in self._links()]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        state = dict(state)
+        links: list[list[Any]] = state.pop("_links")
+        self.__dict__.update(state)
+
+        self._map = {}
+        self._root = []
+        self._root[:] = [self._root, self._root, None, None]
+        for tail in links:
+            link: list[Any] = [None, None, *tail]
+            self._map[link[2]] = link
+            self._link(link)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return copyreg.__newobj__, (type(self),), self.__getstate__()
+
+    def __copy__(self) -> "LRUCache[K, V]":
+        new: LRUCache[K, V] = type(self).__new__(type(self))
+        new.__setstate__(self.__getstate__())
+        return new
+
+    def copy(self) -> "LRUCache[K, V]":
+        """Shallow copy with the same order, capacity and counters."""
+        return self.__copy__()
+
+    def __or__(self, other: Any) -> "LRUCache[K, V]":
+        if not isinstance(other, Mapping):
+            return NotImplemented
+
+        new: LRUCache[K, V] = self.copy()
+        new.update(other)
+        return new
+
+    def __ror__(self, other: Any) -> "LRUCache[K, V]":
+        if not isinstance(other, Mapping):
+            return NotImplemented
+
+        new: LRUCache[K, V] = self.copy()
+        new.clear()
+        new.update(other)
+        new.update(self.items())
+        return new
+
+    def __ior__(self, other: Any) -> "LRUCache[K, V]":
+        self.update(other)
+        return self
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())})"
 
 class BetterLRU(LRUCache[K, V]):
-    def __init__(self, max_capacity: int) -> None:
-        """Better LRU cache, can manipulate with `max_capacity` in the runtime."""    
+    def __init__(self, max_capacity: int, max_weight: int | None = None, weigher: Callable[[V], int] | None = None) -> None:
+        """
+        Better LRU cache, can manipulate with `max_capacity` in the runtime.
+
+        ### Parameters:
+        - `max_capacity` - Max number of items.
+        - `max_weight` - Optional max total weight of values (bytes with the default `weigher`), least recently used items are evicted to fit.
+        - `weigher` - Function returning weight of a value, defaults to `default_weigher`.
+        """
         super().__init__(max_capacity)
+        self._max_weight: int | None = max_weight
+        self._weigher: Callable[[V], int] = weigher or default_weigher
+        self._weights: dict[K, int] | None = None if max_weight is None else {}
+        self._weight: int = 0
 
     @property
     def max_capacity(self) -> int:
@@ -143,13 +669,2103 @@ class BetterLRU(LRUCache[K, V]):
     @max_capacity.setter
     def max_capacity(self, size: int) -> None:
         return self.change_size(int(size))
+
+    @property
+    def max_weight(self) -> int | None:
+        return self._max_weight
+
+    @max_weight.setter
+    def max_weight(self, weight: int) -> None:
+        return self.change_size(max_weight=int(weight))
+
+    @property
+    def weight(self) -> int:
+        """Total weight of stored values, `0` if `max_weight` is not used."""
+        return self._weight
+
+    def put(self, key: K, value: V) -> None:
+        """
+        Adds a new key-value pair, moves it to the top, and removes the least recently used
+        items while `max_capacity` or `max_weight` is exceeded.
+        """
+        if self._weights is None:
+            return super().put(key, value)
+        
+        self._weigh(key, value)
+        super().put(key, value)
+        self._shed_weight()
+
+    def _weigh(self, key: K, value: V) -> None:
+        weight: int = self._weigher(value)
+        self._weight += weight - self._weights.get(key, 0)
+        self._weights[key] = weight
+
+    def _shed_weight(self) -> None:
+        # an item heavier than `max_weight` evicts itself too
+        while self._weight > self._max_weight and self._map:
+            self._evict()
+
+    def _remove(self, link: list[Any]) -> None:
+        super()._remove(link)
+        if self._weights is not None:
+            self._weight -= self._weights.pop(link[2])
+
+    def __getstate__(self) -> dict[str, Any]:
+        state: dict[str, Any] = super().__getstate__()
+        if self._weights is not None:
+            state["_weights"] = dict(self._weights)
+        return state
+
+    def clear(self) -> None:
+        super().clear()
+        if self._weights is not None:
+            self._weights.clear()
+            self._weight = 0
     
+    def change_size(self, new_max_capacity: int | None = None, max_weight: int | None = None) -> None:
+        """
+        Adjusts cache size and/or weight budget. If shrinking, evicts the oldest items.
+        Setting `max_weight` on a cache without one weighs every stored value.
+        ### WARNING: shrinking can lead to data loss! Use with your own risk.
+        """
+        if new_max_capacity is not None:
+            self._max_capacity = new_max_capacity
+
+        if max_weight is not None:
+            if self._weights is None:
+                self._weights = {link[2]: self._weigher(link[3]) for link in LRUCache._links(self)}
+                self._weight = sum(self._weights.values())
+            self._max_weight = max_weight
+
+        while len(self._map) > self._max_capacity:
+            self._evict()
+        
+        if self._weights is not None:
+            self._shed_weight()
+
+
+def _split_capacity(max_capacity: int, shards: int) -> list[int]:
+    """Splits `max_capacity` between shards, so the sum never exceeds it."""
+    base, extra = divmod(max_capacity, shards)
+    return [base + (1 if i < extra else 0) for i in range(shards)]
+
+class ConcurrentLimitedCache(MutableMapping[K, V], _Instrumented):
+    def __init__(self, max_capacity: int, shards: int = 16) -> None:
+        """
+        Thread-safe limited cache, cannot exceed `max_capacity`, can manipulate with it in the runtime.
+
+        Keys are spread over `shards` dictionaries, each guarded by its own lock (lock striping),
+        so threads working on different keys rarely wait for each other.
+        Only inserting or removing a key touches the shared size counter.
+        """
+        self._max_capacity: int = max_capacity
+        self._size: int = 0
+        self._size_lock: threading.Lock = threading.Lock()
+
+        self._shard_count: int = max(1, shards)
+        self._shards: list[dict[K, V]] = [{} for _ in range(self._shard_count)]
+        self._locks: list[threading.Lock] = [threading.Lock() for _ in range(self._shard_count)]
+
+    @property
+    def max_capacity(self) -> int:
+        return self._max_capacity
+
+    @max_capacity.setter
+    def max_capacity(self, size: int) -> None:
+        return self.change_size(int(size))
+
+    def change_size(self, new_max_capacity: int) -> None:
+        """
+        Adjusts cache size. If shrinking, evicts items shard by shard, oldest first.
+        ### WARNING: shrinking can lead to data loss! Use with your own risk.
+        """
+        with self._size_lock:
+            self._max_capacity = new_max_capacity
+
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                while shard and self._size > new_max_capacity:
+                    shard.pop(next(iter(shard)))
+                    
+                    with self._size_lock:
+                        self._size -= 1
+
+    def _shard(self, key: K) -> int:
+        return hash(key) % self._shard_count
+
+    def put(self, key: K, value: V) -> None:
+        """
+        Adds a new key-value pair, returns error if `max_capacity` is reached.
+        """
+        index: int = self._shard(key)
+        shard: dict[K, V] = self._shards[index]
+
+        with self._locks[index]:
+            if key not in shard:
+                with self._size_lock:
+                    if self._size >= self._max_capacity:
+                        raise MemoryError(f"Max capacty reached! Limit: {self._max_capacity}")
+                    self._size += 1
+                    self.inserts += 1
+
+            shard[key] = value
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        index: int = self._shard(key)
+
+        with self._locks[index]:
+            return self._shards[index].get(key, default)
+
+    def pop(self, key: K, default: V = _MISSING) -> V:
+        """Removes the key and returns its value, or `default` if it does not exist."""
+        index: int = self._shard(key)
+        shard: dict[K, V] = self._shards[index]
+
+        with self._locks[index]:
+            if key not in shard:
+                if default is _MISSING:
+                    raise KeyError(key)
+                return default
+            
+            with self._size_lock:
+                self._size -= 1
+            return shard.pop(key)
+
+    def clear(self) -> None:
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                with self._size_lock:
+                    self._size -= len(shard)
+                shard.clear()
+
+    def __setitem__(self, key: K, value: V) -> None:
+        return self.put(key, value)
+
+    def __getitem__(self, key: K) -> V:
+        index: int = self._shard(key)
+
+        with self._locks[index]:
+            return self._shards[index][key]
+
+    def __delitem__(self, key: K) -> None:
+        self.pop(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._shards[self._shard(key)]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[K]:
+        # snapshot of every shard, safe to iterate while other threads write
+        keys: list[K] = []
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                keys.extend(shard)
+        return iter(keys)
+
+    def values(self) -> list[V]:
+        """Snapshot of values, shard by shard."""
+        return [value for _, value in self.items()]
+
+    def items(self) -> list[tuple[K, V]]:
+        """Snapshot of key-value pairs, shard by shard."""
+        pairs: list[tuple[K, V]] = []
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                pairs.extend(shard.items())
+        return pairs
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())})"
+
+class ConcurrentLRU(MutableMapping[K, V], _Instrumented):
+    def __init__(self, max_capacity: int, shards: int = 16) -> None:
+        """
+        Thread-safe LRU cache, can manipulate with `max_capacity` in the runtime.
+
+        Keys are spread over `shards` `BetterLRU` caches, each guarded by its own lock (lock striping).
+        `max_capacity` is split between shards, so recency is tracked per shard (approximate LRU),
+        but the cache as a whole never exceeds `max_capacity`.
+        A cache smaller than `shards` uses one shard per item and is re-sharded when `change_size` grows it.
+        """
+        self._max_capacity: int = max_capacity
+        self._max_shards: int = max(1, shards)
+        # shards and their locks are swapped together, so a key never meets a lock of a different layout
+        self._layout: tuple[list[BetterLRU[K, V]], list[threading.Lock]] = self._new_layout(max_capacity)
+
+    def _new_layout(self, max_capacity: int) -> tuple[list[BetterLRU[K, V]], list[threading.Lock]]:
+        count: int = max(1, min(self._max_shards, max_capacity))
+        return [BetterLRU(size) for size in _split_capacity(max_capacity, count)], [threading.Lock() for _ in range(count)]
+
+    @property
+    def max_capacity(self) -> int:
+        return self._max_capacity
+
+    @max_capacity.setter
+    def max_capacity(self, size: int) -> None:
+        return self.change_size(int(size))
+
     def change_size(self, new_max_capacity: int) -> None:
         """
-        Adjusts cache size. If shrinking, evicts the oldest items.
+        Adjusts cache size. If shrinking, evicts the oldest items of each shard.
+        If the number of shards changes, items are moved to the new shards, oldest first.
         ### WARNING: shrinking can lead to data loss! Use with your own risk.
         """
         self._max_capacity = new_max_capacity
+        shards, locks = self._layout
+
+        if max(1, min(self._max_shards, new_max_capacity)) == len(shards):
+            for shard, lock, size in zip(shards, locks, _split_capacity(new_max_capacity, len(shards))):
+                with lock:
+                    shard.change_size(size)
+            return
+
+        for lock in locks:
+            lock.acquire()
+        try:
+            layout: tuple[list[BetterLRU[K, V]], list[threading.Lock]] = self._new_layout(new_max_capacity)
+            new_shards: list[BetterLRU[K, V]] = layout[0]
+
+            for shard in shards:
+                for key, value in shard.items():
+                    new_shards[hash(key) % len(new_shards)].put(key, value)
+
+            # moved items are not new inserts, counters carry over from the old shards
+            for new_shard in new_shards:
+                new_shard.inserts = 0
+            for name in ("hits", "misses", "inserts", "evictions"):
+                setattr(new_shards[0], name, getattr(new_shards[0], name) + sum(getattr(shard, name) for shard in shards))
+            self._layout = layout
+        finally:
+            for lock in locks:
+                lock.release()
+
+    @property
+    def hits(self) -> int:
+        return sum(shard.hits for shard in self._layout[0])
+
+    @property
+    def misses(self) -> int:
+        return sum(shard.misses for shard in self._layout[0])
+
+    @property
+    def evictions(self) -> int:
+        return sum(shard.evictions for shard in self._layout[0])
+
+    @property
+    def inserts(self) -> int:
+        return sum(shard.inserts for shard in self._layout[0])
+
+    def _lock_shard(self, key: K) -> tuple[BetterLRU[K, V], threading.Lock]:
+        """Returns the shard of `key` with its lock acquired, retrying if the cache was re-sharded meanwhile."""
+        while True:
+            shards, locks = layout = self._layout
+            index: int = hash(key) % len(shards)
+            lock: threading.Lock = locks[index]
+            lock.acquire()
+
+            if self._layout is layout:
+                return shards[index], lock
+            lock.release()
+
+    def touch(self, key: K, default: V | None = None) -> V | None:
+        """Gets value without updating cache order."""
+        shard, lock = self._lock_shard(key)
+        try:
+            return shard.touch(key, default)
+        finally:
+            lock.release()
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """Retrieves a value and moves it to the top (most recently used) of its shard."""
+        shard, lock = self._lock_shard(key)
+        try:
+            return shard.get(key, default)
+        finally:
+            lock.release()
+
+    def put(self, key: K, value: V) -> None:
+        """
+        Adds a new key-value pair, moves it to the top of its shard,
+        and removes the shard's least recently used item if its capacity is exceeded.
+        """
+        shard, lock = self._lock_shard(key)
+        try:
+            shard.put(key, value)
+        finally:
+            lock.release()
+
+    def pop(self, key: K, default: V = _MISSING) -> V:
+        """Removes the key and returns its value, or `default` if it does not exist."""
+        shard, lock = self._lock_shard(key)
+        try:
+            return shard.pop(key, default)
+        finally:
+            lock.release()
+
+    def clear(self) -> None:
+        shards, locks = self._layout
+        for shard, lock in zip(shards, locks):
+            with lock:
+                shard.clear()
+
+    def __setitem__(self, key: K, value: V) -> None:
+        return self.put(key, value)
+
+    def __getitem__(self, key: K) -> V:
+        shard, lock = self._lock_shard(key)
+        try:
+            return shard[key]
+        finally:
+            lock.release()
+
+    def __delitem__(self, key: K) -> None:
+        self.pop(key)
+
+    def __contains__(self, key: object) -> bool:
+        shards: list[BetterLRU[K, V]] = self._layout[0]
+        return key in shards[hash(key) % len(shards)]
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._layout[0])
+
+    def __iter__(self) -> Iterator[K]:
+        # snapshot of every shard, safe to iterate while other threads write
+        keys: list[K] = []
+        shards, locks = self._layout
+        for shard, lock in zip(shards, locks):
+            with lock:
+                keys.extend(shard)
+        return iter(keys)
+
+    def values(self) -> list[V]:
+        """Snapshot of values, shard by shard."""
+        return [value for _, value in self.items()]
+
+    def items(self) -> list[tuple[K, V]]:
+        """Snapshot of key-value pairs, shard by shard."""
+        pairs: list[tuple[K, V]] = []
+        shards, locks = self._layout
+        for shard, lock in zip(shards, locks):
+            with lock:
+                pairs.extend(shard.items())
+        return pairs
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())})"
+
+
+
+class _TimerWheel(Generic[K]):
+    def __init__(self, resolution: NUMBER, now: NUMBER, levels: int = 4, bits: int = 6) -> None:
+        """
+        Hierarchical timer wheel. Level `n` has `2 ** bits` slots, each `(2 ** bits) ** n` ticks wide.
+        Far away timers sit in higher levels and cascade down as time moves on,
+        so advancing costs the number of passed ticks and expired keys, never the number of scheduled keys.
+        """
+        self._resolution: NUMBER = resolution
+        self._levels: int = levels
+        self._bits: int = bits
+        self._mask: int = (1 << bits) - 1
+        self._tick: int = int(now / resolution)
+
+        self._wheels: list[list[dict[K, int]]] = [[{} for _ in range(1 << bits)] for _ in range(levels)]
+        self._overflow: dict[K, int] = {}
+        # key -> slot it currently sits in, for O(1) cancelling
+        self._index: dict[K, dict[K, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def schedule(self, key: K, expires_at: NUMBER) -> None:
+        """(Re)schedules `key` to expire at `expires_at`."""
+        self.cancel(key)
+        if expires_at != math.inf:
+            self._place(key, max(math.ceil(expires_at / self._resolution), self._tick + 1))
+
+    def cancel(self, key: K) -> None:
+        if (slot := self._index.pop(key, None)) is not None:
+            del slot[key]
+
+    def clear(self) -> None:
+        for wheel in self._wheels:
+            for slot in wheel:
+                slot.clear()
+        self._overflow.clear()
+        self._index.clear()
+
+    def _place(self, key: K, tick: int) -> None:
+        current: int = self._tick
+
+        # lowest level that will reach the tick before its upper level rotates
+        for level in range(self._levels):
+            shift: int = self._bits * (level + 1)
+            if tick >> shift == current >> shift:
+                slot: dict[K, int] = self._wheels[level][(tick >> (self._bits * level)) & self._mask]
+                break
+        else:
+            slot = self._overflow
+
+        slot[key] = tick
+        self._index[key] = slot
+
+    def _cascade(self, slot: dict[K, int]) -> None:
+        entries: list[tuple[K, int]] = list(slot.items())
+        slot.clear()
+
+        for key, tick in entries:
+            self._place(key, tick)
+
+    def advance(self, now: NUMBER) -> list[K]:
+        """Moves the wheel to `now` and returns keys that expired on the way."""
+        target: int = int(now / self._resolution)
+        expired: list[K] = []
+
+        if target <= self._tick:
+            return expired
+
+        # nothing scheduled or a long idle gap, rebuilding is cheaper than walking every tick
+        if not self._index or target - self._tick > self._levels << self._bits:
+            entries: list[tuple[K, int]] = [(key, slot[key]) for key, slot in self._index.items()]
+            self.clear()
+            self._tick = target
+
+            for key, tick in entries:
+                if tick <= target:
+                    expired.append(key)
+                else:
+                    self._place(key, tick)
+            return expired
+
+        while self._tick < target:
+            self._tick += 1
+            tick: int = self._tick
+
+            if not tick & self._mask:
+                # highest level whose lower levels all wrapped around on this tick
+                level: int = 1
+                while level < self._levels and not (tick >> (self._bits * level)) & self._mask:
+                    level += 1
+
+                if level == self._levels:
+                    self._cascade(self._overflow)
+                    level -= 1
+
+                for lvl in range(level, 0, -1):
+                    self._cascade(self._wheels[lvl][(tick >> (self._bits * lvl)) & self._mask])
+
+            slot: dict[K, int] = self._wheels[0][tick & self._mask]
+            if slot:
+                for key in slot:
+                    del self._index[key]
+                expired.extend(slot)
+                slot.clear()
+
+        return expired
+
+class TTLCache(BetterLRU[K, V]):
+    def __init__(self, max_capacity: int, ttl: NUMBER | None = None, unit: OPTIONS = "second", resolution: NUMBER = 1, timer: Callable[[], NUMBER] = time.monotonic, max_weight: int | None = None, weigher: Callable[[V], int] | None = None) -> None:
+        """
+        Time expiring LRU cache, can manipulate with `max_capacity` in the runtime.
+
+        ### Parameters:
+        - `max_capacity` - Max number of items, least recently used items are evicted first (same as `BetterLRU`).
+        - `ttl` - Default time to live of every item, `None` means items do not expire.
+        - `unit` - Unit of `ttl`, same options as `times.convert_to_seconds`.
+        - `resolution` - Timer wheel tick in seconds. Bulk expiry is only as precise as this, lookups are always exact.
+        - `timer` - Clock function returning seconds.
+        - `max_weight` - Optional max total weight of values (same as `BetterLRU`).
+        - `weigher` - Function returning weight of a value, defaults to `default_weigher`.
+
+        Expired items are removed lazily on access, and in bulk by `expire` (called on every `put`),
+        which walks a hierarchical timer wheel, so it only costs as much as the number of expired items.
+        `len`, iteration and `repr` skip expired items without removing them.
+        """
+        super().__init__(max_capacity, max_weight, weigher)
+        self._ttl: NUMBER | None = None if ttl is None else convert_to_seconds(ttl, unit)
+        self._timer: Callable[[], NUMBER] = timer
+        self._wheel: _TimerWheel[K] = _TimerWheel(resolution, timer())
+
+        self.expirations: int = 0
+
+    @property
+    def ttl(self) -> NUMBER | None:
+        """Default time to live in seconds."""
+        return self._ttl
+
+    def _expires_at(self, ttl: NUMBER | None, unit: OPTIONS, now: NUMBER) -> NUMBER:
+        if ttl is None:
+            return math.inf if self._ttl is None else now + self._ttl
+        
+        return now + convert_to_seconds(ttl, unit)
+
+    def expire(self, now: NUMBER | None = None) -> int:
+        """
+        Removes every expired item.
+
+        ### Returns:
+        - Number of removed items.
+        """
+        keys: list[K] = self._wheel.advance(self._timer() if now is None else now)
+        
+        for key in keys:
+            super()._remove(self._map[key])
+        
+        self.expirations += len(keys)
+        return len(keys)
+
+    def ttl_of(self, key: K) -> NUMBER | None:
+        """Remaining time to live of the key in seconds, `math.inf` if it does not expire, `None` if it does not exist."""
+        link: list[Any] | None = self._map.get(key)
+        if link is None or (remaining := link[4] - self._timer()) <= 0:
+            return None
+        return remaining
+
+    def touch(self, key: K, default: V | None = None) -> V | None:
+        """Gets value without updating cache order."""
+        link: list[Any] | None = self._map.get(key)
+        if link is None or link[4] <= self._timer():
+            return default
+        return link[3]
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """Retrieves a value and moves it to the top (most recently used). Expired items are removed."""
+        link: list[Any] | None = self._map.get(key)
+        if link is None:
+            self.misses += 1
+            return default
+
+        if link[4] <= self._timer():
+            self._remove(link)
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._unlink(link)
+        self._link(link)
+        self.hits += 1
+        return link[3]
+
+    def put(self, key: K, value: V, ttl: NUMBER | None = None, unit: OPTIONS = "second") -> None:
+        """
+        Adds a new key-value pair, moves it to the top, removes expired items
+        and then the least recently used items while `max_capacity` or `max_weight` is exceeded.
+
+        ### Parameters:
+        - `ttl` - Overrides default time to live for this key.
+        - `unit` - Unit of `ttl`, same options as `times.convert_to_seconds`.
+        """
+        now: NUMBER = self._timer()
+        self.expire(now)
+        
+        expires_at: NUMBER = self._expires_at(ttl, unit, now)
+        self._wheel.schedule(key, expires_at)
+
+        if self._weights is not None:
+            self._weigh(key, value)
+
+        link: list[Any] | None = self._map.get(key)
+        if link is not None:
+            link[3] = value
+            link[4] = expires_at
+            self._unlink(link)
+        else:
+            link = self._map[key] = [None, None, key, value, expires_at]
+            self.inserts += 1
+        self._link(link)
+
+        if len(self._map) > self._max_capacity:
+            self._evict()
+
+        if self._weights is not None:
+            self._shed_weight()
+
+    def change_size(self, new_max_capacity: int | None = None, max_weight: int | None = None) -> None:
+        """
+        Adjusts cache size and/or weight budget. If shrinking, removes expired items first, then evicts the oldest items.
+        ### WARNING: shrinking can lead to data loss! Use with your own risk.
+        """
+        self.expire()
+        super().change_size(new_max_capacity, max_weight)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # the wheel only holds keys, it is rescheduled from `expires_at` of the links
+        state: dict[str, Any] = super().__getstate__()
+        state["_wheel"] = self._wheel._resolution
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        state = dict(state)
+        resolution: NUMBER = state.pop("_wheel")
+        super().__setstate__(state)
+
+        self._wheel = _TimerWheel(resolution, self._timer())
+        for link in self._map.values():
+            self._wheel.schedule(link[2], link[4])
+
+    def clear(self) -> None:
+        """Removes all items. Counters are kept."""
+        super().clear()
+        self._wheel.clear()
+
+    def _remove(self, link: list[Any]) -> None:
+        super()._remove(link)
+        self._wheel.cancel(link[2])
+
+    def __getitem__(self, key: K) -> V:
+        """Overrides standard dictionary retrieval to maintain LRU order. Raises `KeyError` if the key does not exist or expired."""
+        value: V | None = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        link: list[Any] | None = self._map.get(key)
+        return link is not None and link[4] > self._timer()
+
+    def __len__(self) -> int:
+        """Number of live items, O(n). Expired items are skipped, not removed."""
+        now: NUMBER = self._timer()
+        return sum(1 for link in self._map.values() if link[4] > now)
+
+    def _links(self, reverse: bool = False) -> list[list[Any]]:
+        # read only, iteration and `repr` must not move the wheel
+        now: NUMBER = self._timer()
+        return [link for link in super()._links(reverse) if link[4] > now]
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a `memoize` decorated function."""
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+class _InFlight:
+    """Computation of one key that other callers can wait for."""
+    __slots__ = ("event", "owner", "result", "error")
+
+    def __init__(self) -> None:
+        self.event: threading.Event = threading.Event()
+        self.owner: int = threading.get_ident()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+# separates positional and keyword arguments in keys
+_KWD_MARK: object = object()
+# a lone argument of these types is the key itself, same as `functools._make_key`,
+# subclasses are left out, a `namedtuple` would collide with the tuple of its fields
+_FAST_TYPES: frozenset[type] = frozenset((int, str))
+# hits waiting to be moved to the top of the LRU, the oldest are dropped when it is full
+_READ_BUFFER: int = 1024
+
+def _make_key(args: tuple[Any, ...], kwargs: dict[str, Any], typed: bool) -> Hashable:
+    """Builds a cache key. `args` tuple is used as is, when there is nothing to add."""
+    key: tuple[Any, ...] = args
+    
+    if kwargs:
+        key += (_KWD_MARK, *kwargs.items())
+    if typed:
+        key += tuple(type(arg) for arg in args)
+        if kwargs:
+            key += tuple(type(value) for value in kwargs.values())
+    return key
+
+def _new_memo_cache(maxsize: int | None, ttl: NUMBER | None, unit: OPTIONS) -> BetterLRU[Hashable, Any]:
+    capacity: int = sys.maxsize if maxsize is None else maxsize
+
+    if ttl is not None:
+        return TTLCache(capacity, ttl=ttl, unit=unit)
+    return BetterLRU(capacity)
+
+def memoize(maxsize: int | None | Callable = 128, ttl: NUMBER | None = None, unit: OPTIONS = "second", typed: bool = False) -> Callable[[F], F]:
+    """
+    Memoization decorator backed by `BetterLRU` or `TTLCache` (if `ttl` is set). Thread-safe.
+
+    ```python
+    >>> @memoize(maxsize=1024, ttl=5, unit="minute")
+    ... def resolve(host: str) -> str: ...
+    ```
+
+    ### Parameters:
+    - `maxsize` - Max number of cached results, `None` for unlimited. Can be the function itself (`@memoize` without brackets).
+    - `ttl` - Time to live of every result, `None` means results do not expire.
+    - `unit` - Unit of `ttl`, same options as `times.convert_to_seconds`.
+    - `typed` - If arguments of different types are cached separately (`1` and `1.0`).
+
+    Concurrent callers with the same arguments share one computation instead of running the function again.
+    A single `int` or `str` argument is used as the key directly, without building a tuple.
+    Hits do not take the lock, they are queued in a read buffer and moved to the top of the LRU by the next miss,
+    which holds the lock anyway. Under heavy thread contention `hits` can be slightly off.
+    Decorated function gets `cache_info()`, `cache_clear()` and `cache_parameters()`.
+
+    ### Returns:
+    - Decorator.
+
+    ### Raises:
+    - `TypeError` - If decorated function is `async def`, use `xRedUtilsAsync.cache.memoize` instead.
+    """
+    if callable(maxsize):
+        return memoize()(maxsize)
+
+    def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+            raise TypeError("`async def` functions are not supported, use `xRedUtilsAsync.cache.memoize`.")
+
+        cache: BetterLRU[Hashable, Any] = _new_memo_cache(maxsize, ttl, unit)
+        cache_get: Callable = cache.get
+        # `clear` keeps both objects, so they can be bound once
+        links_get: Callable = cache._map.get
+        root: list[Any] = cache._root
+        timer: Callable[[], NUMBER] | None = cache._timer if isinstance(cache, TTLCache) else None
+        
+        lock: threading.Lock = threading.Lock()
+        acquire, release = lock.acquire, lock.release
+        in_flight: dict[Hashable, _InFlight] = {}
+        # `deque` appends and pops are atomic
+        reads: deque[list[Any]] = deque(maxlen=_READ_BUFFER)
+        record_read, next_read = reads.append, reads.popleft
+
+        def drain() -> None:
+            """Moves buffered hits to the top of the LRU. Caller holds the lock."""
+            while reads:
+                link: list[Any] = next_read()
+                # the link could have been evicted since the hit
+                if links_get(link[2]) is link:
+                    prev, nxt = link[0], link[1]
+                    prev[1] = nxt
+                    nxt[0] = prev
+
+                    last: list[Any] = root[0]
+                    last[1] = root[0] = link
+                    link[0] = last
+                    link[1] = root
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            if not kwargs and not typed and len(args) == 1 and type(args[0]) in _FAST_TYPES:
+                key: Hashable = args[0]
+            else:
+                key = _make_key(args, kwargs, typed)
+
+            # hits without the lock, every change of the cache is done under it, a `dict` lookup is atomic
+            link: list[Any] | None = links_get(key)
+            if link is not None and (timer is None or link[4] > timer()):
+                record_read(link)
+                cache.hits += 1
+                return link[3]
+
+            acquire()
+            try:
+                drain()
+                value: Any = cache_get(key, _MISSING)
+                if value is not _MISSING:
+                    return value
+                
+                call: _InFlight | None = in_flight.get(key)
+                if call is None:
+                    call = in_flight[key] = _InFlight()
+                    owner: bool = True
+                else:
+                    owner = False
+            finally:
+                release()
+
+            if not owner:
+                # recursion on the same key would wait for itself
+                if call.owner == threading.get_ident():
+                    return func(*args, **kwargs)
+                
+                call.event.wait()
+                if call.error is not None:
+                    raise call.error
+                return call.result
+
+            try:
+                call.result = func(*args, **kwargs)
+                with lock:
+                    drain()
+                    cache.put(key, call.result)
+                return call.result
+            
+            except BaseException as error:
+                call.error = error
+                raise
+            
+            finally:
+                with lock:
+                    del in_flight[key]
+                call.event.set()
+
+        def cache_info() -> CacheInfo:
+            with lock:
+                return CacheInfo(cache.hits, cache.misses, maxsize, len(cache))
+
+        def cache_clear() -> None:
+            with lock:
+                reads.clear()
+                cache.clear()
+                cache.hits = cache.misses = cache.inserts = cache.evictions = 0
+
+        def cache_parameters() -> dict[str, Any]:
+            return {"maxsize": maxsize, "ttl": ttl, "unit": unit, "typed": typed}
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        wrapper.cache_parameters = cache_parameters
+        return wrapper
+    
+    return decorator
+
+
+# byte translation table halving every counter
+_HALVE: bytes = bytes(i >> 1 for i in range(256))
+
+class _CountMinSketch:
+    # odd 64 bit multipliers, one per row
+    _SEEDS: tuple[int, ...] = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+    _MASK: int = (1 << 64) - 1
+
+    def __init__(self, width: int) -> None:
+        """
+        Count-min sketch with 4 rows of saturating 4 bit counters (stored in bytes).
+        Counters are halved every `10 * width` increments, so old popularity fades away.
+        """
+        self._bits: int = max(4, (width - 1).bit_length())
+        self._width: int = 1 << self._bits
+        self._shift: int = 64 - self._bits
+        self._table: bytearray = bytearray(self._width * len(self._SEEDS))
+        self._additions: int = 0
+        self._sample_size: int = 10 * self._width
+
+    def _indexes(self, key: Hashable) -> list[int]:
+        h: int = hash(key) & self._MASK
+        shift, width, mask = self._shift, self._width, self._MASK
+        return [row * width + (((h * seed) & mask) >> shift) for row, seed in enumerate(self._SEEDS)]
+
+    def increment(self, key: Hashable) -> None:
+        table: bytearray = self._table
+        for index in self._indexes(key):
+            if table[index] < 15:
+                table[index] += 1
+
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._reset()
+
+    def estimate(self, key: Hashable) -> int:
+        table: bytearray = self._table
+        return min(table[index] for index in self._indexes(key))
+
+    def _reset(self) -> None:
+        self._table = self._table.translate(_HALVE)
+        self._additions //= 2
+
+class _SegmentedCache(MutableMapping[K, V], _Instrumented):
+    """
+    Shared mapping plumbing of caches that keep items in several `OrderedDict` segments.
+    Subclasses fill `_resident` (segments in iteration order) and `_segments` (key -> segment).
+    """
+    _resident: tuple[OrderedDict[K, V], ...]
+    _segments: dict[K, OrderedDict[K, V]]
+    _max_capacity: int
+
+    hits: int
+    misses: int
+    evictions: int
+
+    @property
+    def max_capacity(self) -> int:
+        return self._max_capacity
+
+    def touch(self, key: K, default: V | None = None) -> V | None:
+        """Gets value without updating cache order."""
+        segment: OrderedDict[K, V] | None = self._segments.get(key)
+        return default if segment is None else segment[key]
+
+    def pop(self, key: K, default: V = _MISSING) -> V:
+        """Removes the key and returns its value, or `default` if it does not exist."""
+        segment: OrderedDict[K, V] | None = self._segments.pop(key, None)
+        if segment is None:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        return segment.pop(key)
+
+    def clear(self) -> None:
+        """Removes all items. Counters are kept."""
+        for segment in self._resident:
+            segment.clear()
+        self._segments.clear()
+
+    def items(self) -> list[tuple[K, V]]:
+        """Snapshot of key-value pairs segment by segment, does not update cache order."""
+        return [pair for segment in self._resident for pair in segment.items()]
+
+    def values(self) -> list[V]:
+        """Snapshot of values segment by segment, does not update cache order."""
+        return [value for segment in self._resident for value in segment.values()]
+
+    def __setitem__(self, key: K, value: V) -> None:
+        return self.put(key, value)
+
+    def __getitem__(self, key: K) -> V:
+        """Same as `get`, but raises `KeyError` if the key does not exist."""
+        value: V | None = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __delitem__(self, key: K) -> None:
+        self.pop(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._segments
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+    def __iter__(self) -> Iterator[K]:
+        return iter([key for segment in self._resident for key in segment])
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())})"
+
+class TinyLFUCache(_SegmentedCache[K, V]):
+    def __init__(self, max_capacity: int, window_ratio: float = 0.01) -> None:
+        """
+        Scan resistant W-TinyLFU cache, same API as `LRUCache`.
+
+        New keys enter a small LRU admission window (`window_ratio` of `max_capacity`).
+        Keys leaving the window only get into the main (segmented LRU) region if a count-min sketch
+        says they are used more often than the item they would evict, so one-off scans cannot flush the hot set.
+        Keeps `hits`, `misses`, `inserts` and `evictions` counters.
+        """
+        self._max_capacity: int = max_capacity
+        self._window_capacity: int = min(max_capacity, max(1, round(max_capacity * window_ratio)))
+        self._main_capacity: int = max(0, max_capacity - self._window_capacity)
+        self._protected_capacity: int = int(self._main_capacity * 0.8)
+
+        self._window: OrderedDict[K, V] = OrderedDict()
+        self._probation: OrderedDict[K, V] = OrderedDict()
+        self._protected: OrderedDict[K, V] = OrderedDict()
+        self._resident = (self._window, self._probation, self._protected)
+        # key -> segment it lives in, a single lookup per access
+        self._segments: dict[K, OrderedDict[K, V]] = {}
+        self._sketch: _CountMinSketch = _CountMinSketch(max_capacity)
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.inserts: int = 0
+        self.evictions: int = 0
+
+    @property
+    def max_capacity(self) -> int:
+        return self._max_capacity
+
+    @max_capacity.setter
+    def max_capacity(self, size: int) -> RuntimeError:
+        raise RuntimeError("You cannot change `max_capacity` of `TinyLFUCache`.")
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """Retrieves a value, records the access and moves it to the top of its segment."""
+        self._sketch.increment(key)
+        
+        segment: OrderedDict[K, V] | None = self._segments.get(key)
+        if segment is None:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        return self._access(key, segment)
+
+    def put(self, key: K, value: V) -> None:
+        """
+        Adds a new key-value pair into the admission window. The window's oldest item then competes
+        with the main region's oldest item on access frequency, the loser is evicted.
+        """
+        self._sketch.increment(key)
+
+        segment: OrderedDict[K, V] | None = self._segments.get(key)
+        if segment is not None:
+            segment[key] = value
+            self._access(key, segment)
+            return
+
+        self._window[key] = value
+        self._segments[key] = self._window
+        self.inserts += 1
+
+        if len(self._window) > self._window_capacity:
+            self._admit(*self._window.popitem(last=False))
+
+    def _access(self, key: K, segment: OrderedDict[K, V]) -> V:
+        if segment is self._probation:
+            # second hit, promote to protected
+            value: V = self._probation.pop(key)
+            self._protected[key] = value
+            self._segments[key] = self._protected
+
+            if len(self._protected) > self._protected_capacity:
+                demoted, demoted_value = self._protected.popitem(last=False)
+                self._probation[demoted] = demoted_value
+                self._segments[demoted] = self._probation
+            return value
+
+        segment.move_to_end(key)
+        return segment[key]
+
+    def _admit(self, candidate: K, value: V) -> None:
+        if len(self._probation) + len(self._protected) < self._main_capacity:
+            self._probation[candidate] = value
+            self._segments[candidate] = self._probation
+            return
+
+        victims: OrderedDict[K, V] = self._probation or self._protected
+        if not victims:
+            del self._segments[candidate]
+            self.evictions += 1
+            return
+
+        victim: K = next(iter(victims))
+        if self._sketch.estimate(candidate) > self._sketch.estimate(victim):
+            del victims[victim]
+            del self._segments[victim]
+            self._probation[candidate] = value
+            self._segments[candidate] = self._probation
+        else:
+            del self._segments[candidate]
+
+        self.evictions += 1
+
+class ARCCache(_SegmentedCache[K, V]):
+    def __init__(self, max_capacity: int) -> None:
+        """
+        Adaptive replacement cache (ARC), can manipulate with `max_capacity` in the runtime.
+
+        Splits items into recently used once (`T1`) and used again (`T2`), and remembers keys
+        evicted from both (ghost lists `B1`, `B2`). Hits on ghosts move the target size of `T1`,
+        so the cache keeps adapting between recency and frequency. Keeps `hits`, `misses`, `inserts` and `evictions` counters.
+        """
+        self._max_capacity: int = max_capacity
+        # target size of T1
+        self._p: int = 0
+
+        self._t1: OrderedDict[K, V] = OrderedDict()
+        self._t2: OrderedDict[K, V] = OrderedDict()
+        self._b1: OrderedDict[K, None] = OrderedDict()
+        self._b2: OrderedDict[K, None] = OrderedDict()
+        self._resident = (self._t1, self._t2)
+        self._segments: dict[K, OrderedDict[K, V]] = {}
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.inserts: int = 0
+        self.evictions: int = 0
+
+    @property
+    def max_capacity(self) -> int:
+        return self._max_capacity
+
+    @max_capacity.setter
+    def max_capacity(self, size: int) -> None:
+        return self.change_size(int(size))
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """Retrieves a value and moves it to the top of the frequently used list (`T2`)."""
+        segment: OrderedDict[K, V] | None = self._segments.get(key)
+        if segment is None:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        return self._promote(key, segment)
+
+    def put(self, key: K, value: V) -> None:
+        """
+        Adds a new key-value pair. Keys remembered by ghost lists go straight to `T2` and adapt the `T1`/`T2` balance,
+        new keys go to `T1`. Evicts an item if `max_capacity` is exceeded.
+        """
+        segment: OrderedDict[K, V] | None = self._segments.get(key)
+        if segment is not None:
+            segment[key] = value
+            self._promote(key, segment)
+            return
+
+        capacity: int = self._max_capacity
+        if capacity <= 0:
+            return
+
+        t1, t2, b1, b2 = self._t1, self._t2, self._b1, self._b2
+
+        if key in b1:
+            self._p = min(capacity, self._p + max(len(b2) // len(b1), 1))
+            del b1[key]
+            if len(t1) + len(t2) >= capacity:
+                self._replace(False)
+            self._insert(key, value, t2)
+            self.inserts += 1
+            return
+
+        if key in b2:
+            self._p = max(0, self._p - max(len(b1) // len(b2), 1))
+            del b2[key]
+            if len(t1) + len(t2) >= capacity:
+                self._replace(True)
+            self._insert(key, value, t2)
+            self.inserts += 1
+            return
+
+        if len(t1) + len(b1) >= capacity:
+            if len(t1) < capacity:
+                if b1:
+                    b1.popitem(last=False)
+                if len(t1) + len(t2) >= capacity:
+                    self._replace(False)
+            else:
+                del self._segments[t1.popitem(last=False)[0]]
+                self.evictions += 1
+        
+        elif len(t1) + len(t2) + len(b1) + len(b2) >= capacity:
+            if len(t1) + len(t2) + len(b1) + len(b2) >= 2 * capacity and b2:
+                b2.popitem(last=False)
+            if len(t1) + len(t2) >= capacity:
+                self._replace(False)
+
+        self._insert(key, value, t1)
+        self.inserts += 1
+
+    def change_size(self, new_max_capacity: int) -> None:
+        """
+        Adjusts cache size. If shrinking, evicts items the same way a full cache would, ghost lists are trimmed too.
+        ### WARNING: shrinking can lead to data loss! Use with your own risk.
+        """
+        self._max_capacity = new_max_capacity
+        self._p = min(self._p, new_max_capacity)
+
+        while len(self._t1) + len(self._t2) > new_max_capacity:
+            self._replace(False)
+
+        while self._b1 and len(self._t1) + len(self._b1) > new_max_capacity:
+            self._b1.popitem(last=False)
+        while self._b2 and len(self) + len(self._b1) + len(self._b2) > 2 * new_max_capacity:
+            self._b2.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes all items and ghost lists. Counters are kept."""
+        super().clear()
+        self._b1.clear()
+        self._b2.clear()
+        self._p = 0
+
+    def _insert(self, key: K, value: V, segment: OrderedDict[K, V]) -> None:
+        segment[key] = value
+        self._segments[key] = segment
+
+    def _promote(self, key: K, segment: OrderedDict[K, V]) -> V:
+        if segment is self._t2:
+            segment.move_to_end(key)
+            return segment[key]
+
+        value: V = segment.pop(key)
+        self._insert(key, value, self._t2)
+        return value
+
+    def _replace(self, in_b2: bool) -> None:
+        t1: OrderedDict[K, V] = self._t1
+        
+        if t1 and (len(t1) > self._p or (in_b2 and len(t1) == self._p) or not self._t2):
+            key: K = t1.popitem(last=False)[0]
+            self._b1[key] = None
+        else:
+            key = self._t2.popitem(last=False)[0]
+            self._b2[key] = None
+
+        del self._segments[key]
+        self.evictions += 1
+
+class TwoQueueCache(_SegmentedCache[K, V]):
+    def __init__(self, max_capacity: int, in_ratio: float = 0.25, out_ratio: float = 0.5) -> None:
+        """
+        2Q cache, can manipulate with `max_capacity` in the runtime.
+
+        New keys enter a FIFO queue (`A1in`, `in_ratio` of `max_capacity`). Keys pushed out of it are remembered
+        in a ghost FIFO (`A1out`, `out_ratio` of `max_capacity`), and only keys requested again while remembered
+        get into the main LRU (`Am`). Keeps `hits`, `misses`, `inserts` and `evictions` counters.
+        """
+        self._in_ratio: float = in_ratio
+        self._out_ratio: float = out_ratio
+
+        self._a1in: OrderedDict[K, V] = OrderedDict()
+        self._a1out: OrderedDict[K, None] = OrderedDict()
+        self._am: OrderedDict[K, V] = OrderedDict()
+        self._resident = (self._a1in, self._am)
+        self._segments: dict[K, OrderedDict[K, V]] = {}
+        self._set_capacity(max_capacity)
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.inserts: int = 0
+        self.evictions: int = 0
+
+    @property
+    def max_capacity(self) -> int:
+        return self._max_capacity
+
+    @max_capacity.setter
+    def max_capacity(self, size: int) -> None:
+        return self.change_size(int(size))
+
+    def _set_capacity(self, max_capacity: int) -> None:
+        self._max_capacity: int = max_capacity
+        self._in_capacity: int = max(1, int(max_capacity * self._in_ratio))
+        self._out_capacity: int = max(1, int(max_capacity * self._out_ratio))
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """Retrieves a value, items in the main LRU (`Am`) are moved to its top."""
+        segment: OrderedDict[K, V] | None = self._segments.get(key)
+        if segment is None:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        if segment is self._am:
+            segment.move_to_end(key)
+        return segment[key]
+
+    def put(self, key: K, value: V) -> None:
+        """
+        Adds a new key-value pair. Keys remembered by the ghost FIFO go to the main LRU (`Am`), new keys to `A1in`.
+        Evicts an item if `max_capacity` is exceeded.
+        """
+        segment: OrderedDict[K, V] | None = self._segments.get(key)
+        if segment is not None:
+            segment[key] = value
+            if segment is self._am:
+                segment.move_to_end(key)
+            return
+
+        if self._max_capacity <= 0:
+            return
+
+        if len(self._segments) >= self._max_capacity:
+            self._reclaim()
+
+        if key in self._a1out:
+            del self._a1out[key]
+            segment = self._am
+        else:
+            segment = self._a1in
+
+        segment[key] = value
+        self._segments[key] = segment
+        self.inserts += 1
+
+    def change_size(self, new_max_capacity: int) -> None:
+        """
+        Adjusts cache size. If shrinking, evicts items the same way a full cache would, the ghost FIFO is trimmed too.
+        ### WARNING: shrinking can lead to data loss! Use with your own risk.
+        """
+        self._set_capacity(new_max_capacity)
+
+        while len(self._segments) > new_max_capacity:
+            self._reclaim()
+        while len(self._a1out) > self._out_capacity:
+            self._a1out.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes all items and the ghost FIFO. Counters are kept."""
+        super().clear()
+        self._a1out.clear()
+
+    def _reclaim(self) -> None:
+        if len(self._a1in) > self._in_capacity or not self._am:
+            key: K = self._a1in.popitem(last=False)[0]
+            self._a1out[key] = None
+
+            if len(self._a1out) > self._out_capacity:
+                self._a1out.popitem(last=False)
+        else:
+            key = self._am.popitem(last=False)[0]
+
+        del self._segments[key]
+        self.evictions += 1
+
+
+class DiskCache(MutableMapping[str | bytes, Any], _Instrumented):
+    # log: file header, then records `flags, key length, value length, crc32` + key + value
+    _LOG_MAGIC: bytes = b"XRDLOG01"
+    _RECORD: struct.Struct = struct.Struct("<BIQI")
+    # index: header `magic, slot count, log size (0 while open), item count`, then slots `digest, offset`
+    _INDEX_MAGIC: bytes = b"XRDIDX01"
+    _HEADER: struct.Struct = struct.Struct("<8sQQQ")
+    _SLOT: struct.Struct = struct.Struct("<QQ")
+
+    _PICKLED: int = 1
+    _DELETED: int = 2
+    _STR_KEY: int = 4
+
+    _EMPTY: int = 0
+    _TOMBSTONE: int = 1
+
+    def __init__(self, path: str, memory_capacity: int = 1024, max_size: int | None = None, compact_ratio: float = 0.5, algorithm: str = "blake2b") -> None:
+        """
+        Persistent cache, survives restarts. `str`/`bytes` keys, any picklable values.
+
+        ### Parameters:
+        - `path` - Directory of the cache (created if missing), holds `data.log` and `index.bin`.
+        - `memory_capacity` - Size of the in memory `LRUCache` front.
+        - `max_size` - Optional size budget of the log in bytes, oldest written items are dropped on compaction to fit.
+        - `compact_ratio` - Share of dead bytes (overwritten/deleted items) in the log that triggers compaction.
+        - `algorithm` - Name of `hashing.digest` algorithm used for key digests (`AVAILABLE_ALGORITHMS` or `NON_CRYPTOGRAPHIC_ALGORITHMS`).
+
+        Items are appended to a log and found through a memory mapped open addressing hash index.
+        `bytes` values can be read without copying with `get_view`. Compaction writes a new log next to the old one
+        and swaps it in with `os.replace`. The index is marked dirty while open, so after a crash
+        it is rebuilt from the log (torn records at the end are cut off).
+
+        ### Raises:
+        - `ValueError` - If `data.log` in `path` is not a `DiskCache` log.
+        """
+        self._path: str = path
+        self._log_path: str = os.path.join(path, "data.log")
+        self._index_path: str = os.path.join(path, "index.bin")
+        
+        self._max_size: int | None = max_size
+        self._compact_ratio: float = compact_ratio
+        self._algorithm: str = algorithm
+        self._front: LRUCache[str | bytes, Any] = LRUCache(memory_capacity)
+        
+        self._count: int = 0
+        self._tombstones: int = 0
+        self._dead: int = 0
+        # per instance, items dropped by compaction to fit `max_size` count as evictions
+        self.inserts: int = 0
+        self.evictions: int = 0
+
+        os.makedirs(path, exist_ok=True)
+        if not os.path.exists(self._log_path):
+            save_file(self._log_path, self._LOG_MAGIC, mode="wb", atomic=True)
+        
+        self._open()
+
+    # files
+
+    def _open(self) -> None:
+        self._log: io.BufferedRandom = open(self._log_path, "r+b", buffering=0)
+        self._log_size: int = os.fstat(self._log.fileno()).st_size
+        
+        if self._log_size < len(self._LOG_MAGIC) or self._log.read(len(self._LOG_MAGIC)) != self._LOG_MAGIC:
+            self._log.close()
+            raise ValueError(f"`{self._log_path}` is not a `DiskCache` log.")
+        
+        self._log_map: mmap.mmap = mmap.mmap(self._log.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if not self._index_valid():
+            self._rebuild()
+
+        self._index_file: io.BufferedRandom = open(self._index_path, "r+b")
+        self._index: mmap.mmap = mmap.mmap(self._index_file.fileno(), 0)
+        _, self._slots, _, self._count = self._HEADER.unpack_from(self._index, 0)
+        self._mask: int = self._slots - 1
+        
+        # dirty until `close`, a crash makes the next open rebuild the index
+        self._HEADER.pack_into(self._index, 0, self._INDEX_MAGIC, self._slots, 0, self._count)
+
+    def _index_valid(self) -> bool:
+        try:
+            header: bytes = open_file(self._index_path, encoding=None, mode="rb")
+            magic, slots, log_size, _ = self._HEADER.unpack_from(header, 0)
+        except (OSError, struct.error):
+            return False
+        
+        return magic == self._INDEX_MAGIC and log_size == self._log_size and len(header) == self._HEADER.size + slots * self._SLOT.size
+
+    def _close_maps(self) -> None:
+        for mapped in (self._log_map, self._index):
+            try:
+                mapped.close()
+            except BufferError:
+                # `get_view` memoryviews are still alive, mapping is closed once they are gone
+                pass
+
+    def flush(self) -> None:
+        """Writes index to disk and marks it clean, so the next open does not need to rebuild it."""
+        self._HEADER.pack_into(self._index, 0, self._INDEX_MAGIC, self._slots, self._log_size, self._count)
+        self._index.flush()
+        os.fsync(self._log.fileno())
+
+    def close(self) -> None:
+        """Flushes and closes files."""
+        if self._log.closed:
+            return
+
+        self.flush()
+        self._close_maps()
+        self._index_file.close()
+        self._log.close()
+
+    def __enter__(self) -> "DiskCache":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    # log
+
+    def _key_bytes(self, key: str | bytes) -> tuple[bytes, int]:
+        if isinstance(key, str):
+            return key.encode("utf-8"), self._STR_KEY
+        if isinstance(key, bytes | bytearray | memoryview):
+            return bytes(key), 0
+        raise TypeError(f"`DiskCache` keys must be `str` or `bytes`, not `{type(key).__name__}`")
+
+    def _digest(self, key: bytes, kind: int) -> int:
+        # `"a"` and `b"a"` are different keys, key kind is hashed in as well
+        return int.from_bytes(digest(self._algorithm, bytes((kind,)) + key)[:8], "little")
+
+    def _append(self, flags: int, key: bytes, value: bytes | memoryview) -> int:
+        offset: int = self._log_size
+        header: bytes = self._RECORD.pack(flags, len(key), len(value), zlib.crc32(value, zlib.crc32(key)))
+        
+        self._log.seek(offset)
+        self._log.write(header + key)
+        self._log.write(value)
+        
+        self._log_size += self._RECORD.size + len(key) + len(value)
+        return offset
+
+    def _read(self, offset: int) -> tuple[int, memoryview, memoryview]:
+        """Returns `flags, key, value` of the record, key and value are views into the memory mapped log."""
+        mapped: int = len(self._log_map)
+        if offset + self._RECORD.size > mapped:
+            # remap once the unmapped tail is as big as the mapping, so a growing log is remapped O(log n) times
+            if self._log_size - mapped < mapped:
+                return self._read_tail(offset)
+            self._remap()
+
+        flags, key_length, value_length, _ = self._RECORD.unpack_from(self._log_map, offset)
+        start: int = offset + self._RECORD.size
+        
+        if start + key_length + value_length > len(self._log_map):
+            if self._log_size - len(self._log_map) < len(self._log_map):
+                return self._read_tail(offset)
+            self._remap()
+
+        view: memoryview = memoryview(self._log_map)
+        return flags, view[start:start + key_length], view[start + key_length:start + key_length + value_length]
+
+    def _read_tail(self, offset: int) -> tuple[int, memoryview, memoryview]:
+        """`_read` of a record written after the last remap, reads it from the file."""
+        # unbuffered, `_append` seeks before every write
+        self._log.seek(offset)
+        flags, key_length, value_length, _ = self._RECORD.unpack(self._log.read(self._RECORD.size))
+        view: memoryview = memoryview(self._log.read(key_length + value_length))
+        return flags, view[:key_length], view[key_length:]
+
+    def _remap(self) -> None:
+        # a new mapping instead of resize, `get_view` memoryviews may still point into the old one
+        old: mmap.mmap = self._log_map
+        self._log_map = mmap.mmap(self._log.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        try:
+            old.close()
+        except BufferError:
+            # closed once the memoryviews are gone
+            pass
+
+    def _record_size(self, offset: int) -> int:
+        _, key, value = self._read(offset)
+        return self._RECORD.size + len(key) + len(value)
+
+    # index
+
+    def _find(self, key: bytes, kind: int) -> tuple[int, int, int]:
+        """Returns `(digest, slot, offset)` of the key, or `(digest, first free slot, 0)` if it is not indexed."""
+        index, mask, unpack = self._index, self._mask, self._SLOT.unpack_from
+        h: int = self._digest(key, kind)
+        slot: int = h & mask
+        free: int = -1
+
+        while True:
+            stored, offset = unpack(index, self._HEADER.size + slot * self._SLOT.size)
+            
+            if offset == self._EMPTY:
+                return h, (slot if free < 0 else free), 0
+            
+            if offset == self._TOMBSTONE:
+                if free < 0:
+                    free = slot
+            elif stored == h:
+                flags, stored_key, _ = self._read(offset)
+                if flags & self._STR_KEY == kind and stored_key == key:
+                    return h, slot, offset
+            
+            slot = (slot + 1) & mask
+
+    def _set_slot(self, slot: int, h: int, offset: int) -> None:
+        self._SLOT.pack_into(self._index, self._HEADER.size + slot * self._SLOT.size, h, offset)
+
+    def _live(self) -> list[tuple[int, int]]:
+        """`(digest, offset)` of every indexed item."""
+        index, unpack = self._index, self._SLOT.unpack_from
+        entries: list[tuple[int, int]] = []
+        
+        for slot in range(self._slots):
+            h, offset = unpack(index, self._HEADER.size + slot * self._SLOT.size)
+            if offset > self._TOMBSTONE:
+                entries.append((h, offset))
+        return entries
+
+    def _write_index(self, entries: list[tuple[int, int]], log_size: int) -> None:
+        slots: int = 16
+        while slots < len(entries) * 2:
+            slots *= 2
+
+        mask: int = slots - 1
+        table: bytearray = bytearray(self._HEADER.size + slots * self._SLOT.size)
+        self._HEADER.pack_into(table, 0, self._INDEX_MAGIC, slots, log_size, len(entries))
+
+        for h, offset in entries:
+            slot: int = h & mask
+            while self._SLOT.unpack_from(table, self._HEADER.size + slot * self._SLOT.size)[1] != self._EMPTY:
+                slot = (slot + 1) & mask
+            self._SLOT.pack_into(table, self._HEADER.size + slot * self._SLOT.size, h, offset)
+
+        save_file(self._index_path, table, mode="wb", atomic=True)
+
+    def _rebuild(self) -> None:
+        """Rebuilds the index by replaying the log, cuts off a torn record at the end."""
+        live: dict[tuple[int, bytes], tuple[int, int]] = {}
+        offset: int = len(self._LOG_MAGIC)
+        self._dead = 0
+
+        while offset + self._RECORD.size <= self._log_size:
+            flags, key_length, value_length, crc = self._RECORD.unpack_from(self._log_map, offset)
+            end: int = offset + self._RECORD.size + key_length + value_length
+            if end > self._log_size:
+                break
+
+            key: bytes = bytes(self._log_map[offset + self._RECORD.size:offset + self._RECORD.size + key_length])
+            value: bytes = self._log_map[offset + self._RECORD.size + key_length:end]
+            if zlib.crc32(value, zlib.crc32(key)) != crc:
+                break
+
+            kind: int = flags & self._STR_KEY
+            if (kind, key) in live:
+                self._dead += self._record_size(live[kind, key][1])
+            
+            if flags & self._DELETED:
+                self._dead += end - offset
+                live.pop((kind, key), None)
+            else:
+                live[kind, key] = (self._digest(key, kind), offset)
+            offset = end
+
+        if offset != self._log_size:
+            self._log.truncate(offset)
+            self._log_size = offset
+            self._remap()
+
+        self._write_index(list(live.values()), 0)
+
+    def _grow(self) -> None:
+        entries: list[tuple[int, int]] = self._live()
+        self._close_maps()
+        self._index_file.close()
+        
+        self._write_index(entries, 0)
+        self._index_file = open(self._index_path, "r+b")
+        self._index = mmap.mmap(self._index_file.fileno(), 0)
+        _, self._slots, _, self._count = self._HEADER.unpack_from(self._index, 0)
+        self._mask = self._slots - 1
+        self._tombstones = 0
+        self._log_map = mmap.mmap(self._log.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # compaction
+
+    @property
+    def size(self) -> int:
+        """Size of the log in bytes."""
+        return self._log_size
+
+    def compact(self, target_size: int | None = None) -> None:
+        """
+        Rewrites the log with live items only (oldest first), dropping the oldest ones while it is bigger than `target_size`.
+        The new log is swapped in atomically, a crash leaves either the old or the new log.
+        """
+        entries: list[tuple[int, int]] = sorted(self._live(), key=lambda entry: entry[1])
+        sizes: list[int] = [self._record_size(offset) for _, offset in entries]
+        
+        dropped: int = 0
+        if target_size is not None:
+            total: int = len(self._LOG_MAGIC) + sum(sizes)
+            while dropped < len(entries) and total > target_size:
+                total -= sizes[dropped]
+                dropped += 1
+
+        temp_path: str = f"{self._log_path}.compact"
+        moved: list[tuple[int, int]] = []
+        self._remap()
+        
+        with open(temp_path, "wb") as temp:
+            temp.write(self._LOG_MAGIC)
+            position: int = len(self._LOG_MAGIC)
+
+            for (h, offset), size in zip(entries[dropped:], sizes[dropped:]):
+                temp.write(self._log_map[offset:offset + size])
+                moved.append((h, position))
+                position += size
+            
+            temp.flush()
+            os.fsync(temp.fileno())
+
+        self._close_maps()
+        self._index_file.close()
+        self._log.close()
+
+        # the new log only drops records of the old one, so equal sizes mean equal logs,
+        # if we crash before the swap, the size does not match and the index is rebuilt from the old log
+        self._write_index(moved, position)
+        os.replace(temp_path, self._log_path)
+
+        self._dead = 0
+        self._tombstones = 0
+        if dropped:
+            self.evictions += dropped
+            self._front.clear()
+        self._open()
+
+    def _maybe_compact(self) -> None:
+        if self._max_size is not None and self._log_size > self._max_size:
+            # leave some headroom, so the next put does not compact again
+            self.compact(int(self._max_size * 0.9))
+        
+        elif self._dead > self._compact_ratio * self._log_size and self._log_size > 1 << 20:
+            self.compact()
+
+    # mapping
+
+    def put(self, key: str | bytes, value: Any) -> None:
+        """Writes a key-value pair to the log and the memory front."""
+        raw, flags = self._key_bytes(key)
+        
+        if isinstance(value, bytearray | memoryview):
+            # the front keeps what a reload from disk returns
+            value = bytes(value)
+
+        if isinstance(value, bytes):
+            data: bytes = value
+        else:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            flags |= self._PICKLED
+
+        h, slot, old = self._find(raw, flags & self._STR_KEY)
+        if old:
+            self._dead += self._record_size(old)
+        else:
+            if self._index_tombstone(slot):
+                self._tombstones -= 1
+            self._count += 1
+            self.inserts += 1
+
+        self._set_slot(slot, h, self._append(flags, raw, data))
+        self._front.put(key, value)
+
+        if (self._count + self._tombstones) * 2 > self._slots:
+            self._grow()
+        self._maybe_compact()
+
+    def _index_tombstone(self, slot: int) -> bool:
+        return self._SLOT.unpack_from(self._index, self._HEADER.size + slot * self._SLOT.size)[1] == self._TOMBSTONE
+
+    def get(self, key: str | bytes, default: Any = None) -> Any:
+        """Retrieves a value from the memory front, or from disk (and puts it into the front)."""
+        value: Any = self._front.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        _, _, offset = self._find(*self._key_bytes(key))
+        if not offset:
+            return default
+
+        flags, _, data = self._read(offset)
+        value = pickle.loads(data) if flags & self._PICKLED else bytes(data)
+        self._front.put(key, value)
+        return value
+
+    def get_view(self, key: str | bytes) -> memoryview | None:
+        """
+        Zero-copy read of a `bytes` value, a read only `memoryview` into the memory mapped log.
+        Returns `None` if the key does not exist.
+
+        ### Raises:
+        - `TypeError` - If the value was not stored as bytes.
+        """
+        _, _, offset = self._find(*self._key_bytes(key))
+        if not offset:
+            return None
+
+        flags, _, data = self._read(offset)
+        if flags & self._PICKLED:
+            raise TypeError("Value is not `bytes`, use `get`.")
+        return data
+
+    def pop(self, key: str | bytes, default: Any = _MISSING) -> Any:
+        """Removes the key and returns its value, or `default` if it does not exist."""
+        raw, flags = self._key_bytes(key)
+        _, slot, offset = self._find(raw, flags)
+        if not offset:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+
+        # the front usually has it, otherwise it is read (and copied) before the log grows
+        if key in self._front:
+            value: Any = self._front.pop(key)
+        else:
+            stored_flags, _, data = self._read(offset)
+            value = pickle.loads(data) if stored_flags & self._PICKLED else bytes(data)
+        
+        self._dead += self._record_size(offset)
+        self._append(flags | self._DELETED, raw, b"")
+        self._set_slot(slot, 0, self._TOMBSTONE)
+        self._count -= 1
+        self._tombstones += 1
+        
+        self._maybe_compact()
+        return value
+
+    def clear(self) -> None:
+        """Removes all items, the log is truncated."""
+        self._front.clear()
+        self._close_maps()
+        self._index_file.close()
+        self._log.close()
+        
+        save_file(self._log_path, self._LOG_MAGIC, mode="wb", atomic=True)
+        self._write_index([], len(self._LOG_MAGIC))
+        self._dead = self._tombstones = 0
+        self._open()
+
+    def __setitem__(self, key: str | bytes, value: Any) -> None:
+        return self.put(key, value)
+
+    def __getitem__(self, key: str | bytes) -> Any:
+        value: Any = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __delitem__(self, key: str | bytes) -> None:
+        self.pop(key)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._front:
+            return True
+        
+        return self._find(*self._key_bytes(key))[2] != 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str | bytes]:
+        """Keys in write order (snapshot)."""
+        keys: list[str | bytes] = []
+        
+        for _, offset in sorted(self._live(), key=lambda entry: entry[1]):
+            flags, key, _ = self._read(offset)
+            keys.append(str(key, "utf-8") if flags & self._STR_KEY else bytes(key))
+        return iter(keys)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._path!r}, items={self._count}, size={self._log_size})"
+
+
+class SharedMemoryCache(MutableMapping[str | bytes | int, Any], _Instrumented):
+    # header: magic, bucket count, ways per bucket, slot data size
+    _MAGIC: bytes = b"XRDSHM01"
+    _HEADER: struct.Struct = struct.Struct("<8sQQQ")
+    # bucket: CLOCK hand, then `ways` slots
+    _HAND: struct.Struct = struct.Struct("<Q")
+    # slot: used, referenced, flags, key length, value length, key digest, then `slot_size` bytes of key + value
+    _SLOT: struct.Struct = struct.Struct("<BBBxIIQ")
+
+    _INT_KEY: int = 1
+    _PICKLED_VALUE: int = 2
+    _STR_KEY: int = 4
+
+    def __init__(self, max_capacity: int, slot_size: int = 1024, ways: int = 8, locks: int = 64, name: str | None = None, context: str | None = None) -> None:
+        """
+        Cache shared by processes of one host, stored in `multiprocessing.shared_memory`.
+        Create it in the parent before forking (or pass it to `multiprocessing` processes), every process then sees the same items.
+
+        ### Parameters:
+        - `max_capacity` - Number of slots, rounded up to whole buckets.
+        - `slot_size` - Max size of encoded key + value in bytes, every slot reserves this much.
+        - `ways` - Slots per bucket, a key can only live in its bucket.
+        - `locks` - Number of process shared locks, buckets are striped over them.
+        - `name` - Optional name of the shared memory block.
+        - `context` - `multiprocessing` start method of the processes that will use the cache (`fork`, `spawn`...), default if `None`.
+
+        Fixed slot table split into buckets, a key is hashed to one bucket and probed over its `ways` slots.
+        Full buckets evict with CLOCK (second chance), an approximation of LRU that only sets a bit on hits.
+        Keys must be `str`, `bytes` or `int` and are stored by value, so they match in every process (`True`, `1` and `1.0` are one key, like in a `dict`).
+        `bytes` values are stored raw, any other value is pickled.
+        Counters (`hits`, `misses`, `inserts`, `evictions`) are per process.
+        """
+        self._buckets: int = max(1, -(-max_capacity // ways))
+        self._ways: int = ways
+        self._slot_size: int = slot_size
+        
+        size: int = self._HEADER.size + self._buckets * self._bucket_size()
+        self._shm: shared_memory.SharedMemory = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self._HEADER.pack_into(self._shm.buf, 0, self._MAGIC, self._buckets, ways, slot_size)
+        
+        self._locks: tuple[Any, ...] = tuple(multiprocessing.get_context(context).Lock() for _ in range(max(1, min(locks, self._buckets))))
+        self._owner: int = os.getpid()
+        self._setup()
+
+    def _setup(self) -> None:
+        self._buf: memoryview = self._shm.buf
+        self.hits: int = 0
+        self.misses: int = 0
+        self.inserts: int = 0
+        self.evictions: int = 0
+
+    def _bucket_size(self) -> int:
+        return self._HAND.size + self._ways * (self._SLOT.size + self._slot_size)
+
+    @classmethod
+    def _attach(cls, name: str, locks: tuple[Any, ...]) -> "SharedMemoryCache":
+        self: SharedMemoryCache = cls.__new__(cls)
+        
+        # `multiprocessing` children share the resource tracker of the parent, the block stays registered once
+        self._shm = shared_memory.SharedMemory(name=name)
+
+        _, self._buckets, self._ways, self._slot_size = self._HEADER.unpack_from(self._shm.buf, 0)
+        self._locks = locks
+        self._owner = 0
+        self._setup()
+        return self
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # `spawn` children attach to the same block, locks are shared by `multiprocessing`
+        return type(self)._attach, (self._shm.name, self._locks)
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block."""
+        return self._shm.name
+
+    @property
+    def max_capacity(self) -> int:
+        return self._buckets * self._ways
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the shared memory block in bytes, paid once per host."""
+        return self._shm.size
+
+    def close(self) -> None:
+        """Detaches this process from the shared memory. Creating process also frees the block."""
+        self._shm.close()
+        
+        # forked children inherit the object, only the creator may unlink
+        if self._owner == os.getpid():
+            self._shm.unlink()
+
+    def __enter__(self) -> "SharedMemoryCache":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    # encoding
+
+    def _encode_key(self, key: str | bytes | int) -> tuple[bytes, int]:
+        # pickle bytes are not canonical, equal keys (`1`, `True`, `1.0`) and sets would miss
+        if isinstance(key, str):
+            return key.encode("utf-8"), self._STR_KEY
+        if isinstance(key, bytes):
+            return key, 0
+        if isinstance(key, float) and key.is_integer():
+            key = int(key)
+        if isinstance(key, int):
+            return b"%d" % key, self._INT_KEY
+        raise TypeError(f"{type(self).__name__} keys must be `str`, `bytes` or `int`, not `{type(key).__name__}`.")
+
+    def _decode_key(self, raw: bytes, flags: int) -> str | bytes | int:
+        if flags & self._STR_KEY:
+            return raw.decode("utf-8")
+        if flags & self._INT_KEY:
+            return int(raw)
+        return raw
+
+    def _locate(self, key: str | bytes | int) -> tuple[bytes, int, int, int]:
+        """Returns `key bytes, flags, digest, bucket offset` of the key."""
+        raw, flags = self._encode_key(key)
+        h: int = int.from_bytes(digest("blake2b", bytes((flags,)) + raw)[:8], "little")
+        return raw, flags, h, self._HEADER.size + (h % self._buckets) * self._bucket_size()
+
+    def _lock(self, bucket: int) -> Any:
+        return self._locks[(bucket // self._bucket_size()) % len(self._locks)]
+
+    def _slots(self, bucket: int) -> range:
+        step: int = self._SLOT.size + self._slot_size
+        start: int = bucket + self._HAND.size
+        return range(start, start + self._ways * step, step)
+
+    def _match(self, bucket: int, raw: bytes, flags: int, h: int) -> int:
+        """Offset of the slot holding the key, `-1` if it is not in the bucket. Caller holds the bucket lock."""
+        buf, unpack, header = self._buf, self._SLOT.unpack_from, self._SLOT.size
+        kind: int = flags & (self._STR_KEY | self._INT_KEY)
+        
+        for slot in self._slots(bucket):
+            used, _, stored_flags, key_length, _, stored = unpack(buf, slot)
+            if used and stored == h and stored_flags & (self._STR_KEY | self._INT_KEY) == kind and buf[slot + header:slot + header + key_length] == raw:
+                return slot
+        return -1
+
+    # mapping
+
+    def get(self, key: str | bytes | int, default: Any = None) -> Any:
+        """
+        Retrieves a value and marks it as referenced.
+
+        ### Raises:
+        - `TypeError` - If the key is not `str`, `bytes` or `int`.
+        """
+        raw, flags, h, bucket = self._locate(key)
+
+        with self._lock(bucket):
+            slot: int = self._match(bucket, raw, flags, h)
+            if slot < 0:
+                self.misses += 1
+                return default
+
+            _, referenced, stored_flags, key_length, value_length, _ = self._SLOT.unpack_from(self._buf, slot)
+            if not referenced:
+                self._buf[slot + 1] = 1
+            
+            start: int = slot + self._SLOT.size + key_length
+            data: bytes = bytes(self._buf[start:start + value_length])
+
+        self.hits += 1
+        return pickle.loads(data) if stored_flags & self._PICKLED_VALUE else data
+
+    def put(self, key: str | bytes | int, value: Any) -> None:
+        """
+        Stores a key-value pair, evicting with CLOCK if its bucket is full.
+
+        ### Raises:
+        - `ValueError` - If key and value do not fit into `slot_size`.
+        - `TypeError` - If the key is not `str`, `bytes` or `int`.
+        """
+        raw, flags, h, bucket = self._locate(key)
+        
+        if isinstance(value, bytes):
+            data: bytes = value
+        else:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            flags |= self._PICKLED_VALUE
+
+        if len(raw) + len(data) > self._slot_size:
+            raise ValueError(f"Item of {len(raw) + len(data)} bytes does not fit into `slot_size` ({self._slot_size}).")
+
+        with self._lock(bucket):
+            slot: int = self._match(bucket, raw, flags, h)
+            # new items start unreferenced, a scan is evicted before the items that were hit
+            referenced: int = 1
+            if slot < 0:
+                slot, referenced = self._free(bucket), 0
+                self.inserts += 1
+
+            self._SLOT.pack_into(self._buf, slot, 1, referenced, flags, len(raw), len(data), h)
+            start: int = slot + self._SLOT.size
+            self._buf[start:start + len(raw)] = raw
+            self._buf[start + len(raw):start + len(raw) + len(data)] = data
+
+    def _free(self, bucket: int) -> int:
+        """Empty slot of the bucket, or the CLOCK victim. Caller holds the bucket lock."""
+        buf, slots = self._buf, self._slots(bucket)
+        
+        for slot in slots:
+            if not buf[slot]:
+                return slot
+
+        hand: int = self._HAND.unpack_from(buf, bucket)[0]
+        while buf[slots[hand] + 1]:
+            # second chance, clear the bit and move on
+            buf[slots[hand] + 1] = 0
+            hand = (hand + 1) % self._ways
+
+        self._HAND.pack_into(buf, bucket, (hand + 1) % self._ways)
+        self.evictions += 1
+        return slots[hand]
+
+    def pop(self, key: str | bytes | int, default: Any = _MISSING) -> Any:
+        """Removes the key and returns its value, or `default` if it does not exist."""
+        raw, flags, h, bucket = self._locate(key)
+
+        with self._lock(bucket):
+            slot: int = self._match(bucket, raw, flags, h)
+            if slot >= 0:
+                _, _, stored_flags, key_length, value_length, _ = self._SLOT.unpack_from(self._buf, slot)
+                start: int = slot + self._SLOT.size + key_length
+                data: bytes = bytes(self._buf[start:start + value_length])
+                self._buf[slot] = 0
+
+        if slot < 0:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        return pickle.loads(data) if stored_flags & self._PICKLED_VALUE else data
+
+    def clear(self) -> None:
+        for index in range(self._buckets):
+            bucket: int = self._HEADER.size + index * self._bucket_size()
+            
+            with self._lock(bucket):
+                for slot in self._slots(bucket):
+                    self._buf[slot] = 0
+
+    def _used(self) -> Iterator[int]:
+        # no locks, a snapshot that other processes may change while reading
+        for index in range(self._buckets):
+            for slot in self._slots(self._HEADER.size + index * self._bucket_size()):
+                if self._buf[slot]:
+                    yield slot
+
+    def __setitem__(self, key: str | bytes | int, value: Any) -> None:
+        return self.put(key, value)
+
+    def __getitem__(self, key: str | bytes | int) -> Any:
+        value: Any = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __delitem__(self, key: str | bytes | int) -> None:
+        self.pop(key)
+
+    def __contains__(self, key: object) -> bool:
+        raw, flags, h, bucket = self._locate(key)
+        with self._lock(bucket):
+            return self._match(bucket, raw, flags, h) >= 0
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._used())
+
+    def __iter__(self) -> Iterator[str | bytes | int]:
+        """Keys in slot order (snapshot)."""
+        keys: list[str | bytes | int] = []
+        
+        for slot in self._used():
+            _, _, flags, key_length, _, _ = self._SLOT.unpack_from(self._buf, slot)
+            keys.append(self._decode_key(bytes(self._buf[slot + self._SLOT.size:slot + self._SLOT.size + key_length]), flags))
+        return iter(keys)
 
-        while len(self) > new_max_capacity:
-            self.popitem(last=False)
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(name={self.name!r}, items={len(self)}, max_capacity={self.max_capacity})"
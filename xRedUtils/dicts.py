@@ -1,13 +1,35 @@
 """
 This module provides functions for working with dictionaries and JSON data.
 
+### Objects:
+- `CompiledPath` - Reusable accessor of a value in nested dictionaries and lists.
+- `BidirectionalDict` - `dict` with a reverse index, finds keys of a value in O(1).
+- `MergedView` - Lazy, read only `deep_merge` of dictionaries.
+- `CompactRecords` - Columnar table of uniformly keyed dictionaries with a shared schema.
+- `CompactRecord` - Read only `dict`-like view of one row of `CompactRecords`.
+- `JSONCodec` - JSON backend, pair of `loads` and `dumps` functions.
+- `JSONStreamDecoder` - Incremental decoder of concatenated JSON documents.
+
 ### Functions:
-- `dict_walk` - Recursively walks through a dictionary to retrieve a value specified by a given path.
+- `dict_walk` - Walks through a dictionary to retrieve a value specified by a given path.
 - `value_exist` - Checks whether a value exists within a dictionary at the specified path.
+- `compile_path` - Returns a cached, reusable `CompiledPath` accessor.
+- `get_many` - Gets values at many paths of one document.
 - `dict_merge` - Merges two dictionaries.
+- `deep_merge` - Deeply merges dictionaries with per type strategies, sharing unchanged subtrees.
+- `compact_records` - Stores many uniformly keyed dictionaries by columns with a shared schema.
 - `flatten_dict` - Flattens a nested dictionary into a single-level dictionary.
+- `iter_flatten_dict` - Lazily flattens a nested dictionary into `(key, value)` pairs.
+- `unflatten_dict` - Inverse of `flatten_dict`, splits keys into nested dictionaries.
 - `json_to_dict` - Converts JSON data to a Python dictionary.
 - `dict_to_json` - Converts a dictionary to a JSON string with optional indentation and additional keyword arguments.
+- `encode_json` - Converts data to UTF-8 encoded JSON `bytes`.
+- `json_default` - Default hook of `dict_to_json` for `datetime`, `UUID` and `set`.
+- `register_json_codec` - Registers a JSON backend.
+- `get_json_codec` - Returns a registered JSON backend, by default the standard library `json`.
+- `iter_json_lines` - Lazily parses a JSON Lines file, optionally in a process pool.
+- `iter_json_stream` - Lazily parses concatenated JSON documents.
+- `write_json_lines` - Writes documents as JSON Lines in batches.
 - `get_value` - Gets value of specified key.
 - `get_key` - Gets key of specified value.
 - `isEmpty` - Checks if the `dict` is empty.
@@ -21,26 +43,579 @@ from xRedUtils import dicts
 ```
 """
 
-import sys, json, io
+import sys, json, io, functools, datetime, uuid, re, os, codecs, contextlib, itertools, array
 sys.dont_write_bytecode = True
-from .annotations import Iterator, Hashable, Any, overload
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from .annotations import K, V, IO, Callable, ContextManager, Iterable, Iterator, Hashable, Mapping, MutableMapping, Sequence, NamedTuple, Literal, Any, overload
+from .errors import ResourceNotFoundError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
 
 __all__: tuple[str, ...] = (
-    "dict_walk", "value_exist", "dict_merge", "flatten_dict", "json_to_dict", "dict_to_json", "get_value", "get_key", "isEmpty"
+    "CompiledPath", "BidirectionalDict", "MergedView", "CompactRecords", "CompactRecord", "JSONCodec", "JSONStreamDecoder",
+    "dict_walk", "value_exist", "compile_path", "get_many", "dict_merge", "deep_merge", "compact_records", "flatten_dict", "iter_flatten_dict", "unflatten_dict",
+    "json_to_dict", "dict_to_json", "encode_json", "json_default", "register_json_codec", "get_json_codec", "iter_json_lines", "iter_json_stream", "write_json_lines", "get_value", "get_key", "isEmpty"
 )
 
+# sentinel for missing keys, `None` is a valid value
+_MISSING: Any = object()
+_FULL_PATH: slice = slice(None, None)
+_dict_get: Callable[[dict[Hashable, Any], Hashable], Any] = dict.get
+_LIT_STRATEGY = Literal["replace", "append", "union"]
+
+class BidirectionalDict(MutableMapping[K, V]):
+    def __init__(self, data: Mapping[K, V] | Iterable[tuple[K, V]] = (), **kwargs: V) -> None:
+        """
+        `dict` with a reverse index, finds keys of a value in O(1). Values must be hashable.
+
+        ### Parameters:
+        - `data` - Initial items, same as `dict` constructor.
+        - `**kwargs` - Initial items.
+
+        Every mutation keeps a `value -> keys` map in sync, keys of one value are kept in insertion order.
+        Costs one more hash map entry per item.
+        """
+        self._data: dict[K, V] = dict(data, **kwargs)
+        self._inverse: dict[V, dict[K, None]] = {}
+        
+        for key, value in self._data.items():
+            keys: dict[K, None] | None = self._inverse.get(value)
+            if keys is None:
+                self._inverse[value] = {key: None}
+            else:
+                keys[key] = None
+
+    def __getitem__(self, key: K) -> V:
+        return self._data[key]
+
+    def __setitem__(self, key: K, value: V) -> None:
+        old: Any = self._data.get(key, _MISSING)
+        if old is not _MISSING:
+            if old is value or old == value:
+                self._data[key] = value
+                return
+
+        # link the new value first, an unhashable one raises before the old link is dropped
+        self._inverse.setdefault(value, {})[key] = None
+        if old is not _MISSING:
+            self._unlink(key, old)
+        self._data[key] = value
+
+    def __delitem__(self, key: K) -> None:
+        self._unlink(key, self._data.pop(key))
+
+    def _unlink(self, key: K, value: V) -> None:
+        keys: dict[K, None] = self._inverse[value]
+        del keys[key]
+        
+        if not keys:
+            del self._inverse[value]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._inverse.clear()
+
+    def get_key(self, value: V, default: Any = None) -> K | Any:
+        """
+        Gets the first key of `value`, O(1).
+
+        ### Parameters:
+        - `value` - Value to be used for searching.
+        - `default` - Returned if no key has the value.
+
+        ### Returns:
+        - First inserted key of the value or `default`.
+        """
+        keys: dict[K, None] | None = self._inverse.get(value)
+        return default if keys is None else next(iter(keys))
+
+    def get_keys(self, value: V) -> list[K]:
+        """Gets all keys of `value`, in insertion order. Empty `list` if no key has the value."""
+        return list(self._inverse.get(value, ()))
+
+    def has_value(self, value: V) -> bool:
+        """Checks whether any key has `value`, O(1)."""
+        return value in self._inverse
+
+    def copy(self) -> "BidirectionalDict[K, V]":
+        return type(self)(self._data)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, BidirectionalDict):
+            return self._data == other._data
+        return self._data == other
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._data})"
+
+def _check_strategies(strategies: Mapping[type, _LIT_STRATEGY | Callable[[Any, Any], Any]] | None) -> dict[type, Any]:
+    for kind, strategy in (strategies or {}).items():
+        if not callable(strategy) and strategy not in ("replace", "append", "union"):
+            raise ValueError(f"Unknown merge strategy {strategy!r} of {kind.__name__}, expected \"replace\", \"append\", \"union\" or a callable.")
+    
+    return dict(strategies or {})
+
+def _combine(old: Any, new: Any, strategies: dict[type, Any]) -> Any:
+    # strategy of the closest registered base class of `new`, applied only if `old` is of that type too
+    for kind in type(new).__mro__:
+        strategy: Any = strategies.get(kind)
+        if strategy is not None:
+            break
+    else:
+        return new
+
+    if strategy == "replace" or not isinstance(old, kind):
+        return new
+
+    elif strategy == "append":
+        return old + new
+
+    elif strategy == "union":
+        return old | new
+    
+    return strategy(old, new)
+
+def _resolve(values: list[Any], strategies: dict[type, Any]) -> tuple[bool, Any]:
+    """
+    Merges values of one key (first layer first). Returns `(True, dictionaries)` if the result is a merge
+    of the trailing run of dictionaries, otherwise `(False, value)`. A value of other type replaces dictionaries and vice versa.
+    """
+    start: int = len(values) - 1
+    nested: bool = isinstance(values[start], dict)
+    
+    while start and isinstance(values[start - 1], dict) is nested:
+        start -= 1
+
+    if nested:
+        return True, values[start:]
+
+    merged: Any = values[start]
+    for value in values[start + 1:]:
+        merged = _combine(merged, value, strategies)
+    return False, merged
+
+def _layer_values(layers: list[dict[Hashable, Any]]) -> dict[Hashable, list[Any]]:
+    # values of every key, keys in order of first appearance
+    values: dict[Hashable, list[Any]] = {}
+    
+    for layer in layers:
+        for key, value in layer.items():
+            found: list[Any] | None = values.get(key)
+            if found is None:
+                values[key] = [value]
+            else:
+                found.append(value)
+    return values
+
+def _deep_merge(layers: list[dict[Hashable, Any]], strategies: dict[type, Any]) -> dict[Hashable, Any]:
+    merged: dict[Hashable, Any] = {}
+    
+    for key, values in _layer_values(layers).items():
+        if len(values) == 1:
+            # present in one layer only, shared instead of copied
+            merged[key] = values[0]
+            continue
+
+        nested, value = _resolve(values, strategies)
+        merged[key] = (value[0] if len(value) == 1 else _deep_merge(value, strategies)) if nested else value
+    return merged
+
+class MergedView(Mapping[Hashable, Any]):
+    def __init__(self, *layers: dict[Hashable, Any], strategies: Mapping[type, _LIT_STRATEGY | Callable[[Any, Any], Any]] | None = None) -> None:
+        """
+        Lazy, read only `deep_merge` of dictionaries, like `collections.ChainMap` but nested.
+        Later layers override earlier ones, nested dictionaries are resolved on access, nothing is copied.
+
+        ### Parameters:
+        - `*layers` - Dictionaries, from the base to the top overlay.
+        - `strategies` - Same as `deep_merge` strategies.
+
+        Nested dictionaries present in more layers are returned as `MergedView`s, others as they are.
+        Changes of the layers are visible immediately. Use `to_dict` to materialize it.
+
+        ### Raises:
+        - `ValueError` - If a strategy is unknown.
+        """
+        self._layers: list[dict[Hashable, Any]] = list(layers)
+        self._strategies: dict[type, Any] = _check_strategies(strategies)
+
+    @classmethod
+    def _from_layers(cls, layers: list[dict[Hashable, Any]], strategies: dict[type, Any]) -> "MergedView":
+        view: MergedView = cls.__new__(cls)
+        view._layers = layers
+        view._strategies = strategies
+        return view
+
+    @property
+    def layers(self) -> list[dict[Hashable, Any]]:
+        return self._layers
+
+    def __getitem__(self, key: Hashable) -> Any:
+        values: list[Any] = [layer[key] for layer in self._layers if key in layer]
+        
+        if not values:
+            raise KeyError(key)
+        elif len(values) == 1:
+            return values[0]
+
+        nested, value = _resolve(values, self._strategies)
+        if nested:
+            return value[0] if len(value) == 1 else self._from_layers(value, self._strategies)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return any(key in layer for layer in self._layers)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(dict.fromkeys(key for layer in self._layers for key in layer))
+
+    def __len__(self) -> int:
+        return len(dict.fromkeys(key for layer in self._layers for key in layer))
+
+    def new_child(self, layer: dict[Hashable, Any] | None = None) -> "MergedView":
+        """New view with `layer` (empty by default) on top of the current layers."""
+        return self._from_layers([*self._layers, {} if layer is None else layer], self._strategies)
+
+    def to_dict(self) -> dict[Hashable, Any]:
+        """Materializes the view with `deep_merge`, unchanged subtrees are shared."""
+        return _deep_merge(self._layers, self._strategies)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(map(repr, self._layers))})"
+
+def _index(part: Hashable) -> int | None:
+    # int form of a path segment, used for `list` indexes and int dictionary keys
+    if isinstance(part, int):
+        return part
+
+    if isinstance(part, str) and (part.isdigit() or (part[:1] == "-" and part[1:].isdigit())):
+        return int(part)
+    return None
+
+def _walk(document: Any, segments: tuple[tuple[Hashable, int | None], ...], default: Any, keys: tuple[Hashable, ...] | None = None) -> Any:
+    current: Any = document
+    
+    if keys is not None:
+        # `dict.get` only accepts plain dictionaries, anything else (lists, misses, `None` values) takes the slow path
+        try:
+            for key in keys:
+                current = _dict_get(current, key)
+            if current is not None:
+                return current
+        except TypeError:
+            pass
+        current = document
+
+    for key, index in segments:
+        if isinstance(current, dict):
+            value = current.get(key, _MISSING)
+            if value is _MISSING and index is not None:
+                value = current.get(index, _MISSING)
+            
+            if value is _MISSING:
+                return default
+            current = value
+
+        elif isinstance(current, list | tuple):
+            if index is None or not -len(current) <= index < len(current):
+                return default
+            current = current[index]
+
+        elif isinstance(current, Mapping) and key in current:
+            current = current[key]
+        
+        else:
+            return default
+    return current
+
+# typed arrays of packed numeric columns, 8 bytes per value and no objects
+_PACKED: tuple[tuple[type, str], ...] = ((int, "q"), (float, "d"))
+
+def _pack_column(column: list[Any], pack: bool) -> list[Any] | array.array:
+    for kind, typecode in _PACKED if pack else ():
+        # `type is` keeps `bool` (an `int` subclass) and subclasses as objects
+        if all(type(value) is kind for value in column):
+            try:
+                return array.array(typecode, column)
+            except OverflowError:
+                break
+    # a slice drops the over-allocation of appended lists
+    return column[:]
+
+class CompactRecord(Mapping[Hashable, Any]):
+    __slots__ = ("_records", "_row")
+
+    def __init__(self, records: "CompactRecords", row: int) -> None:
+        """
+        Read only `dict`-like view of one row of `CompactRecords`, created on access.
+
+        ### Parameters:
+        - `records` - Owner of the row.
+        - `row` - Index of the row.
+        """
+        self._records: CompactRecords = records
+        self._row: int = row
+
+    def __getitem__(self, key: Hashable) -> Any:
+        position: int | None = self._records._index.get(key)
+        if position is None:
+            raise KeyError(key)
+        
+        value: Any = self._records._columns[position][self._row]
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[Hashable]:
+        row: int = self._row
+        for key, column in zip(self._records._keys, self._records._columns):
+            if column[row] is not _MISSING:
+                yield key
+
+    def __len__(self) -> int:
+        row: int = self._row
+        return sum(1 for column in self._records._columns if column[row] is not _MISSING)
+
+    def to_dict(self) -> dict[Hashable, Any]:
+        row: int = self._row
+        return {key: value for key, column in zip(self._records._keys, self._records._columns) if (value := column[row]) is not _MISSING}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+class CompactRecords(Sequence[CompactRecord]):
+    __slots__ = ("_keys", "_index", "_columns", "_length")
+
+    def __init__(self, records: Iterable[Mapping[Hashable, Any]] = (), pack: bool = True) -> None:
+        """
+        Immutable table of many small, uniformly keyed dictionaries, stored by columns with one shared schema.
+        A row costs a pointer per key instead of a whole `dict`, numeric columns are packed into typed arrays.
+
+        ### Parameters:
+        - `records` - Dictionaries, generators included. Keys missing in some of them are allowed.
+        - `pack` - Packs columns of `int` (64 bit) or `float` values only into `array.array`.
+
+        Rows are read through `CompactRecord` views, which act like read only `dict`s and are created on every access,
+        prefer `column` to scan one key of all rows. Keys are the union of all keys in the order they were first seen.
+        """
+        keys: list[Hashable] = []
+        index: dict[Hashable, int] = {}
+        columns: list[list[Any]] = []
+        length: int = 0
+
+        for record in records:
+            found: int = 0
+            for key, value in record.items():
+                position: int | None = index.get(key)
+                if position is None:
+                    position = index[key] = len(keys)
+                    keys.append(key)
+                    columns.append([_MISSING] * length)
+                
+                columns[position].append(value)
+                found += 1
+            
+            length += 1
+            # some key is missing in this record, pad its column
+            if found != len(columns):
+                for column in columns:
+                    if len(column) < length:
+                        column.append(_MISSING)
+
+        self._keys: tuple[Hashable, ...] = tuple(keys)
+        self._index: dict[Hashable, int] = index
+        self._columns: list[list[Any] | array.array] = [_pack_column(column, pack) for column in columns]
+        self._length: int = length
+
+    @property
+    def keys(self) -> tuple[Hashable, ...]:
+        """Shared schema, union of all keys."""
+        return self._keys
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, row: int) -> CompactRecord: ...
+    @overload
+    def __getitem__(self, row: slice) -> list[CompactRecord]: ...
+
+    def __getitem__(self, row: int | slice) -> CompactRecord | list[CompactRecord]:
+        if isinstance(row, slice):
+            return [CompactRecord(self, index) for index in range(*row.indices(self._length))]
+        
+        if row < 0:
+            row += self._length
+        if not 0 <= row < self._length:
+            raise IndexError("CompactRecords index out of range")
+        return CompactRecord(self, row)
+
+    def __iter__(self) -> Iterator[CompactRecord]:
+        for row in range(self._length):
+            yield CompactRecord(self, row)
+
+    def column(self, key: Hashable, default: Any = None) -> list[Any]:
+        """
+        Values of one key in all rows.
+
+        ### Parameters:
+        - `key` - Key of the column.
+        - `default` - Value of rows without the key.
+
+        ### Returns:
+        - `list` of values.
+
+        ### Raises:
+        - `KeyError` - If no record has the key.
+        """
+        column: list[Any] | array.array = self._columns[self._index[key]]
+        if isinstance(column, array.array):
+            return column.tolist()
+        return [default if value is _MISSING else value for value in column]
+
+    def to_dicts(self) -> list[dict[Hashable, Any]]:
+        return [record.to_dict() for record in self]
+
+    def __reduce__(self) -> tuple[type, tuple[list[dict[Hashable, Any]], bool]]:
+        # the missing key sentinel is not picklable by identity
+        return type(self), (self.to_dicts(), any(isinstance(column, array.array) for column in self._columns))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._length} records, keys={list(self._keys)!r})"
+
+class CompiledPath:
+    __slots__ = ("_path", "_segments", "_keys")
+
+    def __init__(self, path: str | Iterable[Hashable], _sep: str = ".") -> None:
+        """
+        Reusable accessor of a value in nested dictionaries and lists, the path is split only once.
+        Made for hot paths that read the same paths over and over, use `compile_path` to share accessors.
+
+        ### Parameters:
+        - `path` - The path to the value, specified as a `str` (`"a.b.0.c"`) or an iterable of keys.
+        - `_sep` - Separator used to split the path if it's a `str` (default is `"."`).
+
+        Digit segments index `list`/`tuple` values (negative too) and fall back to `int` keys of dictionaries.
+        Misses return a default value instead of raising.
+        """
+        self._path: str | tuple[Hashable, ...] = path if isinstance(path, str) else tuple(path)
+        self._segments: tuple[tuple[Hashable, int | None], ...] = tuple(
+            (part, _index(part)) for part in (path.split(_sep) if isinstance(path, str) else self._path)
+        )
+        self._keys: tuple[Hashable, ...] = tuple(key for key, _ in self._segments)
+
+    @property
+    def path(self) -> str | tuple[Hashable, ...]:
+        return self._path
+
+    @property
+    def segments(self) -> tuple[Hashable, ...]:
+        return self._keys
+
+    def get(self, document: Any, default: Any = None) -> Any:
+        """
+        Gets the value at the path.
+
+        ### Parameters:
+        - `document` - Nested dictionaries and lists.
+        - `default` - Returned if the path does not exist.
+
+        ### Returns:
+        - The value at the path or `default`.
+        """
+        # inlined fast path of `_walk`, this is the hot one
+        current: Any = document
+        get: Callable[[dict[Hashable, Any], Hashable], Any] = _dict_get
+        
+        try:
+            for key in self._keys:
+                current = get(current, key)
+            if current is not None:
+                return current
+        except TypeError:
+            pass
+        return _walk(document, self._segments, default)
+
+    __call__ = get
+
+    def exists(self, document: Any) -> bool:
+        """Checks whether the path exists in `document`."""
+        return _walk(document, self._segments, _MISSING, self._keys) is not _MISSING
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._path!r})"
+
+@functools.lru_cache(maxsize=1024)
+def _compile_path(path: str | tuple[Hashable, ...], _sep: str) -> CompiledPath:
+    return CompiledPath(path, _sep)
+
+def compile_path(path: str | Iterable[Hashable], _sep: str = ".") -> CompiledPath:
+    """
+    Returns a reusable `CompiledPath` accessor, the last 1024 compiled paths are kept in an LRU cache.
+
+    ### Parameters:
+    - `path` - The path to the value, specified as a `str` (`"a.b.0.c"`) or an iterable of keys.
+    - `_sep` - Separator used to split the path if it's a `str` (default is `"."`).
+
+    ### Returns:
+    - `CompiledPath`, call it or its `get` with a document.
+    """
+    if isinstance(path, CompiledPath):
+        return path
+    
+    return _compile_path(path if isinstance(path, str) else tuple(path), _sep)
+
+def get_many(dictionary: dict[Hashable, Any], paths: Iterable[str | Iterable[Hashable] | CompiledPath], default: Any = None, _sep: str = ".") -> list[Any]:
+    """
+    Gets values at many paths of one document, paths are compiled (and cached) once.
+
+    ### Parameters:
+    - `dictionary` - Nested dictionaries and lists.
+    - `paths` - Paths as `str`, iterables of keys or `CompiledPath`s.
+    - `default` - Value of paths that do not exist.
+    - `_sep` - Separator used to split `str` paths (default is `"."`).
+
+    ### Returns:
+    - `list` of values, in order of `paths`.
+    """
+    accessors: list[CompiledPath] = [compile_path(path, _sep) for path in paths]
+    return [_walk(dictionary, accessor._segments, default, accessor._keys) for accessor in accessors]
+
 @overload
 def dict_walk(dictionary: dict[Hashable, Any], path: str | list[str], _sep: str = ".") -> Any: ...
 @overload
 def dict_walk(dictionary: dict[Hashable, Any], path: str | list[str], _sep: str = ".", _slice: slice = slice(None, None)) -> Any: ...
 
-def dict_walk(dictionary: dict[Hashable, Any], path: str | list[str], _sep: str = ".", _slice: slice = slice(None, None)) -> Any:
+def dict_walk(dictionary: dict[Hashable, Any], path: str | list[str], _sep: str = ".", _slice: slice = _FULL_PATH) -> Any:
     """
-    Recursively walks through a dictionary to retrieve a value specified by a given path.
+    Walks through a dictionary to retrieve a value specified by a given path. The path is compiled with `compile_path`.
 
     ### Parameters:
     - `dictionary` - The dictionary to traverse.
-    - `path` - The path to the desired value, specified as a `str` or `list of str`.
+    - `path` - The path to the desired value, specified as a `str` or `list of str`. Digit segments index lists.
 
     - `_sep` - Separator used to split the path if it's a `str` (default is `"."`).
     - `_slice` - Slice object indicating the range of elements to consider in the path (default is `slice(None, None)` or full path).
@@ -49,18 +624,18 @@ def dict_walk(dictionary: dict[Hashable, Any], path: str | list[str], _sep: str
     - The value found at the specified path within the dictionary.
 
     ### Raises:
-    - `MemoryError` - If the specified path cannot be found within the dictionary.
+    - `ResourceNotFoundError` - If the specified path cannot be found within the dictionary. (subclass of `MemoryError`)
     """
-    current: dict[Hashable, Any] = dictionary
-    path = path.split(_sep) if isinstance(path, str) else path
-
-    for key in path[_slice]:
-        if key in current:
-            current = current[key]
-        else:
-            raise MemoryError(f"Failed to reach value specified: `{key}` on `{path}`")
-
-    return current
+    accessor: CompiledPath = _compile_path(path, _sep) if isinstance(path, str) else compile_path(path, _sep)
+    
+    if _slice is _FULL_PATH or _slice == _FULL_PATH:
+        value: Any = accessor.get(dictionary, _MISSING)
+    else:
+        value = _walk(dictionary, accessor._segments[_slice], _MISSING, accessor._keys[_slice])
+    
+    if value is _MISSING:
+        raise ResourceNotFoundError(f"Failed to reach value specified: `{path}`")
+    return value
 
 def value_exist(dictionary: dict[Hashable, Any], path: str | list[str], **kwargs) -> bool:
     """
@@ -69,20 +644,18 @@ def value_exist(dictionary: dict[Hashable, Any], path: str | list[str], **kwargs
     ### Parameters:
     - `dictionary` - The dictionary to search within.
     - `path` The path to the value being checked, specified as a `string` or `list of strings`.
-    - `**kwargs` - Additional keyword arguments to pass to the `dicts.dict_walk` function.
+    - `**kwargs` - Additional keyword arguments of the `dicts.dict_walk` function (`_sep`, `_slice`).
 
     ### Returns:
     - `True` if the value exists at the specified path within the dictionary, `False` otherwise.
     """
-    try:
-        dict_walk(dictionary, path, **kwargs)
-        return True 
-    except:
-        return False
+    accessor: CompiledPath = compile_path(path, kwargs.get("_sep", "."))
+    _slice: slice = kwargs.get("_slice", slice(None, None))
+    return _walk(dictionary, accessor._segments[_slice], _MISSING, accessor._keys[_slice]) is not _MISSING
 
 def dict_merge(dict1: dict[Hashable, Any], dict2: dict[Hashable, Any]) -> dict[Hashable, Any]:
     """
-    Merges two dictionaries.
+    Merges two dictionaries, shallow. See `deep_merge` for nested dictionaries.
 
     ### Parameters:
     - `dict1` - The first dictionary to merge.
@@ -93,62 +666,635 @@ def dict_merge(dict1: dict[Hashable, Any], dict2: dict[Hashable, Any]) -> dict[H
     """
     return dict1 | dict2
 
+def deep_merge(*dictionaries: dict[Hashable, Any], strategies: Mapping[type, _LIT_STRATEGY | Callable[[Any, Any], Any]] | None = None) -> dict[Hashable, Any]:
+    """
+    Deeply merges dictionaries, later ones override earlier ones. Nested dictionaries are merged, other values are replaced
+    unless `strategies` say otherwise.
+
+    Aka. this:
+    ```python
+    >>> deep_merge({"db": {"host": "a", "port": 1}, "tags": ["x"]}, {"db": {"port": 2}, "tags": ["y"]}, strategies={list: "append"})
+    {"db": {"host": "a", "port": 2}, "tags": ["x", "y"]}
+    ```
+
+    ### Parameters:
+    - `*dictionaries` - Dictionaries to merge, from the base to the top overlay. Inputs are never modified.
+    - `strategies` - Merge strategy of values per type (subclasses included), applied when both values are of that type:
+    `"replace"` (default), `"append"` (`old + new`, lists/tuples), `"union"` (`old | new`, sets) or a callable `(old, new) -> merged`.
+
+    ### Returns:
+    - A new `dictionary`. Subtrees present in one input only are shared with it, not copied, so the result
+    costs memory only for the merged paths. Copy it before changing nested values.
+
+    ### Raises:
+    - `ValueError` - If a strategy is unknown.
+    """
+    strategies = _check_strategies(strategies)
+    
+    if len(dictionaries) == 1:
+        return dict(dictionaries[0])
+    return _deep_merge(list(dictionaries), strategies)
+
+def compact_records(records: Iterable[Mapping[Hashable, Any]], pack: bool = True) -> CompactRecords:
+    """
+    Stores many small, uniformly keyed dictionaries (rows of `json_to_dict`, `iter_json_lines`, `flatten_dict`...) by columns with one shared schema.
+    
+    A `dict` of 5 keys costs about 200 bytes plus its values, a row of `CompactRecords` 8 bytes per key.
+    Numeric columns are packed into typed arrays, which also frees the `int`/`float` objects.
+
+    ### Parameters:
+    - `records` - Dictionaries, generators included, so the input never has to be held in memory at once.
+    - `pack` - Packs columns of `int` (64 bit) or `float` values only into `array.array`.
+
+    ### Returns:
+    - Immutable `CompactRecords`, a sequence of read only `dict`-like `CompactRecord` views.
+    """
+    return CompactRecords(records, pack)
+
+def iter_flatten_dict(dictionary: dict[Hashable, Any], _sep: str = "_", _parent_key: str = "", flatten_lists: bool = False) -> Iterator[tuple[Hashable, Any]]:
+    """
+    Lazily flattens a nested dictionary into `(key, value)` pairs, without recursion. Made for documents too big to flatten at once.
+
+    ### Parameters:
+    - `dictionary` - The dictionary to flatten.
+    - `_sep` - Separator used to join keys (default is "_").
+    - `_parent_key` - Prefix of the first level keys (default is `""`, first level keys are kept as is).
+    - `flatten_lists` - Also flattens `list`/`tuple` values, their indexes become keys (`"a_0"`).
+
+    ### Returns:
+    - Generator of `(key, value)` pairs, empty nested containers are skipped.
+
+    ### Raises:
+    - `ValueError` - If the dictionary contains itself (a reference cycle). Shared, non cyclic values are flattened every time.
+    """
+    containers: type | tuple[type, ...] = (dict, list, tuple) if flatten_lists else dict
+    
+    # every level keeps its items iterator and key prefix, ids of containers on the current path detect cycles
+    stack: list[tuple[Iterator[tuple[Hashable, Any]], str | None, int]] = [
+        (iter(dictionary.items()), f"{_parent_key}{_sep}" if _parent_key else None, id(dictionary))
+    ]
+    path: set[int] = {id(dictionary)}
+
+    while stack:
+        items, prefix, identity = stack[-1]
+        
+        for key, value in items:
+            new_key: Hashable = key if prefix is None else f"{prefix}{key}"
+            
+            if isinstance(value, containers):
+                if id(value) in path:
+                    raise ValueError(f"Cyclic reference at `{new_key}`.")
+                
+                path.add(id(value))
+                stack.append((iter(value.items()) if isinstance(value, dict) else enumerate(value), f"{new_key}{_sep}", id(value)))
+                break
+            
+            yield new_key, value
+        else:
+            stack.pop()
+            path.discard(identity)
+
 @overload
 def flatten_dict(dictionary: dict[str, Any], _sep: str= "_") -> dict[str, Any]: ...
 @overload
-def flatten_dict(dictionary: dict[str, Any], _sep: str= "_", _parent_key="") -> dict[str, Any]: ...
+def flatten_dict(dictionary: dict[str, Any], _sep: str= "_", _parent_key="", flatten_lists: bool = False) -> dict[str, Any]: ...
 
-def flatten_dict(dictionary: dict[str, Any], _sep: str= "_", _parent_key="") -> dict[str, Any]:
+def flatten_dict(dictionary: dict[str, Any], _sep: str= "_", _parent_key="", flatten_lists: bool = False) -> dict[str, Any]:
     """
-    Flattens a nested dictionary into a single-level dictionary.
+    Flattens a nested dictionary into a single-level dictionary, without recursion.
 
     ### Parameters:
     - `dictionary` - The dictionary to flatten.
     - `_sep` - Separator used to join keys in the flattened dictionary (default is "_").
-    - `_parent_key` - Internal parameter used for recursive calls to keep track of parent keys (default is `""`), can be changed, but will only be applied to the first level keys.
+    - `_parent_key` - Prefix of the first level keys (default is `""`, first level keys are kept as is).
+    - `flatten_lists` - Also flattens `list`/`tuple` values, their indexes become keys (`"a_0"`).
 
     ### Returns:
     - A single-level `dictionary` where nested keys are joined with the separator.
+
+    ### Raises:
+    - `ValueError` - If the dictionary contains itself (a reference cycle).
+    """
+    return dict(iter_flatten_dict(dictionary, _sep, _parent_key, flatten_lists))
+
+def unflatten_dict(dictionary: dict[Hashable, Any], _sep: str = "_", unflatten_lists: bool = False) -> dict[Hashable, Any]:
+    """
+    Inverse of `flatten_dict`, splits keys on the separator into nested dictionaries.
+
+    ### Parameters:
+    - `dictionary` - The single-level dictionary to unflatten, non `str` keys are kept as is.
+    - `_sep` - Separator used to split keys (default is "_").
+    - `unflatten_lists` - Turns nested dictionaries with keys `"0"` to `"n"` back into `list`s.
+
+    ### Returns:
+    - A nested `dictionary`.
+
+    ### Raises:
+    - `ValueError` - If a key is both a value and a prefix of other keys (`"a"` and `"a_b"`).
+    """
+    root: dict[Hashable, Any] = {}
+    # (parent, key, child) of every created dictionary, in creation order
+    created: list[tuple[dict[Hashable, Any], Hashable, dict[Hashable, Any]]] = []
+    nodes: set[int] = {id(root)}
+
+    for key, value in dictionary.items():
+        parts: list[Hashable] = key.split(_sep) if isinstance(key, str) else [key]
+        node: dict[Hashable, Any] = root
+        
+        for part in parts[:-1]:
+            child: Any = node.get(part, _MISSING)
+            
+            if child is _MISSING:
+                child = node[part] = {}
+                nodes.add(id(child))
+                created.append((node, part, child))
+            
+            elif id(child) not in nodes:
+                raise ValueError(f"Key `{key}` conflicts with value of `{part}`.")
+            node = child
+
+        if parts[-1] in node:
+            raise ValueError(f"Key `{key}` conflicts with other keys.")
+        node[parts[-1]] = value
+
+    if unflatten_lists:
+        # children were created after their parents, so they are converted first
+        for parent, key, child in reversed(created):
+            if all(str(index) in child for index in range(len(child))):
+                parent[key] = [child[str(index)] for index in range(len(child))]
+
+    return root
+
+class JSONCodec(NamedTuple):
+    """
+    JSON backend of `json_to_dict`, `dict_to_json` and `files`.
+
+    - `loads(data)` - Parses `str`, `bytes` or `bytearray`.
+    - `dumps(data, indent, default)` - Returns compact `str` or UTF-8 `bytes`, `default` is called on unsupported objects.
+    """
+    name: str
+    loads: Callable[[str | bytes | bytearray], Any]
+    dumps: Callable[[Any, int | None, Callable[[Any], Any] | None], str | bytes]
+
+def json_default(obj: Any) -> Any:
+    """
+    Default `default` hook of `dict_to_json`, converts `datetime`/`date`/`time` to ISO 8601, `UUID` to `str` and `set` to `list`.
+
+    ### Parameters:
+    - `obj` - Object that JSON backend can't serialize.
+
+    ### Returns:
+    - JSON serializable replacement of the object.
+
+    ### Raises:
+    - `TypeError` - If the object is not supported.
     """
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _json_loads(data: str | bytes | bytearray) -> Any:
+    return json.loads(data)
+
+def _json_dumps(data: Any, indent: int | None = None, default: Callable[[Any], Any] | None = None) -> str:
+    if indent is None:
+        return json.dumps(data, separators=(",", ":"), default=default)
+    return json.dumps(data, indent=indent, default=default)
+
+# installed backends, `json` is the default one, the others lose data on edge cases (see `get_json_codec`)
+_JSON_CODECS: dict[str, JSONCodec] = {"json": JSONCodec("json", _json_loads, _json_dumps)}
+
+if orjson is not None:
+    def _orjson_dumps(data: Any, indent: int | None = None, default: Callable[[Any], Any] | None = None) -> bytes | str:
+        if indent is None:
+            return orjson.dumps(data, default=default, option=orjson.OPT_NON_STR_KEYS)
+        if indent == 2:
+            return orjson.dumps(data, default=default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2)
+        # orjson only indents by 2 spaces
+        return _json_dumps(data, indent, default)
+
+    _JSON_CODECS["orjson"] = JSONCodec("orjson", orjson.loads, _orjson_dumps)
+
+if msgspec is not None:
+    def _msgspec_dumps(data: Any, indent: int | None = None, default: Callable[[Any], Any] | None = None) -> bytes:
+        encoded: bytes = msgspec.json.encode(data, enc_hook=default)
+        return encoded if indent is None else msgspec.json.format(encoded, indent=indent)
+
+    _JSON_CODECS["msgspec"] = JSONCodec("msgspec", msgspec.json.decode, _msgspec_dumps)
+
+if ujson is not None:
+    def _ujson_dumps(data: Any, indent: int | None = None, default: Callable[[Any], Any] | None = None) -> str:
+        return ujson.dumps(data, indent=indent or 0, default=default, ensure_ascii=False, escape_forward_slashes=False)
+
+    _JSON_CODECS["ujson"] = JSONCodec("ujson", ujson.loads, _ujson_dumps)
 
-    items: dict[str, Any] = {}
+_json_codec: JSONCodec = _JSON_CODECS["json"]
+
+def register_json_codec(name: str, loads: Callable[[str | bytes | bytearray], Any], dumps: Callable[[Any, int | None, Callable[[Any], Any] | None], str | bytes], default: bool = False) -> JSONCodec:
+    """
+    Registers a JSON backend usable by name in `json_to_dict`, `dict_to_json` and `files`.
+
+    ### Parameters:
+    - `name` - Name of the backend, replaces a registered backend with the same name.
+    - `loads` - Function parsing `str`, `bytes` or `bytearray`.
+    - `dumps` - Function of `(data, indent, default)` returning compact `str` or UTF-8 `bytes` if `indent` is `None`.
+    - `default` - Use the backend when no `codec` is specified.
+
+    ### Returns:
+    - Registered `JSONCodec`.
+    """
+    global _json_codec
+    codec: JSONCodec = JSONCodec(name, loads, dumps)
+    _JSON_CODECS[name] = codec
     
-    for k, v in dictionary.items():
-        new_key: str = f"{_parent_key}{_sep}{k}" if _parent_key else k
-        if isinstance(v, dict):
-            items.update(flatten_dict(v, _sep=_sep, _parent_key=new_key).items())
-        else:
-            items[new_key] = v
-    return items
+    if default or _json_codec.name == name:
+        _json_codec = codec
+    return codec
+
+def get_json_codec(name: str | None = None) -> JSONCodec:
+    """
+    Returns a registered JSON backend.
+
+    ### Parameters:
+    - `name` - Name of the backend, `"orjson"`, `"msgspec"`, `"ujson"`, `"json"` or a registered one.
+        If `None` the default is returned, which is the standard library `json`.
 
-def json_to_dict(d: bytes | str | bytearray | io.TextIOWrapper, **kwargs) -> dict[str, Any]:
+    Faster backends are opt-in, per call with `codec` or for every call with
+    `register_json_codec(*get_json_codec("orjson"), default=True)`. They differ from `json` on edge cases:
+    `orjson` parses integers over 64 bits as `float` and can't write them, `orjson` and `msgspec` write
+    `NaN`/`Infinity` as `null`, and none of them parse `NaN`/`Infinity` except `ujson`.
+    `json` escapes non-ASCII characters (`"\\u00e9"`) like `json.dumps`, the others write them as UTF-8.
+
+    ### Returns:
+    - `JSONCodec`.
+
+    ### Raises:
+    - `ValueError` - If the backend is not installed or registered.
+    """
+    if name is None:
+        return _json_codec
+    
+    codec: JSONCodec | None = _JSON_CODECS.get(name)
+    if codec is None:
+        raise ValueError(f"JSON codec `{name}` is not available, available are: {', '.join(_JSON_CODECS)}")
+    return codec
+
+def _check_json_kwargs(codec: str | None, kwargs: dict[str, Any]) -> None:
+    if codec is not None and codec != "json":
+        raise ValueError(f"Extra arguments {', '.join(kwargs)} are only supported by the standard library `json`, not by `{codec}` codec.")
+
+def _dump_json(data: Any, indent: int | None = None, default: Callable[[Any], Any] | None = json_default, codec: str | None = None, **kwargs) -> str | bytes:
+    # extra `json.dumps` arguments are only understood by the standard library
+    if kwargs:
+        _check_json_kwargs(codec, kwargs)
+        kwargs.setdefault("separators", (",", ":") if indent is None else None)
+        if "cls" in kwargs and default is json_default:
+            # `default` argument would override the `default` method of the encoder
+            default = None
+        return json.dumps(data, indent=indent, default=default, **kwargs)
+    return get_json_codec(codec).dumps(data, indent, default)
+
+def encode_json(data: Any, indent: int | None = None, default: Callable[[Any], Any] | None = json_default, codec: str | None = None, **kwargs) -> bytes:
+    """
+    Converts data to UTF-8 encoded JSON, the backends that produce `bytes` skip the `str` round trip.
+
+    ### Parameters:
+    - `data` - Any JSON serializable data.
+    - `indent` - The number of spaces used for indentation (default is `None`, compact output without spaces).
+    - `default` - Called on objects the backend can't serialize (default is `json_default`, handles `datetime`, `UUID` and `set`). *Not used with `cls`, the encoder's `default` method is.*
+    - `codec` - Name of JSON backend, see `get_json_codec` (default is the standard library `json`).
+    - `**kwargs` - Additional keyword arguments to pass to the `json.dumps` function, uses the standard library whatever the default codec is.
+
+    ### Returns:
+    - JSON as `bytes`.
+
+    ### Raises:
+    - `ValueError` - If `**kwargs` are given with a `codec` other than `json`.
+    """
+    result: str | bytes = _dump_json(data, indent, default, codec, **kwargs)
+    return result.encode() if isinstance(result, str) else result
+
+def json_to_dict(d: bytes | str | bytearray | memoryview | io.IOBase, codec: str | None = None, **kwargs) -> dict[str, Any]:
     """
     Converts JSON data to a Python dictionary.
 
     ### Parameters:
-    - `d` - JSON data, which can be provided as `bytes`, `string`, `bytearray`, or a `text file`.
-    - `**kwargs` - Additional keyword arguments to pass to the `json.loads` function.
+    - `d` - JSON data, which can be provided as `bytes`, `string`, `bytearray`, `memoryview` or a `file` (text or binary).
+        *`bytes` are parsed directly, open files in `rb` mode to skip decoding.*
+    - `codec` - Name of JSON backend, see `get_json_codec` (default is the standard library `json`).
+    - `**kwargs` - Additional keyword arguments to pass to the `json.loads` function, uses the standard library whatever the default codec is.
 
     ### Returns:
     - A `dictionary` containing the parsed JSON data.
+
+    ### Raises:
+    - `ValueError` - If `**kwargs` are given with a `codec` other than `json`.
     """
-    if isinstance(d, io.TextIOWrapper):
+    if isinstance(d, io.IOBase):
         d = d.read()
-    return json.loads(d, **kwargs)
+    elif isinstance(d, memoryview):
+        d = d.tobytes()
+
+    if kwargs:
+        _check_json_kwargs(codec, kwargs)
+        return json.loads(d, **kwargs)
+    return get_json_codec(codec).loads(d)
 
-def dict_to_json(dictionary: dict[str, Any], indent: int = 4, **kwargs) -> str:
+def dict_to_json(dictionary: dict[str, Any], indent: int | None = None, default: Callable[[Any], Any] | None = json_default, codec: str | None = None, **kwargs) -> str:
     """
     Converts a dictionary to a JSON string with optional indentation and additional keyword arguments.
 
     ### Parameters:
     - `dictionary` - The dictionary to convert to JSON.
-    - `indent` - The number of spaces used for indentation (default is `4`).  *Made for better readablity of JSON, can be set to `None`*
-    - `**kwargs` - Additional keyword arguments to pass to the `json.dumps` function.
+    - `indent` - The number of spaces used for indentation (default is `None`, compact output without spaces).
+    - `default` - Called on objects the backend can't serialize (default is `json_default`, handles `datetime`, `UUID` and `set`). *Not used with `cls`, the encoder's `default` method is.*
+    - `codec` - Name of JSON backend, see `get_json_codec` (default is the standard library `json`).
+    - `**kwargs` - Additional keyword arguments to pass to the `json.dumps` function, uses the standard library whatever the default codec is.
 
     ### Returns:
     - A JSON string representing the dictionary.
+
+    ### Raises:
+    - `ValueError` - If `**kwargs` are given with a `codec` other than `json`.
     """
-    return json.dumps(dictionary, indent=indent, **kwargs)
+    result: str | bytes = _dump_json(dictionary, indent, default, codec, **kwargs)
+    return result.decode() if isinstance(result, bytes) else result
+
+# JSON whitespace, `raw_decode` does not skip it before a document
+_JSON_WHITESPACE: re.Pattern[str] = re.compile(r"[ \t\n\r]*")
+# rest of a string up to its closing quote, strings without escapes, and everything but brackets and quotes
+_JSON_STRING_BODY: re.Pattern[str] = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+_JSON_PLAIN_STRING: re.Pattern[str] = re.compile(r'"[^"]*"')
+_JSON_NOT_STRUCTURE: re.Pattern[str] = re.compile(r'[^{}\[\]"]+')
+# `str.translate` table deleting ASCII characters that can't change nesting, much faster than a regex
+_JSON_SCALARS: dict[int, None] = dict.fromkeys(code for code in range(128) if chr(code) not in '{}[]"')
+_JSON_NESTING: dict[str, int] = {"{": 1, "[": 1, "}": -1, "]": -1}
+
+class JSONStreamDecoder:
+    __slots__ = ("_decoder", "_text", "_chunks", "_length", "_depth", "_in_string", "_escaped", "max_buffer")
+
+    def __init__(self, max_buffer: int = 64 * 1024 ** 2, **kwargs) -> None:
+        """
+        Incremental decoder of concatenated JSON documents (`{"a": 1}{"a": 2} [3]`), built on `json.JSONDecoder.raw_decode`.
+        Feed it chunks of any size, only the unfinished document is kept between them.
+        Chunks are scanned once for nesting and strings, documents are decoded only after one may have ended,
+        so a big document split into many chunks is decoded once.
+
+        ### Parameters:
+        - `max_buffer` - Maximum length of an unfinished document in characters, guards memory against a broken stream.
+        - `**kwargs` - Additional keyword arguments to pass to `json.JSONDecoder`.
+        """
+        self._decoder: json.JSONDecoder = json.JSONDecoder(**kwargs)
+        self._text: codecs.IncrementalDecoder = codecs.getincrementaldecoder("utf-8")()
+        self._chunks: list[str] = []
+        self._length: int = 0
+        self._reset_scan()
+        self.max_buffer: int = max_buffer
+
+    def feed(self, data: str | bytes | bytearray) -> list[Any]:
+        """
+        Adds a chunk of the stream, UTF-8 sequences split between chunks are joined.
+
+        ### Parameters:
+        - `data` - Next chunk of the stream.
+
+        ### Returns:
+        - `list` of documents completed by the chunk.
+
+        ### Raises:
+        - `ValueError` - If the unfinished document grows over `max_buffer`.
+        """
+        if not isinstance(data, str):
+            data = self._text.decode(data)
+        
+        self._chunks.append(data)
+        self._length += len(data)
+        documents: list[Any] = []
+
+        if self._scan(data):
+            buffer: str = "".join(self._chunks)
+            documents, position = self._decode(buffer, False)
+            
+            rest: str = buffer[position:]
+            self._chunks = [rest] if rest else []
+            self._length = len(rest)
+            self._reset_scan()
+            self._scan(rest)
+        
+        if self._length > self.max_buffer:
+            raise ValueError(f"No complete JSON document within {self.max_buffer} characters, the stream is broken or `max_buffer` is too small.")
+        return documents
+
+    def close(self) -> list[Any]:
+        """
+        Ends the stream, the decoder can be reused afterwards.
+
+        ### Returns:
+        - `list` of remaining documents (a trailing number can only be completed by the end of the stream).
+
+        ### Raises:
+        - `json.JSONDecodeError` - If the stream ends with an invalid or unfinished document.
+        """
+        buffer: str = "".join(self._chunks) + self._text.decode(b"", True)
+        self._chunks = []
+        self._length = 0
+        self._reset_scan()
+        self._text.reset()
+        return self._decode(buffer, True)[0]
+
+    def _reset_scan(self) -> None:
+        self._depth: int = 0
+        self._in_string: bool = False
+        self._escaped: bool = False
+
+    def _scan(self, data: str) -> bool:
+        """Follows nesting and strings through a new chunk, `True` if a top level document may have ended in it."""
+        position: int = 0
+        
+        if self._in_string:
+            if self._escaped:
+                if not data:
+                    return False
+                # the backslash ended the previous chunk, the first character is escaped
+                position, self._escaped = 1, False
+            
+            position = _JSON_STRING_BODY.match(data, position).end()
+            if position == len(data) or data[position] == "\\":
+                # only a backslash at the very end of the chunk is left unmatched
+                self._escaped = position < len(data)
+                return False
+            
+            self._in_string = False
+            position += 1
+
+        # escapes go first, so the quotes left are real ones, then scalars and strings go and brackets are left in order
+        text: str = data[position:].replace("\\\\", "").replace('\\"', "").translate(_JSON_SCALARS)
+        structure: str = _JSON_NOT_STRUCTURE.sub("", _JSON_PLAIN_STRING.sub("", text))
+        
+        quote: int = structure.find('"')
+        if quote >= 0:
+            # a string that does not end in this chunk, quotes after it are escaped ones
+            structure = structure[:quote]
+            self._in_string = True
+            self._escaped = (len(data) - len(data.rstrip("\\"))) % 2 == 1
+
+        depths: list[int] = list(itertools.accumulate(map(_JSON_NESTING.__getitem__, structure), initial=self._depth))
+        self._depth = depths[-1]
+        return min(depths) <= 0
+
+    def _decode(self, buffer: str, final: bool) -> tuple[list[Any], int]:
+        raw_decode: Callable[[str, int], tuple[Any, int]] = self._decoder.raw_decode
+        skip: Callable[[str, int], re.Match[str]] = _JSON_WHITESPACE.match
+        
+        documents: list[Any] = []
+        length: int = len(buffer)
+        position: int = skip(buffer, 0).end()
+        
+        while position < length:
+            try:
+                document, end = raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break
+
+            # `12` or `1.` at the end of a chunk may continue as `123` or `1.5` in the next one
+            if not final and buffer[end - 1] not in '}]"' and (end == length or buffer[end] not in ' \t\n\r{["'):
+                break
+            
+            documents.append(document)
+            position = skip(buffer, end).end()
+        return documents, position
+
+def _open_source(source: str | os.PathLike | IO, mode: str) -> ContextManager[IO]:
+    # paths are opened and closed here, file objects are left open for the caller
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, mode)
+    return contextlib.nullcontext(source)
+
+def _check_json_lines(processes: int, chunk_size: int) -> None:
+    if processes < 0:
+        raise ValueError("`processes` must be 0 or greater.")
+    if chunk_size < 1:
+        raise ValueError("`chunk_size` must be 1 or greater.")
+
+def _loads_lines(loads: Callable[[str | bytes], Any], lines: list[str | bytes]) -> list[Any]:
+    """Runs in the worker process."""
+    return [loads(line) for line in lines if not line.isspace()]
+
+def _iter_json_lines(source: str | os.PathLike | IO, codec: str | None, processes: int, chunk_size: int) -> Iterator[Any]:
+    loads: Callable[[str | bytes], Any] = get_json_codec(codec).loads
+    
+    with _open_source(source, "rb") as file:
+        if not processes:
+            for line in file:
+                if not line.isspace():
+                    yield loads(line)
+            return
+
+        lines: Iterator[str | bytes] = iter(file)
+        pool: ProcessPoolExecutor = ProcessPoolExecutor(processes)
+        # at most 2 chunks per process are read ahead, keeps the memory bounded
+        pending: deque[Future] = deque()
+        
+        try:
+            while True:
+                while len(pending) < 2 * processes:
+                    chunk: list[str | bytes] = list(itertools.islice(lines, chunk_size))
+                    if not chunk:
+                        break
+                    pending.append(pool.submit(_loads_lines, loads, chunk))
+                
+                if not pending:
+                    return
+                yield from pending.popleft().result()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+def iter_json_lines(source: str | os.PathLike | IO, codec: str | None = None, processes: int = 0, chunk_size: int = 10_000) -> Iterator[Any]:
+    """
+    Lazily parses a JSON Lines (NDJSON) file, one document per line, blank lines are skipped. Memory is bounded by the longest line.
+
+    ### Parameters:
+    - `source` - Path to the file, or a file object opened in binary (preferred, no decoding) or text mode.
+    - `codec` - Name of JSON backend, see `get_json_codec` (default is the standard library `json`).
+    - `processes` - Parses chunks of lines in a process pool of this size, `0` parses in the current process.
+        *Pays off for large documents, small ones are cheaper to parse than to send to a process.*
+    - `chunk_size` - Number of lines sent to a process at once.
+
+    ### Returns:
+    - Generator of parsed documents in the file order, a path is closed once it is exhausted or closed.
+
+    ### Raises:
+    - `ValueError` - If `processes` is negative or `chunk_size` is smaller than 1.
+    """
+    _check_json_lines(processes, chunk_size)
+    return _iter_json_lines(source, codec, processes, chunk_size)
+
+def iter_json_stream(source: str | os.PathLike | IO, chunk_size: int = 64 * 1024, max_buffer: int = 64 * 1024 ** 2) -> Iterator[Any]:
+    """
+    Lazily parses concatenated JSON documents (`{"a": 1}{"a": 2}`, any whitespace between them) with `JSONStreamDecoder`.
+
+    ### Parameters:
+    - `source` - Path to the file, or a file object opened in binary or text mode.
+    - `chunk_size` - Size of chunks read from the file.
+    - `max_buffer` - Maximum length of one document in characters.
+
+    ### Returns:
+    - Generator of parsed documents, a path is closed once it is exhausted or closed.
+    """
+    decoder: JSONStreamDecoder = JSONStreamDecoder(max_buffer)
+
+    with _open_source(source, "rb") as file:
+        while chunk := file.read(chunk_size):
+            yield from decoder.feed(chunk)
+    yield from decoder.close()
+
+def write_json_lines(target: str | os.PathLike | IO, records: Iterable[Any], codec: str | None = None, default: Callable[[Any], Any] | None = json_default, batch_size: int = 1_000, mode: Literal["w", "a"] = "w") -> int:
+    """
+    Writes documents as JSON Lines (NDJSON), encoded lines are joined and written in batches.
+
+    ### Parameters:
+    - `target` - Path to the file, or a file object opened in binary or text mode.
+    - `records` - Documents to write, generators included.
+    - `codec` - Name of JSON backend, see `get_json_codec` (default is the standard library `json`).
+    - `default` - Called on objects the backend can't serialize (default is `json_default`).
+    - `batch_size` - Number of lines written at once.
+    - `mode` - `"w"` overwrites, `"a"` appends to the file. (paths only)
+
+    ### Returns:
+    - Number of written lines.
+    """
+    dumps: Callable[[Any, int | None, Callable[[Any], Any] | None], str | bytes] = get_json_codec(codec).dumps
+    count: int = 0
+    
+    with _open_source(target, mode + "b") as file:
+        binary: bool = not isinstance(file, io.TextIOBase)
+        newline: str | bytes = b"\n" if binary else "\n"
+        batch: list[str | bytes] = []
+
+        for record in records:
+            line: str | bytes = dumps(record, None, default)
+            if isinstance(line, str) == binary:
+                line = line.encode() if binary else line.decode()
+            batch.append(line)
+            
+            if len(batch) >= batch_size:
+                count += len(batch)
+                # trailing empty item ends the last line
+                batch.append(newline[:0])
+                file.write(newline.join(batch))
+                batch.clear()
+
+        if batch:
+            count += len(batch)
+            batch.append(newline[:0])
+            file.write(newline.join(batch))
+    return count
 
 def get_value(dictionary: dict[Hashable, Any], key: Any) -> Any | None:  
     """
@@ -168,7 +1314,7 @@ def get_key(dictionary: dict[Hashable, Any], value: Any) -> Any | None:
     Gets key of specified value.
     
     ## ! WARNING !
-    This will find the first value in the dictionary. 
+    This will find the first value in the dictionary. Scans the dictionary once, use `BidirectionalDict` for O(1) lookups.
     
     ### Parameters:
     - `dictionary` - The dictionary to search.
@@ -177,21 +1323,13 @@ def get_key(dictionary: dict[Hashable, Any], value: Any) -> Any | None:
     ### Returns:
     - Key of the value or `None` if value does not exist in dictionary.  
     """
-    
-    # iter on dict only returns keys, so no point in optimizing that
-    values = tuple(dictionary.values())
+    if isinstance(dictionary, BidirectionalDict):
+        return dictionary.get_key(value)
 
-    try:
-        index: int = values.index(value)
-        key_iterator: Iterator[Hashable] = iter(dictionary)
-
-        # moves until index -1
-        for _ in range(index):
-            next(key_iterator)
-        else:
-            return next(key_iterator)
-    except:
-        return None
+    for key, item in dictionary.items():
+        if item is value or item == value:
+            return key
+    return None
 
 def isEmpty(dictionary: dict[Hashable, Any]) -> bool:
     """
@@ -14,21 +14,24 @@ from xRedUtils import files
 ```
 """
 
-import sys, json
+import sys, os, stat, codecs
 sys.dont_write_bytecode = True
 from .annotations import Any, overload, Literal
-from .dicts import json_to_dict
+from .dicts import json_to_dict, dict_to_json, iter_json_lines, write_json_lines, encode_json
 
 __all__: tuple[str, ...] = (
     "open_file", "save_file"
 )
 
+# `open` arguments that only work in text mode
+_TEXT_KWARGS: frozenset[str] = frozenset(("encoding", "errors", "newline"))
+
 @overload
 def open_file(path: str, encoding: str = "utf-8", mode: Literal["r", "rb"] = "r", **kwargs) -> str: ...
 @overload
-def open_file(path: str, encoding: str = "utf-8", mode: Literal["r", "rb"] = "r", decoder: Literal["json"] | None = None, **kwargs) -> dict[str, Any]: ...
+def open_file(path: str, encoding: str = "utf-8", mode: Literal["r", "rb"] = "r", decoder: Literal["json", "jsonl"] | None = None, **kwargs) -> dict[str, Any]: ...
 
-def open_file(path: str, encoding: str = "utf-8", mode: Literal["r", "rb"] = "r", decoder: Literal["json"] | None = None, **kwargs) -> dict[str, Any]:
+def open_file(path: str, encoding: str = "utf-8", mode: Literal["r", "rb"] = "r", decoder: Literal["json", "jsonl"] | None = None, **kwargs) -> dict[str, Any]:
     """
     Opens any existing file provided by the path.
 
@@ -37,24 +40,54 @@ def open_file(path: str, encoding: str = "utf-8", mode: Literal["r", "rb"] = "r"
     - `encoding` - Encoding used for decoding. (Set to `None` if opening in `rb` mode)
     - `mode` - File opening mode (same as open() func)
     
-    - `decoder` - Usage of decoder. For example `json` would return a `dict` object
+    - `decoder` - Usage of decoder. For example `json` would return a `dict` object, `jsonl` a `list` of JSON Lines documents. UTF-8 files are parsed as `bytes` without decoding, if no text mode `**kwargs` (`errors`, `newline`) are given.
     - `**kwargs` - Extra kwargs provided for `open` built-in function 
 
     ### Returns:
     - `String`, `bytes`, `dict`... depends of provided arguments.
     """
+    if decoder in ("json", "jsonl") and mode == "r" and (encoding is None or codecs.lookup(encoding).name == "utf-8") and not kwargs.keys() & _TEXT_KWARGS:
+        # JSON backends parse UTF-8 bytes directly, unless `open` got text mode only arguments
+        encoding, mode = None, "rb"
+
     with open(path, encoding=encoding, mode=mode, **kwargs) as file:
         if decoder == "json":
             return json_to_dict(file)
+        if decoder == "jsonl":
+            return list(iter_json_lines(file))
 
         return file.read()
 
+def _atomic_temp(target: str, mode: str) -> str:
+    """Creates an empty temporary file next to `target`, with the permissions of `target` or of a new file if it does not exist."""
+    if "w" not in mode:
+        raise ValueError(f"`atomic` needs a write mode, not `{mode}`, the existing content would be lost.")
+
+    try:
+        permissions: int | None = stat.S_IMODE(os.stat(target).st_mode)
+    except FileNotFoundError:
+        permissions = None
+
+    directory: str = os.path.dirname(os.path.abspath(target))
+    while True:
+        path: str = os.path.join(directory, f".{os.path.basename(target)}.{os.urandom(6).hex()}.tmp")
+        try:
+            # `0o666` minus umask, like `open` creates files (`mkstemp` would create `0o600` and `os.replace` keeps it)
+            os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+            break
+        except FileExistsError:
+            continue
+
+    if permissions is not None:
+        os.chmod(path, permissions)
+    return path
+
 @overload
 def save_file(path: str, data: Any, mode: str = "w") -> None: ...
 @overload
-def save_file(path: str, data: Any, mode: str = "w", encoder: Literal["json"] | None = None, **kwargs) -> None: ...
+def save_file(path: str, data: Any, mode: str = "w", encoder: Literal["json", "jsonl"] | None = None, atomic: bool = False, **kwargs) -> None: ...
 
-def save_file(path: str, data: Any, mode: str = "w", encoder: Literal["json"] | None = None, **kwargs) -> None:
+def save_file(path: str, data: Any, mode: str = "w", encoder: Literal["json", "jsonl"] | None = None, atomic: bool = False, **kwargs) -> None:
     """
     Saves any data to existing or not existing file provided by the path.
 
@@ -63,15 +96,44 @@ def save_file(path: str, data: Any, mode: str = "w", encoder: Literal["json"] |
     - `data` - Data that you want to save.
     - `mode` - File writing mode. (same as open() func)
     
-    - `encoder` - Usage of encoder. For example `json` would convert `dict` to `string`.
-    - `**kwargs` - Extra kwargs for `encoders` settings 
+    - `encoder` - Usage of encoder. For example `json` would convert `dict` to compact JSON written as UTF-8 `bytes`, `jsonl` writes an iterable of documents as JSON Lines.
+    - `atomic` - Writes into a temporary file first and replaces `path` with it, so a crash never leaves a half written file. Keeps permissions of an existing file.
+    - `**kwargs` - Extra kwargs for `encoders` settings, `json` takes the arguments of `dicts.dict_to_json`, `jsonl` of `dicts.write_json_lines`.
+        *`encoding`, `errors` and `newline` are passed to `open`, JSON is then written in text mode.*
 
     ### Returns:
     - Nothing.
+
+    ### Raises:
+    - `ValueError` - If `atomic` is used with a mode that does not truncate (`a`, `r+`...), existing content would be lost.
     """
-    with open(path, mode=mode) as file:
-        if encoder == "json":
-            json.dump(data, file, **kwargs)
-            return
- 
-        file.write(data)
\ No newline at end of file
+    # text mode arguments go to `open`, the rest to the encoder
+    open_kwargs: dict[str, Any] = {name: kwargs.pop(name) for name in _TEXT_KWARGS if name in kwargs}
+    
+    if encoder in ("json", "jsonl") and not open_kwargs:
+        mode = mode if "b" in mode else mode + "b"
+    if encoder == "json":
+        data = encode_json(data, **kwargs) if "b" in mode else dict_to_json(data, **kwargs)
+
+    target: str = path
+    if atomic:
+        path = _atomic_temp(target, mode)
+
+    try:
+        with open(path, mode=mode, **open_kwargs) as file:
+            if encoder == "jsonl":
+                write_json_lines(file, data, **kwargs)
+            else:
+                file.write(data)
+            
+            if atomic:
+                file.flush()
+                os.fsync(file.fileno())
+        
+        if atomic:
+            os.replace(path, target)
+    
+    except BaseException:
+        if atomic and os.path.exists(path):
+            os.remove(path)
+        raise
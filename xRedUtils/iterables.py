@@ -1,14 +1,32 @@
 """
 This module provides functions for manipulating with iterables.
 
+Numeric `numpy.ndarray` and `array.array` inputs are vectorized with numpy, if it is installed.
+
 ### Functions:
+- `iflatten` - Lazily flattens nested iterables, without recursion.
 - `flatten_iterable` - Flattens a iterable into a single level list.
 - `remove_items` - Removes all occurrences of a specified item from the iterable.
 - `remove_type` - Removes all items of a specified type from the iterable.
 - `compare_iterables` - Compare two iterables and return a list of items that are present in both iterables.
 - `count_occurrences` - Count the number of times a specific item occurs in an iterable.
+- `multi_count` - Counts occurrences of every item in one pass.
+- `intersection` - Unique items present in every iterable, order preserved.
+- `difference` - Unique items of the first iterable not present in the others, order preserved.
+- `symmetric_difference` - Unique items present in an odd number of iterables, order preserved.
 - `get_attr_data` - Retrieves attribute data from each object in the iterable. If no attribute was found, ignores the `item`.
+- `iremove_items` - Lazy `remove_items`, constant memory.
+- `iremove_type` - Lazy `remove_type`, constant memory.
+- `iget_attr_data` - Lazy `get_attr_data`, constant memory.
 - `chunker` - Slice iterable into chunks of specified size.
+- `sliding_window` - Lazily yields overlapping windows of the last `n` items.
+- `tumbling_window` - Lazily yields non overlapping windows of `n` items.
+- `session_window` - Lazily groups items into sessions separated by a time gap.
+- `external_sort` - Lazily sorts an iterable larger than memory, spilling sorted runs to disk.
+- `unique` - Lazily removes duplicates from an iterable larger than memory, spilling sorted runs to disk.
+- `parallel_map` - Lazily maps a function over chunks of an iterable in a thread or process pool.
+- `parallel_filter` - Lazily filters chunks of an iterable in a thread or process pool.
+- `parallel_reduce` - Reduces chunks of an iterable in a thread or process pool.
 - `to_iterable` - Converts data into a list.
 
 ### Usage:
@@ -20,16 +38,98 @@ from xRedUtils import iterables
 ```
 """
 
-import sys, itertools
+import sys, itertools, operator, functools, time, os, array, heapq, pickle, marshal, tempfile, struct
 sys.dont_write_bytecode = True
-from .annotations import Any, ITERABLE
+from collections import Counter, deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from .annotations import Any, Callable, Hashable, Iterable, Iterator, Literal, UnionType, ITERABLE, BINARY
 from .errors import VersionMismatchError
+from .files import save_file
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 __all__: tuple[str, ...] = (
-    "flatten_iterable", "remove_items", "remove_type", "compare_iterables", "count_occurrences", "get_attr_data", "chunker", "to_iterable"
+    "iflatten", "flatten_iterable", "remove_items", "remove_type", "compare_iterables", "count_occurrences", "multi_count",
+    "intersection", "difference", "symmetric_difference", "get_attr_data", "chunker", "to_iterable",
+    "iremove_items", "iremove_type", "iget_attr_data", "sliding_window", "tumbling_window", "session_window",
+    "external_sort", "unique",
+    "parallel_map", "parallel_filter", "parallel_reduce"
 )
 
-def flatten_iterable(iterable: ITERABLE) -> list[Any]:
+# sentinel for optional arguments, `None` is a valid value
+_MISSING: Any = object()
+
+# `array.array` typecodes that mean the same numpy dtype
+_ARRAY_CODES: str = "bBhHiIlLqQfd"
+
+def _as_array(iterable: Any) -> Any:
+    """
+    Numeric `ndarray` of an `ndarray` or `array.array` (zero-copy), `None` for anything else or without numpy.
+    Lists are never converted, the conversion alone costs more than the pure python loop.
+    """
+    if np is None:
+        return None
+    
+    if isinstance(iterable, np.ndarray):
+        return iterable if iterable.dtype.kind in "biuf" else None
+    
+    if isinstance(iterable, array.array) and iterable.typecode in _ARRAY_CODES:
+        return np.frombuffer(iterable, dtype=iterable.typecode) if iterable else np.empty(0, dtype=iterable.typecode)
+    return None
+
+def _is_number(item: Any) -> bool:
+    return isinstance(item, int | float) or isinstance(item, np.number | np.bool_)
+
+def iflatten(iterable: Iterable[Any], max_depth: int | None = None, exclude: type | tuple[type, ...] = (str, BINARY, dict), types: type | UnionType | tuple[type, ...] = Iterable) -> Iterator[Any]:
+    """
+    Lazily flattens nested iterables, without recursion and without copying sub-lists.
+
+    Aka. this:
+    ```python
+    >>> list(iflatten([1, [2, 3], [[4, 5], 6]]))
+    [1, 2, 3, 4, 5, 6]
+    >>> list(iflatten([1, [2, [3, [4]]]], max_depth=1))
+    [1, 2, [3, [4]]]
+    ```
+
+    ### Parameters:
+    - `iterable` - Any iterable, generators included.
+    - `max_depth` - How many levels are flattened, `None` for all of them.
+    - `exclude` - Types that are never flattened, `str`, `bytes` and `dict` by default.
+    - `types` - Types that are flattened (unless excluded), any iterable by default.
+
+    ### Returns:
+    - Generator of elements in depth first order.
+    """
+    if max_depth == 0:
+        yield from iterable
+        return
+
+    # explicit stack of iterators instead of recursion, depth is only limited by memory
+    stack: list[Iterator[Any]] = [iter(iterable)]
+    descend: dict[type, bool] = {}
+
+    while stack:
+        for element in stack[-1]:
+            kind: type = type(element)
+            
+            # isinstance checks (slow for ABCs) are done once per type
+            flatten: bool | None = descend.get(kind)
+            if flatten is None:
+                flatten = descend[kind] = isinstance(element, types) and not isinstance(element, exclude)
+
+            if flatten and (max_depth is None or len(stack) <= max_depth):
+                stack.append(iter(element))
+                break
+            
+            yield element
+        else:
+            stack.pop()
+
+def flatten_iterable(iterable: ITERABLE, max_depth: int | None = None) -> list[Any]:
     """
     Flattens a iterable into a single level list.
 
@@ -41,6 +141,7 @@ def flatten_iterable(iterable: ITERABLE) -> list[Any]:
 
     ### Parameters:
     - `iterable` - Any iterable (`list`, `tuple`, `set`...)
+    - `max_depth` - How many levels are flattened, `None` for all of them.
 
     ### Returns:
     - A `list` containing all the elements of the iterable in one level.
@@ -49,14 +150,7 @@ def flatten_iterable(iterable: ITERABLE) -> list[Any]:
     if not isinstance(iterable, ITERABLE):
         return iterable
 
-    new: list[Any] = list()
-   
-    for element in iterable:
-        if isinstance(element, ITERABLE):
-            new.extend(flatten_iterable(element))
-        else:
-            new.append(element)
-    return new
+    return list(iflatten(iterable, max_depth, exclude=(), types=ITERABLE))
 
 def remove_items(iterable: ITERABLE, item: Any) -> list[Any]:
     """
@@ -67,8 +161,11 @@ def remove_items(iterable: ITERABLE, item: Any) -> list[Any]:
     - `item` - The item to remove from the iterable.
     
     ### Returns:
-    -  A new `list` with the specified item removed.
+    -  A new `list` with the specified item removed. (vectorized for numeric arrays if numpy is installed)
     """
+    if (vector := _as_array(iterable)) is not None and _is_number(item):
+        return vector[vector != item].tolist()
+    
     return [element for element in iterable if element != item]
 
 def remove_type(iterable: ITERABLE, obj: type) -> list[Any]:
@@ -82,20 +179,111 @@ def remove_type(iterable: ITERABLE, obj: type) -> list[Any]:
     ### Returns:
     - A new `list` with items of the specified type removed.
     """
+    if (vector := _as_array(iterable)) is not None:
+        # every item of an array converts to the same python type, it is all or nothing
+        items: list[Any] = vector.tolist()
+        return [] if items and isinstance(items[0], obj) else items
+    
     return [element for element in iterable if not isinstance(element, obj)]
 
+class _Lookup:
+    """Membership test over any items, hashed where possible, `==` scan for unhashable ones."""
+    __slots__ = ("items", "hashed", "unhashable")
+
+    def __init__(self, iterable: Iterable[Any]) -> None:
+        self.items: list[Any] | tuple[Any, ...] = iterable if isinstance(iterable, list | tuple) else list(iterable)
+        self.unhashable: list[Any] = []
+
+        try:
+            self.hashed: set[Any] = set(self.items)
+        except TypeError:
+            self.hashed = set()
+            for item in self.items:
+                try:
+                    self.hashed.add(item)
+                except TypeError:
+                    self.unhashable.append(item)
+
+    def __contains__(self, item: Any) -> bool:
+        try:
+            if item in self.hashed:
+                return True
+        except TypeError:
+            # unhashable item, can still be equal to a hashable one (`{1} == frozenset({1})`)
+            return item in self.items
+        
+        return bool(self.unhashable) and item in self.unhashable
+
+def _unique(iterable: Iterable[Any]) -> list[Any]:
+    """First occurrence of every item, in order."""
+    items: list[Any] | tuple[Any, ...] = iterable if isinstance(iterable, list | tuple) else list(iterable)
+    
+    try:
+        return list(dict.fromkeys(items))
+    except TypeError:
+        pass
+
+    seen: set[Any] = set()
+    seen_unhashable: list[Any] = []
+    unique: list[Any] = []
+    
+    for item in items:
+        try:
+            if item in seen:
+                continue
+            seen.add(item)
+        except TypeError:
+            if item in seen_unhashable:
+                continue
+            seen_unhashable.append(item)
+        unique.append(item)
+    return unique
+
+def _select(iterable: Iterable[Any], lookup: _Lookup, keep: bool) -> list[Any]:
+    """Items of `iterable` that are (`keep=True`) or are not (`keep=False`) in `lookup`."""
+    items: list[Any] | tuple[Any, ...] = iterable if isinstance(iterable, list | tuple) else list(iterable)
+
+    if not lookup.unhashable:
+        # fast path, set lookups in a comprehension
+        try:
+            hashed: set[Any] = lookup.hashed
+            return [item for item in items if (item in hashed) is keep]
+        except TypeError:
+            pass
+
+    return [item for item in items if (item in lookup) is keep]
+
 def compare_iterables(iterable1: ITERABLE, iterable2: ITERABLE) -> list[Any]:
     """
     Compare two iterables and return a list of items that are present in both iterables.
+    Hashed lookups, unhashable items fall back to `==` comparison, a string as `iterable2` is searched for substrings.
     
     ### Parameters:
     - `iterable1` - The first iterable to compare.
     - `iterable2` - The second iterable to compare.
     
     ### Returns:
-    -  A `list` of items present in both iterables.
+    -  A `list` of items present in both iterables. (vectorized for numeric arrays if numpy is installed)
     """
-    return [item for item in iterable1 if item in iterable2]
+    if isinstance(iterable2, str | bytes | bytearray):
+        # `in` of a string is a substring test, not a membership one
+        return [item for item in iterable1 if item in iterable2]
+
+    if (vector := _as_array(iterable1)) is not None:
+        other: Any = _as_array(iterable2)
+        
+        if other is None:
+            # materialized once, also used by the fallback
+            iterable2 = iterable2 if isinstance(iterable2, list | tuple) else list(iterable2)
+            try:
+                other = np.asarray(iterable2)
+            except (ValueError, TypeError):
+                pass
+        
+        if other is not None and other.dtype.kind in "biuf":
+            return vector[np.isin(vector, other)].tolist()
+
+    return _select(iterable1, _Lookup(iterable2), keep=True)
 
 def count_occurrences(iterable: ITERABLE, item: Any) -> int:
     """
@@ -106,9 +294,102 @@ def count_occurrences(iterable: ITERABLE, item: Any) -> int:
     - `item` - The item to count occurrences of within the iterable.
 
     ### Returns:
-    - The number of times the item occurs in the iterable.
+    - The number of times the item occurs in the iterable. (items equal to `item` by `==`, `nan` is never counted)
+    """
+    if (vector := _as_array(iterable)) is not None and _is_number(item):
+        return int(np.count_nonzero(vector == item))
+    
+    try:
+        reflexive: bool = bool(item == item)
+    except (TypeError, ValueError):
+        reflexive = False
+
+    if not reflexive:
+        # `list.count`/`countOf` match on identity first, `nan` would count itself
+        return sum(1 for element in iterable if element == item)
+
+    if isinstance(iterable, list | tuple):
+        return iterable.count(item)
+    return operator.countOf(iterable, item)
+
+def multi_count(iterable: ITERABLE, key: Callable[[Any], Hashable] | None = None) -> Counter[Any]:
+    """
+    Counts occurrences of every item in one pass.
+
+    ### Parameters:
+    - `iterable` - The `iterable` to count.
+    - `key` - Optional function returning what is counted for an item, needed for unhashable items.
+
+    ### Returns:
+    - `collections.Counter` of item (or key) ➜ occurrences, in first seen order.
+
+    ### Raises:
+    - `TypeError` - If an item (or key) is unhashable.
     """
-    return len([element for element in iterable if element == item])
+    return Counter(iterable if key is None else map(key, iterable))
+
+def intersection(iterable: ITERABLE, *others: ITERABLE) -> list[Any]:
+    """
+    Unique items of `iterable` that are present in every other iterable, in order of `iterable`.
+
+    ### Parameters:
+    - `iterable` - Iterable that gives the order.
+    - `*others` - Iterables to intersect with.
+
+    ### Returns:
+    - A `list` of unique items.
+    """
+    items: list[Any] = _unique(iterable)
+    for other in others:
+        items = _select(items, _Lookup(other), keep=True)
+    return items
+
+def difference(iterable: ITERABLE, *others: ITERABLE) -> list[Any]:
+    """
+    Unique items of `iterable` that are not present in any other iterable, in order of `iterable`.
+
+    ### Parameters:
+    - `iterable` - Iterable that gives the order.
+    - `*others` - Iterables which items are removed.
+
+    ### Returns:
+    - A `list` of unique items.
+    """
+    items: list[Any] = _unique(iterable)
+    for other in others:
+        items = _select(items, _Lookup(other), keep=False)
+    return items
+
+def symmetric_difference(iterable: ITERABLE, *others: ITERABLE) -> list[Any]:
+    """
+    Unique items present in an odd number of iterables (`a ^ b ^ ...`), in first seen order.
+    For two iterables, items that are in exactly one of them.
+
+    ### Parameters:
+    - `iterable` - First iterable.
+    - `*others` - Other iterables.
+
+    ### Returns:
+    - A `list` of unique items.
+    """
+    sources: list[list[Any]] = [_unique(source) for source in (iterable, *others)]
+    order: list[Any] = _unique(itertools.chain.from_iterable(sources))
+
+    try:
+        # fast path, parity of hashable items with set `^`
+        odd: set[Any] = set()
+        for source in sources:
+            odd.symmetric_difference_update(source)
+        return [item for item in order if item in odd]
+    except TypeError:
+        pass
+
+    items: list[Any] = sources[0]
+    for other in sources[1:]:
+        items = _select(items, _Lookup(other), keep=False) + _select(other, _Lookup(items), keep=False)
+    
+    # keep first seen order over all iterables
+    return _select(order, _Lookup(items), keep=True)
 
 def get_attr_data(iterable: ITERABLE, attr: str) -> list[Any]:
     """
@@ -116,12 +397,59 @@ def get_attr_data(iterable: ITERABLE, attr: str) -> list[Any]:
 
     ### Parameters:
     - `iterable` - The `iterable` to search through.
-    - `attr` - Name of the attribute.
+    - `attr` - Name of the attribute, taken literally (dotted paths are only followed by `iget_attr_data`).
 
     ### Returns:
     - `Iterable` of returned attribute data.
     """
-    return [data if (data := getattr(item, attr, "_NO_ATTR")) != "_NO_ATTR" else item for item in iterable]
+    return [item if (data := getattr(item, attr, _MISSING)) is _MISSING else data for item in iterable]
+
+def iremove_items(iterable: Iterable[Any], item: Any) -> Iterator[Any]:
+    """
+    Lazily removes all occurrences of a specified item, constant memory. Can be passed on to `chunker`.
+    
+    ### Parameters:
+    - `iterable` - Any iterable, generators included.
+    - `item` - The item to remove from the iterable.
+    
+    ### Returns:
+    - Generator of items that are not equal to `item`.
+    """
+    return (element for element in iterable if element != item)
+
+def iremove_type(iterable: Iterable[Any], obj: type | tuple[type, ...]) -> Iterator[Any]:
+    """
+    Lazily removes all items of a specified type, constant memory. Can be passed on to `chunker`.
+    
+    ### Parameters:
+    - `iterable` - Any iterable, generators included.
+    - `obj` - The type (or tuple of types) of items to remove.
+    
+    ### Returns:
+    - Generator of items that are not instances of `obj`.
+    """
+    return (element for element in iterable if not isinstance(element, obj))
+
+def iget_attr_data(iterable: Iterable[Any], attr: str) -> Iterator[Any]:
+    """
+    Lazily retrieves attribute data from each object, constant memory. If no attribute was found, yields the `item` itself.
+    Can be passed on to `chunker`.
+
+    ### Parameters:
+    - `iterable` - Any iterable, generators included.
+    - `attr` - Name of the attribute, dotted paths (`"user.name"`) are followed.
+
+    ### Returns:
+    - Generator of attribute data.
+    """
+    getter: operator.attrgetter = operator.attrgetter(attr)
+    
+    for item in iterable:
+        # missing attribute is an exception, not a magic value, so any stored value is returned as is
+        try:
+            yield getter(item)
+        except AttributeError:
+            yield item
 
 def chunker(iterable: ITERABLE, chunk_size: int, strict: bool = False) -> itertools.batched:
     """
@@ -162,3 +490,391 @@ def to_iterable(data: Any, slice: bool = False) -> list[Any]:
         return list(data)
 
     return [data]
+
+def sliding_window(iterable: Iterable[Any], n: int, step: int = 1, typecode: str | None = None) -> Iterator[tuple[Any, ...] | memoryview]:
+    """
+    Lazily yields windows of the last `n` items, every `step` items. Works on infinite generators.
+
+    Aka. this:
+    ```python
+    >>> list(sliding_window([1, 2, 3, 4, 5], 3))
+    [(1, 2, 3), (2, 3, 4), (3, 4, 5)]
+    ```
+
+    ### Parameters:
+    - `iterable` - Any iterable, generators included.
+    - `n` - Window size.
+    - `step` - Items between windows, `step > n` skips items.
+    - `typecode` - `array.array` typecode (`"d"`, `"q"`...) for numeric items, windows are then zero-copy `memoryview` slices.
+
+    ### Returns:
+    - Generator of `tuple` windows, or `memoryview` windows that are valid until the next one is requested (copy them to keep).
+
+    ### Raises:
+    - `ValueError` - If `n` or `step` is smaller than 1.
+    """
+    if n < 1 or step < 1:
+        raise ValueError("`n` and `step` must be at least 1.")
+
+    if typecode is None:
+        window: deque[Any] = deque(maxlen=n)
+        for count, item in enumerate(iterable, 1):
+            window.append(item)
+            if count >= n and not (count - n) % step:
+                yield tuple(window)
+        return
+
+    # every item is written twice (`i` and `i + n`), so the last `n` items are always one contiguous slice
+    buffer: array.array = array.array(typecode, bytes(2 * n * array.array(typecode).itemsize))
+    view: memoryview = memoryview(buffer)
+    
+    for count, item in enumerate(iterable, 1):
+        position: int = (count - 1) % n
+        buffer[position] = buffer[position + n] = item
+        
+        if count >= n and not (count - n) % step:
+            start: int = count % n
+            yield view[start:start + n]
+
+def tumbling_window(iterable: Iterable[Any], n: int, typecode: str | None = None) -> Iterator[tuple[Any, ...] | memoryview]:
+    """
+    Lazily yields consecutive, non overlapping windows of `n` items, the last one can be shorter. Works on infinite generators.
+
+    ### Parameters:
+    - `iterable` - Any iterable, generators included.
+    - `n` - Window size.
+    - `typecode` - `array.array` typecode (`"d"`, `"q"`...) for numeric items, windows are then zero-copy `memoryview` slices.
+
+    ### Returns:
+    - Generator of `tuple` windows, or `memoryview` windows that are valid until the next one is requested (copy them to keep).
+
+    ### Raises:
+    - `ValueError` - If `n` is smaller than 1.
+    """
+    if n < 1:
+        raise ValueError("`n` must be at least 1.")
+
+    if typecode is None:
+        yield from chunker(iterable, n)
+        return
+
+    buffer: array.array = array.array(typecode, bytes(n * array.array(typecode).itemsize))
+    view: memoryview = memoryview(buffer)
+    position: int = 0
+    
+    for item in iterable:
+        buffer[position] = item
+        position += 1
+        
+        if position == n:
+            yield view
+            position = 0
+
+    if position:
+        yield view[:position]
+
+def session_window(iterable: Iterable[Any], key: Callable[[Any], Any], gap: Any) -> Iterator[list[Any]]:
+    """
+    Lazily groups consecutive items into sessions, a new session starts when `key` of an item is more than `gap` after the previous one.
+    Works on infinite generators, a session is yielded once the next one starts.
+
+    Aka. this:
+    ```python
+    >>> list(session_window([1, 2, 4, 10, 11], key=lambda t: t, gap=2))
+    [[1, 2, 4], [10, 11]]
+    ```
+
+    ### Parameters:
+    - `iterable` - Any iterable of items ordered by `key`.
+    - `key` - Function returning the time of an item (`float`, `datetime`...).
+    - `gap` - Max difference of two consecutive keys in one session (`float`, `timedelta`...).
+
+    ### Returns:
+    - Generator of sessions (`list` of items).
+    """
+    session: list[Any] = []
+    last: Any = None
+
+    for item in iterable:
+        moment: Any = key(item)
+        
+        if session and moment - last > gap:
+            yield session
+            session = []
+        
+        session.append(item)
+        last = moment
+
+    if session:
+        yield session
+
+_CODECS: dict[str, Any] = {"pickle": pickle, "marshal": marshal}
+_RUN_BLOCK: int = 4096
+_SLOT_SIZE: int = 8
+_BLOCK_HEADER: struct.Struct = struct.Struct("<Q")
+
+def _sorted_run(iterator: Iterator[Any], key: Callable[[Any], Any] | None, max_memory: int, dedupe: bool) -> tuple[list[Any], bool]:
+    """Collects and sorts items until `max_memory` (shallow `sys.getsizeof`) is reached, returns the run and whether `iterator` is exhausted."""
+    size: int = 0
+    
+    if not dedupe:
+        run: list[Any] = []
+        for item in iterator:
+            run.append(item)
+            size += sys.getsizeof(item) + _SLOT_SIZE
+            if size >= max_memory:
+                run.sort(key=key)
+                return run, False
+        
+        run.sort(key=key)
+        return run, True
+
+    seen: dict[Hashable, Any] = {}
+    exhausted: bool = True
+    for item in iterator:
+        item_key: Hashable = item if key is None else key(item)
+        if item_key not in seen:
+            seen[item_key] = item
+            size += sys.getsizeof(item) + 3 * _SLOT_SIZE
+            if size >= max_memory:
+                exhausted = False
+                break
+
+    return [seen[item_key] for item_key in sorted(seen)], exhausted
+
+def _spill(path: str, run: list[Any], codec: Any) -> None:
+    blocks: list[bytes] = []
+    for index in range(0, len(run), _RUN_BLOCK):
+        block: bytes = codec.dumps(run[index:index + _RUN_BLOCK])
+        blocks += (_BLOCK_HEADER.pack(len(block)), block)
+
+    save_file(path, b"".join(blocks), "wb")
+
+def _read_run(path: str, codec: Any) -> Iterator[Any]:
+    # blocks are length prefixed, `codec.load(file)` reads files in tiny pieces
+    with open(path, "rb") as file:
+        while header := file.read(_BLOCK_HEADER.size):
+            yield from codec.loads(file.read(_BLOCK_HEADER.unpack(header)[0]))
+
+def _external(iterable: Iterable[Any], key: Callable[[Any], Any] | None, max_memory: int, codec: str, temp_dir: str | None, dedupe: bool) -> Iterator[Any]:
+    iterator: Iterator[Any] = iter(iterable)
+    run, exhausted = _sorted_run(iterator, key, max_memory, dedupe)
+    
+    if exhausted:
+        yield from run
+        return
+
+    codec_module: Any = _CODECS[codec]
+    with tempfile.TemporaryDirectory(prefix="xredutils-sort-", dir=temp_dir) as directory:
+        paths: list[str] = []
+        
+        while run:
+            paths.append(os.path.join(directory, f"{len(paths)}.run"))
+            _spill(paths[-1], run, codec_module)
+            run = None
+            
+            if exhausted:
+                break
+            run, exhausted = _sorted_run(iterator, key, max_memory, dedupe)
+
+        readers: list[Iterator[Any]] = [_read_run(path, codec_module) for path in paths]
+        try:
+            # `heapq.merge` is stable, so the first occurrence of a duplicate comes first
+            merged: Iterator[Any] = heapq.merge(*readers, key=key)
+            if not dedupe:
+                yield from merged
+                return
+
+            previous: Any = _MISSING
+            for item in merged:
+                item_key: Any = item if key is None else key(item)
+                if previous is _MISSING or item_key != previous:
+                    previous = item_key
+                    yield item
+        
+        finally:
+            for reader in readers:
+                reader.close()
+
+def _check_external(max_memory: int, codec: str) -> None:
+    if max_memory < 1:
+        raise ValueError("`max_memory` must be at least 1 byte.")
+    
+    if codec not in _CODECS:
+        raise ValueError(f"Unknown codec {codec!r}, expected one of: {', '.join(_CODECS)}.")
+
+def external_sort(iterable: Iterable[Any], key: Callable[[Any], Any] | None = None, max_memory: int = 64 * 1024 ** 2, codec: Literal["pickle", "marshal"] = "pickle", temp_dir: str | None = None) -> Iterator[Any]:
+    """
+    Lazily sorts an iterable larger than memory. Sorted runs of about `max_memory` bytes are spilled to temporary files and k-way merged.
+    Sorting is stable, data that fits into `max_memory` never touches the disk.
+
+    ### Parameters:
+    - `iterable` - Any iterable, generators included.
+    - `key` - Same as `sorted` key.
+    - `max_memory` - Approximate memory of one run in bytes (shallow `sys.getsizeof` of items).
+    - `codec` - Run encoding, `"pickle"` for any picklable item, `"marshal"` is more compact and faster, but builtin types only.
+    - `temp_dir` - Directory for run files, system temp directory by default.
+
+    ### Returns:
+    - Generator of sorted items, run files are removed once it is exhausted or closed.
+
+    ### Raises:
+    - `ValueError` - If `max_memory` is smaller than 1 or `codec` is unknown.
+    """
+    _check_external(max_memory, codec)
+    return _external(iterable, key, max_memory, codec, temp_dir, False)
+
+def unique(iterable: Iterable[Any], key: Callable[[Any], Hashable] | None = None, max_memory: int = 64 * 1024 ** 2, codec: Literal["pickle", "marshal"] = "pickle", temp_dir: str | None = None) -> Iterator[Any]:
+    """
+    Lazily removes duplicates from an iterable larger than memory, the first occurrence is kept. Items are yielded sorted by `key`.
+    Runs are deduplicated in memory before they are spilled, so data with many duplicates rarely touches the disk.
+
+    ### Parameters:
+    - `iterable` - Any iterable, generators included.
+    - `key` - Function returning a hashable, comparable key of an item. Items themselves by default.
+    - `max_memory` - Approximate memory of one run in bytes (shallow `sys.getsizeof` of unique items).
+    - `codec` - Run encoding, `"pickle"` for any picklable item, `"marshal"` is more compact and faster, but builtin types only.
+    - `temp_dir` - Directory for run files, system temp directory by default.
+
+    ### Returns:
+    - Generator of unique items sorted by `key`, run files are removed once it is exhausted or closed.
+
+    ### Raises:
+    - `ValueError` - If `max_memory` is smaller than 1 or `codec` is unknown.
+    """
+    _check_external(max_memory, codec)
+    return _external(iterable, key, max_memory, codec, temp_dir, True)
+
+_MAP, _FILTER, _REDUCE = 0, 1, 2
+
+def _run_chunk(func: Callable[..., Any], chunk: tuple[Any, ...], mode: int) -> tuple[float, Any]:
+    """Runs in the worker, returns `(elapsed seconds, result)` so the caller can size the next chunks."""
+    start: float = time.perf_counter()
+    
+    if mode == _MAP:
+        result: Any = list(map(func, chunk))
+    elif mode == _FILTER:
+        result = list(filter(func, chunk))
+    else:
+        result = functools.reduce(func, chunk)
+    return time.perf_counter() - start, result
+
+# adaptive chunks aim for this much work per task, enough to hide the executor overhead
+_CHUNK_TARGET: float = 0.05
+_CHUNK_MAX: int = 65_536
+
+def _parallel(func: Callable[..., Any], iterable: Iterable[Any], mode: int, executor: Literal["thread", "process"] | Executor, workers: int | None, chunk_size: int | None, ordered: bool, max_in_flight: int | None) -> Iterator[Any]:
+    """Yields results of chunks, while at most `max_in_flight` chunks are submitted and not yet consumed."""
+    if isinstance(executor, Executor):
+        pool: Executor = executor
+    elif executor == "thread":
+        pool = ThreadPoolExecutor(workers)
+    elif executor == "process":
+        pool = ProcessPoolExecutor(workers)
+    else:
+        raise ValueError(f"Unknown executor `{executor}`, expected `thread`, `process` or an `Executor`.")
+
+    limit: int = max_in_flight or 2 * (workers or os.cpu_count() or 1)
+    items: Iterator[Any] = iter(iterable)
+    
+    # fixed sizes come straight from `chunker`, adaptive ones start small and follow measured time per item
+    chunks: Iterator[tuple[Any, ...]] | None = iter(chunker(items, chunk_size)) if chunk_size else None
+    size: int = 1
+    
+    # future ➜ number of items, insertion ordered, so the first one is the oldest
+    pending: dict[Future, int] = {}
+
+    def submit() -> bool:
+        chunk: tuple[Any, ...] = next(chunks, ()) if chunks is not None else tuple(itertools.islice(items, size))
+        if chunk:
+            pending[pool.submit(_run_chunk, func, chunk, mode)] = len(chunk)
+        return bool(chunk)
+
+    def collect(future: Future) -> Any:
+        nonlocal size
+        elapsed, result = future.result()
+        count: int = pending.pop(future)
+        
+        if chunks is None:
+            per_item: float = elapsed / count
+            size = max(1, min(_CHUNK_MAX, int(_CHUNK_TARGET / per_item) if per_item else _CHUNK_MAX, size * 4))
+        return result
+
+    try:
+        exhausted: bool = False
+        while True:
+            while not exhausted and len(pending) < limit:
+                exhausted = not submit()
+            
+            if not pending:
+                return
+
+            if ordered:
+                yield collect(next(iter(pending)))
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield collect(future)
+    finally:
+        for future in pending:
+            future.cancel()
+        
+        if pool is not executor:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+def parallel_map(func: Callable[[Any], Any], iterable: Iterable[Any], executor: Literal["thread", "process"] | Executor = "thread", workers: int | None = None, chunk_size: int | None = None, ordered: bool = True, max_in_flight: int | None = None) -> Iterator[Any]:
+    """
+    Lazily maps `func` over `iterable` in a thread or process pool, chunk by chunk.
+
+    ### Parameters:
+    - `func` - Function called with every item. Must be picklable (module level) for `process`.
+    - `iterable` - Any iterable, read lazily, can be infinite.
+    - `executor` - `thread` for I/O or GIL releasing work, `process` for CPU work, or an existing `Executor` (not shut down).
+    - `workers` - Number of workers of a created pool, `None` for the pool default.
+    - `chunk_size` - Items per task (`chunker`), `None` to size chunks adaptively from measured time per item.
+    - `ordered` - Results in input order, or in completion order of chunks (`False`).
+    - `max_in_flight` - Max submitted chunks not consumed yet, bounds memory. Defaults to `2 * workers`.
+
+    ### Returns:
+    - Generator of results. Closing it early cancels pending chunks.
+
+    ### Raises:
+    - `ValueError` - If `executor` is unknown.
+    - Any exception raised by `func`, when its chunk result is reached.
+    """
+    for results in _parallel(func, iterable, _MAP, executor, workers, chunk_size, ordered, max_in_flight):
+        yield from results
+
+def parallel_filter(func: Callable[[Any], Any], iterable: Iterable[Any], executor: Literal["thread", "process"] | Executor = "thread", workers: int | None = None, chunk_size: int | None = None, ordered: bool = True, max_in_flight: int | None = None) -> Iterator[Any]:
+    """
+    Lazily keeps items of `iterable` for which `func` is truthy, in a thread or process pool, chunk by chunk.
+    Parameters are the same as `parallel_map`.
+
+    ### Returns:
+    - Generator of kept items.
+    """
+    for results in _parallel(func, iterable, _FILTER, executor, workers, chunk_size, ordered, max_in_flight):
+        yield from results
+
+def parallel_reduce(func: Callable[[Any, Any], Any], iterable: Iterable[Any], initial: Any = _MISSING, executor: Literal["thread", "process"] | Executor = "thread", workers: int | None = None, chunk_size: int | None = None, max_in_flight: int | None = None) -> Any:
+    """
+    Reduces every chunk in a thread or process pool, then reduces chunk results in order.
+    `func` must be associative (`a + b`, `max`, merging dicts...), like for any parallel reduce.
+
+    ### Parameters:
+    - `func` - Function of two arguments. Must be picklable (module level) for `process`.
+    - `iterable` - Any iterable, read lazily.
+    - `initial` - Optional value placed before all items, used once.
+    - Other parameters are the same as `parallel_map`.
+
+    ### Returns:
+    - Reduced value.
+
+    ### Raises:
+    - `TypeError` - If `iterable` is empty and `initial` was not given.
+    """
+    partials: Iterator[Any] = _parallel(func, iterable, _REDUCE, executor, workers, chunk_size, True, max_in_flight)
+    
+    if initial is _MISSING:
+        return functools.reduce(func, partials)
+    return functools.reduce(func, partials, initial)
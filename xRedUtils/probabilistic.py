@@ -0,0 +1,398 @@
+"""
+This module provides probabilistic structures, approximate versions of `set` membership and distinct counting
+for streams too big for exact sets. Memory stays fixed no matter how many items are added.
+
+### Objects:
+- `BloomFilter` - `bytearray` backed Bloom filter, membership with false positives but no false negatives.
+- `HyperLogLog` - Distinct counter, about `1.04 / sqrt(2 ** precision)` relative error.
+
+Items (`str`, bytes-like, `int` and `float`, equal numbers are one item like in a `set`) are hashed with `hashing.get_hasher`, so any `hashing` algorithm works. Non-cryptographic ones (`crc32`, `xxh3_128`...)
+are the fastest, `python -m xRedUtilsTests.benchmark probabilistic` reports their false-positive rate and throughput.
+
+### Usage:
+```py
+
+import xRedUtils.probabilistic as probabilistic
+or
+from xRedUtils import probabilistic
+```
+"""
+
+import sys, math, struct
+sys.dont_write_bytecode = True
+from .annotations import Any, Callable, Iterable, BINARY
+from .hashing import get_hasher, _LIT_ALGO, _LIT_FAST
+
+__all__: tuple[str, ...] = (
+    "BloomFilter", "HyperLogLog"
+)
+
+_MASK64: int = (1 << 64) - 1
+
+
+def _item_bytes(item: Any) -> bytes:
+    """
+    Canonical bytes of an item, the same in every process. `str`/`bytes` are hashed as is,
+    numbers by value (`True`, `1` and `1.0` are one item, like in a `set`), so `1` and `"1"` differ.
+
+    ### Raises:
+    - `TypeError` - If the item is not `str`, bytes-like, `int` or `float`.
+    """
+    if isinstance(item, bytes):
+        return item
+
+    elif isinstance(item, str):
+        return item.encode("utf-8")
+
+    elif isinstance(item, BINARY):
+        return bytes(item)
+
+    elif isinstance(item, float) and item.is_integer():
+        item = int(item)
+
+    if isinstance(item, int):
+        return f"int:{int(item)}".encode("utf-8")
+
+    elif isinstance(item, float):
+        # `repr` of a float is the shortest string that round-trips, so it is canonical
+        return f"float:{item!r}".encode("utf-8")
+
+    # `repr` of other objects can depend on `PYTHONHASHSEED` (sets) or memory addresses, which breaks saved filters
+    raise TypeError(f"Items must be `str`, bytes-like, `int` or `float`, not `{type(item).__name__}`")
+
+def _mix64(value: int) -> int:
+    # splitmix64 finalizer, spreads short digests over 64 bits
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & _MASK64
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EB & _MASK64
+    return value ^ (value >> 31)
+
+def _pair_hasher(algorithm: str) -> Callable[[Any], tuple[int, int]]:
+    """Two 64-bit hashes of an item, digests shorter than 16 bytes are extended by mixing."""
+    hasher: Callable[[bytes], bytes] = get_hasher(algorithm)
+
+    def pair(item: Any) -> tuple[int, int]:
+        digest: bytes = hasher(_item_bytes(item))
+
+        if len(digest) >= 16:
+            return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:16], "little")
+
+        # upper half as the second hash, like 64-bit digests are split in most Bloom filters
+        first: int = _mix64(int.from_bytes(digest, "little"))
+        return first, first >> 32
+
+    return pair
+
+
+class BloomFilter:
+    # header: magic, capacity, error rate, bit count, hash count, algorithm length, then algorithm name and bits
+    _MAGIC: bytes = b"XRBLOOM1"
+    _HEADER: struct.Struct = struct.Struct("<8sQdQQB")
+
+    def __init__(self, capacity: int, error_rate: float = 0.01, algorithm: _LIT_ALGO | _LIT_FAST = "blake2b") -> None:
+        """
+        `bytearray` backed Bloom filter. `in` never misses an added item, but can report an item that was never added.
+
+        ### Parameters:
+        - `capacity` - Expected number of distinct items, more items raise the false-positive rate.
+        - `error_rate` - False-positive rate at `capacity` items.
+        - `algorithm` - `hashing` algorithm, non-cryptographic ones are faster.
+
+        Sized to `-capacity * ln(error_rate) / ln(2) ** 2` bits and `ln(2) * bits / capacity` hash functions,
+        derived from one digest per item (Kirsch-Mitzenmacher double hashing).
+        Filters with the same parameters can be combined with `|` and `&` and serialized with `to_bytes`.
+
+        ### Raises:
+        - `ValueError` - If `capacity` is smaller than 1, `error_rate` is not between 0 and 1 or the algorithm is not supported.
+        """
+        if capacity < 1:
+            raise ValueError("`capacity` must be at least 1.")
+
+        if not 0 < error_rate < 1:
+            raise ValueError("`error_rate` must be between 0 and 1.")
+
+        size: int = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        hashes: int = max(1, round(size / capacity * math.log(2)))
+        self._setup(capacity, error_rate, algorithm, size, hashes, bytearray(-(-size // 8)))
+
+    def _setup(self, capacity: int, error_rate: float, algorithm: str, size: int, hashes: int, bits: bytearray) -> None:
+        self._capacity: int = capacity
+        self._error_rate: float = error_rate
+        self._algorithm: str = algorithm
+        self._size: int = size
+        self._hashes: int = hashes
+        self._bits: bytearray = bits
+        self._hash: Callable[[Any], tuple[int, int]] = _pair_hasher(algorithm)
+
+    @property
+    def size(self) -> int:
+        """Number of bits."""
+        return self._size
+
+    @property
+    def hashes(self) -> int:
+        """Number of hash functions."""
+        return self._hashes
+
+    @property
+    def algorithm(self) -> str:
+        return self._algorithm
+
+    def add(self, item: Any) -> None:
+        """Adds `item` to the filter, raises `TypeError` if it is not `str`, bytes-like, `int` or `float`."""
+        first, second = self._hash(item)
+        size: int = self._size
+        bits: bytearray = self._bits
+
+        for _ in range(self._hashes):
+            position: int = first % size
+            bits[position >> 3] |= 1 << (position & 7)
+            first += second
+
+    def update(self, iterable: Iterable[Any]) -> None:
+        """Adds every item of `iterable`."""
+        for item in iterable:
+            self.add(item)
+
+    def __contains__(self, item: Any) -> bool:
+        first, second = self._hash(item)
+        size: int = self._size
+        bits: bytearray = self._bits
+
+        for _ in range(self._hashes):
+            position: int = first % size
+            if not bits[position >> 3] >> (position & 7) & 1:
+                return False
+            first += second
+        return True
+
+    def estimated_len(self) -> int:
+        """Estimated number of distinct items added, from the share of set bits."""
+        # a saturated filter is counted as if one bit was still unset
+        unset: int = max(1, self._size - int.from_bytes(self._bits, "little").bit_count())
+        return round(-self._size / self._hashes * math.log(unset / self._size))
+
+    def current_error_rate(self) -> float:
+        """Current false-positive rate, grows as items are added."""
+        return (int.from_bytes(self._bits, "little").bit_count() / self._size) ** self._hashes
+
+    def _combine(self, others: tuple["BloomFilter", ...], operation: Callable[[int, int], int]) -> "BloomFilter":
+        for other in others:
+            if not isinstance(other, BloomFilter) or (other._size, other._hashes, other._algorithm) != (self._size, self._hashes, self._algorithm):
+                raise ValueError("Only filters with the same size, hash count and algorithm can be combined.")
+
+        bits: int = int.from_bytes(self._bits, "little")
+        for other in others:
+            bits = operation(bits, int.from_bytes(other._bits, "little"))
+
+        combined: BloomFilter = BloomFilter.__new__(BloomFilter)
+        combined._setup(self._capacity, self._error_rate, self._algorithm, self._size, self._hashes, bytearray(bits.to_bytes(len(self._bits), "little")))
+        return combined
+
+    def union(self, *others: "BloomFilter") -> "BloomFilter":
+        """
+        New filter containing items of this and all `others` filters, same as adding them into one filter.
+
+        ### Raises:
+        - `ValueError` - If a filter has different size, hash count or algorithm.
+        """
+        return self._combine(others, int.__or__)
+
+    def intersection(self, *others: "BloomFilter") -> "BloomFilter":
+        """
+        New filter of items present in this and all `others` filters. Has at least the false-positive rate of the inputs.
+
+        ### Raises:
+        - `ValueError` - If a filter has different size, hash count or algorithm.
+        """
+        return self._combine(others, int.__and__)
+
+    def __or__(self, other: "BloomFilter") -> "BloomFilter":
+        return self.union(other)
+
+    def __and__(self, other: "BloomFilter") -> "BloomFilter":
+        return self.intersection(other)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BloomFilter):
+            return NotImplemented
+        return (self._size, self._hashes, self._algorithm, self._bits) == (other._size, other._hashes, other._algorithm, other._bits)
+
+    def copy(self) -> "BloomFilter":
+        return self._combine((), int.__or__)
+
+    def to_bytes(self) -> bytes:
+        """Serializes the filter, load it with `BloomFilter.from_bytes`."""
+        algorithm: bytes = self._algorithm.encode("ascii")
+        return self._HEADER.pack(self._MAGIC, self._capacity, self._error_rate, self._size, self._hashes, len(algorithm)) + algorithm + self._bits
+
+    @classmethod
+    def from_bytes(cls, data: BINARY) -> "BloomFilter":
+        """
+        Loads a filter serialized with `to_bytes`.
+
+        ### Raises:
+        - `ValueError` - If `data` is not a serialized filter.
+        """
+        data = memoryview(data)
+        if len(data) < cls._HEADER.size or bytes(data[:8]) != cls._MAGIC:
+            raise ValueError("Data is not a serialized BloomFilter.")
+
+        _, capacity, error_rate, size, hashes, length = cls._HEADER.unpack_from(data)
+        start: int = cls._HEADER.size + length
+        if len(data) != start + -(-size // 8):
+            raise ValueError("Serialized BloomFilter is truncated.")
+
+        bloom: BloomFilter = cls.__new__(cls)
+        bloom._setup(capacity, error_rate, str(data[cls._HEADER.size:start], "ascii"), size, hashes, bytearray(data[start:]))
+        return bloom
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(capacity={self._capacity}, error_rate={self._error_rate}, algorithm={self._algorithm!r}, size={self._size}, hashes={self._hashes})"
+
+
+class HyperLogLog:
+    # header: magic, precision, algorithm length, then algorithm name and registers
+    _MAGIC: bytes = b"XRHLL001"
+    _HEADER: struct.Struct = struct.Struct("<8sBB")
+    # 2 ** -rank of every possible register value
+    _POWERS: tuple[float, ...] = tuple(2.0 ** -rank for rank in range(65))
+
+    def __init__(self, precision: int = 14, algorithm: _LIT_ALGO | _LIT_FAST = "blake2b") -> None:
+        """
+        HyperLogLog distinct counter, `len()` is the estimated number of distinct items added.
+
+        ### Parameters:
+        - `precision` - 4 to 18, uses `2 ** precision` one byte registers. Relative error is about `1.04 / sqrt(2 ** precision)` (0.8% by default).
+        - `algorithm` - `hashing` algorithm, non-cryptographic ones are faster.
+
+        Small counts are corrected with linear counting. Counters with the same parameters can be merged with `|`
+        (the count of the union of both streams) and serialized with `to_bytes`.
+
+        ### Raises:
+        - `ValueError` - If `precision` is out of range or the algorithm is not supported.
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError("`precision` must be between 4 and 18.")
+
+        self._setup(precision, algorithm, bytearray(1 << precision))
+
+    def _setup(self, precision: int, algorithm: str, registers: bytearray) -> None:
+        self._precision: int = precision
+        self._algorithm: str = algorithm
+        self._registers: bytearray = registers
+        self._hash: Callable[[Any], tuple[int, int]] = _pair_hasher(algorithm)
+
+        self._shift: int = 64 - precision
+        self._mask: int = (1 << self._shift) - 1
+
+    @property
+    def precision(self) -> int:
+        return self._precision
+
+    @property
+    def algorithm(self) -> str:
+        return self._algorithm
+
+    def add(self, item: Any) -> None:
+        """Adds `item` to the counter, raises `TypeError` if it is not `str`, bytes-like, `int` or `float`."""
+        value: int = self._hash(item)[0]
+        index: int = value >> self._shift
+        # position of the first set bit in the remaining bits
+        rank: int = self._shift - (value & self._mask).bit_length() + 1
+
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def update(self, iterable: Iterable[Any]) -> None:
+        """Adds every item of `iterable`."""
+        for item in iterable:
+            self.add(item)
+
+    def count(self) -> float:
+        """Estimated number of distinct items added."""
+        registers: int = len(self._registers)
+
+        match registers:
+            case 16:
+                alpha: float = 0.673
+            case 32:
+                alpha = 0.697
+            case 64:
+                alpha = 0.709
+            case _:
+                alpha = 0.7213 / (1 + 1.079 / registers)
+
+        estimate: float = alpha * registers * registers / sum(map(self._POWERS.__getitem__, self._registers))
+        if estimate <= 2.5 * registers and (zeros := self._registers.count(0)):
+            return registers * math.log(registers / zeros)
+        return estimate
+
+    def __len__(self) -> int:
+        return round(self.count())
+
+    def merge(self, *others: "HyperLogLog") -> None:
+        """
+        Merges `others` into this counter in place.
+
+        ### Raises:
+        - `ValueError` - If a counter has different precision or algorithm.
+        """
+        for other in others:
+            if not isinstance(other, HyperLogLog) or (other._precision, other._algorithm) != (self._precision, self._algorithm):
+                raise ValueError("Only counters with the same precision and algorithm can be merged.")
+
+        for other in others:
+            self._registers[:] = bytes(map(max, self._registers, other._registers))
+
+    def union(self, *others: "HyperLogLog") -> "HyperLogLog":
+        """
+        New counter of this and all `others` counters.
+
+        ### Raises:
+        - `ValueError` - If a counter has different precision or algorithm.
+        """
+        merged: HyperLogLog = self.copy()
+        merged.merge(*others)
+        return merged
+
+    def __or__(self, other: "HyperLogLog") -> "HyperLogLog":
+        return self.union(other)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, HyperLogLog):
+            return NotImplemented
+        return (self._precision, self._algorithm, self._registers) == (other._precision, other._algorithm, other._registers)
+
+    def copy(self) -> "HyperLogLog":
+        counter: HyperLogLog = HyperLogLog.__new__(HyperLogLog)
+        counter._setup(self._precision, self._algorithm, bytearray(self._registers))
+        return counter
+
+    def to_bytes(self) -> bytes:
+        """Serializes the counter, load it with `HyperLogLog.from_bytes`."""
+        algorithm: bytes = self._algorithm.encode("ascii")
+        return self._HEADER.pack(self._MAGIC, self._precision, len(algorithm)) + algorithm + self._registers
+
+    @classmethod
+    def from_bytes(cls, data: BINARY) -> "HyperLogLog":
+        """
+        Loads a counter serialized with `to_bytes`.
+
+        ### Raises:
+        - `ValueError` - If `data` is not a serialized counter.
+        """
+        data = memoryview(data)
+        if len(data) < cls._HEADER.size or bytes(data[:8]) != cls._MAGIC:
+            raise ValueError("Data is not a serialized HyperLogLog.")
+
+        _, precision, length = cls._HEADER.unpack_from(data)
+        start: int = cls._HEADER.size + length
+        if not 4 <= precision <= 18 or len(data) != start + (1 << precision):
+            raise ValueError("Serialized HyperLogLog is truncated.")
+
+        counter: HyperLogLog = cls.__new__(cls)
+        counter._setup(precision, str(data[cls._HEADER.size:start], "ascii"), bytearray(data[start:]))
+        return counter
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(precision={self._precision}, algorithm={self._algorithm!r}, count={len(self)})"
@@ -45,6 +45,7 @@ import xRedUtilsAsync.maths as maths
 import xRedUtilsAsync.modules as modules
 import xRedUtils.objects as objects
 import xRedUtilsAsync.paths as paths
+import xRedUtilsAsync.probabilistic as probabilistic
 import xRedUtilsAsync.regexes as regexes
 import xRedUtilsAsync.strings as strings
 import xRedUtilsAsync.system as system
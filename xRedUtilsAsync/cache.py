@@ -1,13 +1,27 @@
 """
 This module provides classes/objects made for memory cache.
-## NOTE: Cache methods are not async.
+## NOTE: Cache methods are not async, the cache classes are the ones of `xRedUtils.cache`.
 
 ### Objects:
 - `Cache` - Same as `dict` just renamed for better typing.
 - `LimitedCache` - Classic limited cache, cannot exceed `max_capacity`.
-- `BetterLimitedCache` - Better limited cache, can manipulate with `max_capacity` in the runtime.
-- `LRUCache` - Classic LRU cache.
-- `BetterLRU` - Better LRU cache, can manipulate with `max_capacity` in the runtime.
+- `BetterLimitedCache` - Better limited cache, can manipulate with `max_capacity` and optional `max_weight` in the runtime.
+- `LRUCache` - Classic LRU cache, O(1) with `hits`/`misses`/`inserts`/`evictions` counters.
+- `BetterLRU` - Better LRU cache, can manipulate with `max_capacity` and optional `max_weight` in the runtime.
+- `ConcurrentLimitedCache` - Thread-safe limited cache with lock striping, can manipulate with `max_capacity` in the runtime.
+- `ConcurrentLRU` - Thread-safe, sharded LRU cache with lock striping, can manipulate with `max_capacity` in the runtime.
+- `TTLCache` - Time expiring LRU cache with per key TTL, can manipulate with `max_capacity` in the runtime.
+- `TinyLFUCache` - Scan resistant W-TinyLFU cache, same API as `LRUCache`.
+- `ARCCache` - Adaptive replacement cache, can manipulate with `max_capacity` in the runtime.
+- `TwoQueueCache` - 2Q cache, can manipulate with `max_capacity` in the runtime.
+- `DiskCache` - Persistent cache, append-only log with a memory mapped index and an `LRUCache` front.
+- `SharedMemoryCache` - Cache shared by processes of one host, CLOCK eviction.
+- `CacheInfo` - Statistics returned by `cache_info()` of memoized functions.
+- `CacheStats` - Opt-in counters, hit ratio series and latency histograms, see `enable_stats` of every cache.
+
+### Functions:
+- `default_weigher` - Estimates memory size of a value in bytes, used by `max_weight`.
+- `memoize` - Memoization decorator for `async def` functions backed by `BetterLRU`/`TTLCache`, shares in-flight tasks.
 
 ### Usage:
 ```py
@@ -17,140 +31,113 @@ from xRedUtilsAsync import cache
 ```
 """
 
-import sys
+import sys, asyncio, functools, inspect
 sys.dont_write_bytecode = True
-from collections import OrderedDict
 
-from .annotations import K, V, Iterator
+from .annotations import F, Any, NUMBER, Callable, Hashable
+from xRedUtils.cache import (
+    Cache, LimitedCache, BetterLimitedCache, LRUCache, BetterLRU, ConcurrentLimitedCache, ConcurrentLRU, TTLCache, TinyLFUCache,
+    ARCCache, TwoQueueCache, DiskCache, SharedMemoryCache, CacheInfo, CacheStats, default_weigher, memoize as _sync_memoize
+)
+from .times import OPTIONS
 
 __all__: tuple[str, ...] = (
-    "Cache", "LimitedCache", "BetterLimitedCache", "LRUCache", "BetterLRU"
+    "Cache", "LimitedCache", "BetterLimitedCache", "LRUCache", "BetterLRU",
+    "ConcurrentLimitedCache", "ConcurrentLRU", "TTLCache", "TinyLFUCache", "ARCCache", "TwoQueueCache", "DiskCache", "SharedMemoryCache", "CacheInfo", "CacheStats",
+    "default_weigher", "memoize"
 )
 
-class Cache(dict[K, V]):
-    """Same as `dict` just renamed for better typing."""
-
-
-class LimitedCache(Cache[K, V]):
-    def __init__(self, max_capacity: int) -> None:
-        """Classic limited cache, cannot exceed `max_capacity`."""
-        super().__init__()
-        self._max_capacity: int = max_capacity
+# sentinel for `get`, `None` is a valid cached value
+_MISSING: Any = object()
+# separates positional and keyword arguments in keys
+_KWD_MARK: object = object()
+# a lone argument of these types is the key itself, subclasses are left out
+_FAST_TYPES: frozenset[type] = frozenset((int, str))
 
-    @property
-    def max_capacity(self) -> int:
-        return self._max_capacity
-    
-    @max_capacity.setter
-    def max_capacity(self, size: int) -> RuntimeError:
-        raise RuntimeError("You cannot change `max_capacity`. Use `BetterLimitedCache`.")
-    
-    def put(self, key: K, value: V) -> None:
-        """
-        Adds a new key-value pair, returns error if `max_capacity` is reached.
-        """
-        if len(self) == self._max_capacity:
-            raise MemoryError(f"Max capacty reached! Limit: {self._max_capacity}")
-        else:
-            super().__setitem__(key, value)
-
-    def __setitem__(self, key: K, value: V) -> None:
-        """Overrides standard dictionary assignment to ensure LimitedCache behavior."""
-        return self.put(key, value)
-
-class BetterLimitedCache(LimitedCache[K, V]):
-    def __init__(self, max_capacity: int) -> None:
-        """Better limited cache, can manipulate with `max_capacity` in the runtime."""
-        super().__init__(max_capacity)
-
-    @property
-    def max_capacity(self) -> int:
-        return self._max_capacity
-
-    @max_capacity.setter
-    def max_capacity(self, size: int) -> None:
-        return self.change_size(int(size))
+def _make_key(args: tuple[Any, ...], kwargs: dict[str, Any], typed: bool) -> Hashable:
+    """Builds a cache key. `args` tuple is used as is, when there is nothing to add."""
+    key: tuple[Any, ...] = args
     
-    def change_size(self, new_max_capacity: int) -> None:
-        """
-        Adjusts cache size. If shrinking, evicts first items.
-        ### WARNING: shrinking can lead to data loss! Use with your own risk.
-        """
-        self._max_capacity = new_max_capacity
-        
-        # using iter for faster and more optimized removal
-        keys: Iterator[K] = iter(self)
-        while len(self) > new_max_capacity:
-            self.pop(next(keys))
-
-
-class LRUCache(OrderedDict[K, V]):
-    def __init__(self, max_capacity: int) -> None:
-        """Classic LRU cache."""    
-        super().__init__()
-        self._max_capacity: int = max_capacity
-
-    @property
-    def max_capacity(self) -> int:
-        return self._max_capacity
-
-    @max_capacity.setter
-    def max_capacity(self, size: int) -> RuntimeError:
-        raise RuntimeError("You cannot change `max_size`. Use `BetterLRUCache`.")
-
-    def touch(self, key: K, default: V | None = None) -> V | None:
-        """Gets value without updating cache order."""
-        return super().get(key, default)
-
-    def get(self, key: K, default: V | None = None) -> V | None:
-        """Retrieves a value and moves it to the top (most recently used)."""
-        if key in self:
-            self.move_to_end(key, last=True)
-            return super().get(key)
-        
-        return default
-
-    def put(self, key: K, value: V) -> None:
-        """
-        Adds a new key-value pair, moves it to the top, 
-        and removes the least recently used item if `max_capacity` is exceeded.
-        """
-        if key in self:
-            self.move_to_end(key, last=True)
-
-        self
-        super().__setitem__(key, value)
-
-        if len(self) > self._max_capacity:
-            self.popitem(last=False)
-
-    def __setitem__(self, key: K, value: V) -> None:
-        """Overrides standard dictionary assignment to ensure LRU behavior."""
-        return self.put(key, value)
-
-    def __getitem__(self, key: K) -> V:
-        """Overrides standard dictionary retrieval to maintain LRU order."""
-        return self.get(key)
-
-class BetterLRU(LRUCache[K, V]):
-    def __init__(self, max_capacity: int) -> None:
-        """Better LRU cache, can manipulate with `max_capacity` in the runtime."""    
-        super().__init__(max_capacity)
-
-    @property
-    def max_capacity(self) -> int:
-        return self._max_capacity
-
-    @max_capacity.setter
-    def max_capacity(self, size: int) -> None:
-        return self.change_size(int(size))
+    if kwargs:
+        key += (_KWD_MARK, *kwargs.items())
+    if typed:
+        key += tuple(type(arg) for arg in args)
+        if kwargs:
+            key += tuple(type(value) for value in kwargs.values())
+    return key
+
+def memoize(maxsize: int | None | Callable = 128, ttl: NUMBER | None = None, unit: OPTIONS = "second", typed: bool = False) -> Callable[[F], F]:
+    """
+    Memoization decorator for `async def` functions backed by `BetterLRU` or `TTLCache` (if `ttl` is set).
+    Regular functions are passed to `xRedUtils.cache.memoize`.
+
+    ```python
+    >>> @memoize(maxsize=1024, ttl=5, unit="minute")
+    ... async def resolve(host: str) -> str: ...
+    ```
+
+    ### Parameters:
+    - `maxsize` - Max number of cached results, `None` for unlimited. Can be the function itself (`@memoize` without brackets).
+    - `ttl` - Time to live of every result, `None` means results do not expire.
+    - `unit` - Unit of `ttl`, same options as `times.convert_to_seconds`.
+    - `typed` - If arguments of different types are cached separately (`1` and `1.0`).
+
+    Concurrent callers with the same arguments await one shared task instead of running the function again.
+    Cancelling one caller does not cancel the task for the others.
+    A single `int` or `str` argument is used as the key directly, without building a tuple.
+    Decorated function gets `cache_info()`, `cache_clear()` and `cache_parameters()`.
+
+    ### Returns:
+    - Decorator.
+    """
+    if callable(maxsize):
+        return memoize()(maxsize)
+
+    def decorator(func: F) -> F:
+        if not inspect.iscoroutinefunction(func):
+            return _sync_memoize(maxsize, ttl, unit, typed)(func)
+
+        capacity: int = sys.maxsize if maxsize is None else maxsize
+        cache: BetterLRU[Hashable, Any] = BetterLRU(capacity) if ttl is None else TTLCache(capacity, ttl=ttl, unit=unit)
+        cache_get: Callable = cache.get
+        in_flight: dict[Hashable, asyncio.Task] = {}
+
+        def store(key: Hashable, task: asyncio.Task) -> None:
+            del in_flight[key]
+            if not task.cancelled() and task.exception() is None:
+                cache.put(key, task.result())
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> Any:
+            if not kwargs and not typed and len(args) == 1 and type(args[0]) in _FAST_TYPES:
+                key: Hashable = args[0]
+            else:
+                key = _make_key(args, kwargs, typed)
+
+            value: Any = cache_get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+
+            task: asyncio.Task | None = in_flight.get(key)
+            if task is None:
+                task = in_flight[key] = asyncio.ensure_future(func(*args, **kwargs))
+                task.add_done_callback(functools.partial(store, key))
+
+            return await asyncio.shield(task)
+
+        def cache_info() -> CacheInfo:
+            return CacheInfo(cache.hits, cache.misses, maxsize, len(cache))
+
+        def cache_clear() -> None:
+            cache.clear()
+            cache.hits = cache.misses = cache.inserts = cache.evictions = 0
+
+        def cache_parameters() -> dict[str, Any]:
+            return {"maxsize": maxsize, "ttl": ttl, "unit": unit, "typed": typed}
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        wrapper.cache_parameters = cache_parameters
+        return wrapper
     
-    def change_size(self, new_max_capacity: int) -> None:
-        """
-        Adjusts cache size. If shrinking, evicts the oldest items.
-        ### WARNING: shrinking can lead to data loss! Use with your own risk.
-        """
-        self._max_capacity = new_max_capacity
-
-        while len(self) > new_max_capacity:
-            self.popitem(last=False)
+    return decorator
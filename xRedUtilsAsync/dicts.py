@@ -1,13 +1,35 @@
 """
 This module provides async functions for working with dictionaries and JSON data.
 
+### Objects:
+- `CompiledPath` - Reusable accessor of a value in nested dictionaries and lists.
+- `BidirectionalDict` - `dict` with a reverse index, finds keys of a value in O(1).
+- `MergedView` - Lazy, read only `deep_merge` of dictionaries.
+- `CompactRecords` - Columnar table of uniformly keyed dictionaries with a shared schema.
+- `CompactRecord` - Read only `dict`-like view of one row of `CompactRecords`.
+- `JSONCodec` - JSON backend, pair of `loads` and `dumps` functions.
+- `JSONStreamDecoder` - Incremental decoder of concatenated JSON documents.
+
 ### Functions:
-- `dict_walk` - Recursively walks through a dictionary to retrieve a value specified by a given path.
+- `dict_walk` - Walks through a dictionary to retrieve a value specified by a given path.
 - `value_exist` - Checks whether a value exists within a dictionary at the specified path.
+- `compile_path` - Returns a cached, reusable `CompiledPath` accessor.
+- `get_many` - Gets values at many paths of one document.
 - `dict_merge` - Merges two dictionaries.
+- `deep_merge` - Deeply merges dictionaries with per type strategies, sharing unchanged subtrees.
+- `compact_records` - Stores many uniformly keyed dictionaries by columns with a shared schema.
 - `flatten_dict` - Flattens a nested dictionary into a single-level dictionary.
+- `iter_flatten_dict` - Lazily flattens a nested dictionary into `(key, value)` pairs.
+- `unflatten_dict` - Inverse of `flatten_dict`, splits keys into nested dictionaries.
 - `json_to_dict` - Converts JSON data to a Python dictionary.
 - `dict_to_json` - Converts a dictionary to a JSON string with optional indentation and additional keyword arguments.
+- `encode_json` - Converts data to UTF-8 encoded JSON `bytes`.
+- `json_default` - Default hook of `dict_to_json` for `datetime`, `UUID` and `set`. *Sync, backends call it.*
+- `register_json_codec` - Registers a JSON backend.
+- `get_json_codec` - Returns a registered JSON backend, by default the standard library `json`.
+- `iter_json_lines` - Lazily parses a JSON Lines file, optionally in a process pool.
+- `iter_json_stream` - Lazily parses concatenated JSON documents.
+- `write_json_lines` - Writes documents as JSON Lines in batches.
 - `get_value` - Gets value of specified key.
 - `get_key` - Gets key of specified value.
 - `isEmpty` - Checks if the `dict` is empty.
@@ -21,14 +43,54 @@ from xRedUtilsAsync import dicts
 ```
 """
 
-import sys, json, io
+import sys, io, os
 sys.dont_write_bytecode = True
-from .annotations import Iterator, Hashable, Any, overload
+from .annotations import IO, Callable, Iterable, Iterator, Hashable, Mapping, Literal, Any, overload
+from xRedUtils.dicts import (
+    CompiledPath, BidirectionalDict, MergedView, CompactRecords, CompactRecord, JSONCodec, JSONStreamDecoder, json_default,
+    iter_json_lines as _iter_json_lines, iter_json_stream as _iter_json_stream, write_json_lines as _write_json_lines,
+    json_to_dict as _json_to_dict, dict_to_json as _dict_to_json, encode_json as _encode_json, register_json_codec as _register_json_codec, get_json_codec as _get_json_codec,
+    deep_merge as _deep_merge, compile_path as _compile_path, get_key as _get_key, get_many as _get_many, dict_walk as _dict_walk, value_exist as _value_exist,
+    iter_flatten_dict as _iter_flatten_dict, unflatten_dict as _unflatten_dict
+)
 
 __all__: tuple[str, ...] = (
-    "dict_walk", "value_exist", "dict_merge", "flatten_dict", "json_to_dict", "dict_to_json", "get_value", "get_key", "isEmpty"
+    "CompiledPath", "BidirectionalDict", "MergedView", "CompactRecords", "CompactRecord", "JSONCodec", "JSONStreamDecoder",
+    "dict_walk", "value_exist", "compile_path", "get_many", "dict_merge", "deep_merge", "compact_records", "flatten_dict", "iter_flatten_dict", "unflatten_dict",
+    "json_to_dict", "dict_to_json", "encode_json", "json_default", "register_json_codec", "get_json_codec", "iter_json_lines", "iter_json_stream", "write_json_lines", "get_value", "get_key", "isEmpty"
 )
 
+_LIT_STRATEGY = Literal["replace", "append", "union"]
+
+async def compile_path(path: str | Iterable[Hashable], _sep: str = ".") -> CompiledPath:
+    """
+    Returns a reusable `CompiledPath` accessor, the last 1024 compiled paths are kept in an LRU cache.
+    Methods of the accessor are sync.
+
+    ### Parameters:
+    - `path` - The path to the value, specified as a `str` (`"a.b.0.c"`) or an iterable of keys.
+    - `_sep` - Separator used to split the path if it's a `str` (default is `"."`).
+
+    ### Returns:
+    - `CompiledPath`, call it or its `get` with a document.
+    """
+    return _compile_path(path, _sep)
+
+async def get_many(dictionary: dict[Hashable, Any], paths: Iterable[str | Iterable[Hashable] | CompiledPath], default: Any = None, _sep: str = ".") -> list[Any]:
+    """
+    Gets values at many paths of one document, paths are compiled (and cached) once.
+
+    ### Parameters:
+    - `dictionary` - Nested dictionaries and lists.
+    - `paths` - Paths as `str`, iterables of keys or `CompiledPath`s.
+    - `default` - Value of paths that do not exist.
+    - `_sep` - Separator used to split `str` paths (default is `"."`).
+
+    ### Returns:
+    - `list` of values, in order of `paths`.
+    """
+    return _get_many(dictionary, paths, default, _sep)
+
 @overload
 async def dict_walk(dictionary: dict[Hashable, Any], path: str | list[str], _sep: str = ".") -> Any: ...
 @overload
@@ -36,11 +98,11 @@ async def dict_walk(dictionary: dict[Hashable, Any], path: str | list[str], _sep
 
 async def dict_walk(dictionary: dict[Hashable, Any], path: str | list[str], _sep: str = ".", _slice: slice = slice(None, None)) -> Any:
     """
-    Recursively walks through a dictionary to retrieve a value specified by a given path.
+    Walks through a dictionary to retrieve a value specified by a given path. The path is compiled with `compile_path`.
 
     ### Parameters:
     - `dictionary` - The dictionary to traverse.
-    - `path` - The path to the desired value, specified as a `str` or `list of str`.
+    - `path` - The path to the desired value, specified as a `str` or `list of str`. Digit segments index lists.
 
     - `_sep` - Separator used to split the path if it's a `str` (default is `"."`).
     - `_slice` - Slice object indicating the range of elements to consider in the path (default is `slice(None, None)` or full path).
@@ -49,18 +111,9 @@ async def dict_walk(dictionary: dict[Hashable, Any], path: str | list[str], _sep
     - The value found at the specified path within the dictionary.
 
     ### Raises:
-    - `MemoryError` - If the specified path cannot be found within the dictionary.
+    - `ResourceNotFoundError` - If the specified path cannot be found within the dictionary. (subclass of `MemoryError`)
     """
-    current: dict[Hashable, Any] = dictionary
-    path = path.split(_sep) if isinstance(path, str) else path
-
-    for key in path[_slice]:
-        if key in current:
-            current = current[key]
-        else:
-            raise MemoryError(f"Failed to reach value specified: `{key}` on `{path}`")
-
-    return current
+    return _dict_walk(dictionary, path, _sep, _slice)
 
 async def value_exist(dictionary: dict[Hashable, Any], path: str | list[str], **kwargs) -> bool:
     """
@@ -69,20 +122,16 @@ async def value_exist(dictionary: dict[Hashable, Any], path: str | list[str], **
     ### Parameters:
     - `dictionary` - The dictionary to search within.
     - `path` The path to the value being checked, specified as a `string` or `list of strings`.
-    - `**kwargs` - Additional keyword arguments to pass to the `dicts.dict_walk` function.
+    - `**kwargs` - Additional keyword arguments of the `dicts.dict_walk` function (`_sep`, `_slice`).
 
     ### Returns:
     - `True` if the value exists at the specified path within the dictionary, `False` otherwise.
     """
-    try:
-        await dict_walk(dictionary, path, **kwargs)
-        return True 
-    except:
-        return False
+    return _value_exist(dictionary, path, **kwargs)
 
 async def dict_merge(dict1, dict2) -> dict[Hashable, Any]:
     """
-    Merges two dictionaries.
+    Merges two dictionaries, shallow. See `deep_merge` for nested dictionaries.
 
     ### Parameters:
     - `dict1` - The first dictionary to merge.
@@ -93,63 +142,237 @@ async def dict_merge(dict1, dict2) -> dict[Hashable, Any]:
     """
     return dict1 | dict2
 
+async def deep_merge(*dictionaries: dict[Hashable, Any], strategies: Mapping[type, _LIT_STRATEGY | Callable[[Any, Any], Any]] | None = None) -> dict[Hashable, Any]:
+    """
+    Deeply merges dictionaries, later ones override earlier ones. Nested dictionaries are merged, other values are replaced
+    unless `strategies` say otherwise.
+
+    ### Parameters:
+    - `*dictionaries` - Dictionaries to merge, from the base to the top overlay. Inputs are never modified.
+    - `strategies` - Merge strategy of values per type (subclasses included), applied when both values are of that type:
+    `"replace"` (default), `"append"` (`old + new`, lists/tuples), `"union"` (`old | new`, sets) or a callable `(old, new) -> merged`.
+
+    ### Returns:
+    - A new `dictionary`. Subtrees present in one input only are shared with it, not copied, so the result
+    costs memory only for the merged paths. Copy it before changing nested values.
+
+    ### Raises:
+    - `ValueError` - If a strategy is unknown.
+    """
+    return _deep_merge(*dictionaries, strategies=strategies)
+
+async def compact_records(records: Iterable[Mapping[Hashable, Any]], pack: bool = True) -> CompactRecords:
+    """
+    Stores many small, uniformly keyed dictionaries (rows of `json_to_dict`, `iter_json_lines`, `flatten_dict`...) by columns with one shared schema.
+    
+    A `dict` of 5 keys costs about 200 bytes plus its values, a row of `CompactRecords` 8 bytes per key.
+    Numeric columns are packed into typed arrays, which also frees the `int`/`float` objects.
+
+    ### Parameters:
+    - `records` - Dictionaries, generators included, so the input never has to be held in memory at once.
+    - `pack` - Packs columns of `int` (64 bit) or `float` values only into `array.array`.
+
+    ### Returns:
+    - Immutable `CompactRecords`, a sequence of read only `dict`-like `CompactRecord` views. Their methods are sync.
+    """
+    return CompactRecords(records, pack)
+
+async def iter_flatten_dict(dictionary: dict[Hashable, Any], _sep: str = "_", _parent_key: str = "", flatten_lists: bool = False) -> Iterator[tuple[Hashable, Any]]:
+    """
+    Lazily flattens a nested dictionary into `(key, value)` pairs, without recursion. Made for documents too big to flatten at once.
+
+    ### Parameters:
+    - `dictionary` - The dictionary to flatten.
+    - `_sep` - Separator used to join keys (default is "_").
+    - `_parent_key` - Prefix of the first level keys (default is `""`, first level keys are kept as is).
+    - `flatten_lists` - Also flattens `list`/`tuple` values, their indexes become keys (`"a_0"`).
+
+    ### Returns:
+    - Generator of `(key, value)` pairs, empty nested containers are skipped. Raises `ValueError` on a reference cycle while iterated.
+    """
+    return _iter_flatten_dict(dictionary, _sep, _parent_key, flatten_lists)
+
 @overload
 async def flatten_dict(dictionary: dict[str, Any], _sep: str= "_") -> dict[str, Any]: ...
 @overload
-async def flatten_dict(dictionary: dict[str, Any], _sep: str= "_", _parent_key="") -> dict[str, Any]: ...
+async def flatten_dict(dictionary: dict[str, Any], _sep: str= "_", _parent_key="", flatten_lists: bool = False) -> dict[str, Any]: ...
 
-async def flatten_dict(dictionary: dict[str, Any], _sep: str= "_", _parent_key="") -> dict[str, Any]:
+async def flatten_dict(dictionary: dict[str, Any], _sep: str= "_", _parent_key="", flatten_lists: bool = False) -> dict[str, Any]:
     """
-    Flattens a nested dictionary into a single-level dictionary.
+    Flattens a nested dictionary into a single-level dictionary, without recursion.
 
     ### Parameters:
     - `dictionary` - The dictionary to flatten.
     - `_sep` - Separator used to join keys in the flattened dictionary (default is "_").
-    - `_parent_key` - Internal parameter used for recursive calls to keep track of parent keys (default is `""`), can be changed, but will only be applied to the first level keys.
+    - `_parent_key` - Prefix of the first level keys (default is `""`, first level keys are kept as is).
+    - `flatten_lists` - Also flattens `list`/`tuple` values, their indexes become keys (`"a_0"`).
 
     ### Returns:
     - A single-level `dictionary` where nested keys are joined with the separator.
+
+    ### Raises:
+    - `ValueError` - If the dictionary contains itself (a reference cycle).
     """
+    return dict(_iter_flatten_dict(dictionary, _sep, _parent_key, flatten_lists))
 
-    items: dict[str, Any] = {}
-    
-    for k, v in dictionary.items():
-        new_key: str = f"{_parent_key}{_sep}{k}" if _parent_key else k
-        if isinstance(v, dict):
-            flatten: dict[str, Any] = await flatten_dict(v, _sep=_sep, _parent_key=new_key)
-            items.update(flatten.items())
-        else:
-            items[new_key] = v
-    return items
+async def unflatten_dict(dictionary: dict[Hashable, Any], _sep: str = "_", unflatten_lists: bool = False) -> dict[Hashable, Any]:
+    """
+    Inverse of `flatten_dict`, splits keys on the separator into nested dictionaries.
+
+    ### Parameters:
+    - `dictionary` - The single-level dictionary to unflatten, non `str` keys are kept as is.
+    - `_sep` - Separator used to split keys (default is "_").
+    - `unflatten_lists` - Turns nested dictionaries with keys `"0"` to `"n"` back into `list`s.
 
-async def json_to_dict(d: bytes | str | bytearray | io.TextIOWrapper, **kwargs) -> dict[str, Any]:
+    ### Returns:
+    - A nested `dictionary`.
+
+    ### Raises:
+    - `ValueError` - If a key is both a value and a prefix of other keys (`"a"` and `"a_b"`).
+    """
+    return _unflatten_dict(dictionary, _sep, unflatten_lists)
+
+async def register_json_codec(name: str, loads: Callable[[str | bytes | bytearray], Any], dumps: Callable[[Any, int | None, Callable[[Any], Any] | None], str | bytes], default: bool = False) -> JSONCodec:
+    """
+    Registers a JSON backend usable by name in `json_to_dict`, `dict_to_json` and `files`.
+
+    ### Parameters:
+    - `name` - Name of the backend, replaces a registered backend with the same name.
+    - `loads` - Sync function parsing `str`, `bytes` or `bytearray`.
+    - `dumps` - Sync function of `(data, indent, default)` returning compact `str` or UTF-8 `bytes` if `indent` is `None`.
+    - `default` - Use the backend when no `codec` is specified.
+
+    ### Returns:
+    - Registered `JSONCodec`.
+    """
+    return _register_json_codec(name, loads, dumps, default)
+
+async def get_json_codec(name: str | None = None) -> JSONCodec:
+    """
+    Returns a registered JSON backend.
+
+    ### Parameters:
+    - `name` - Name of the backend, `"orjson"`, `"msgspec"`, `"ujson"`, `"json"` or a registered one.
+        If `None` the default is returned, which is the standard library `json`.
+
+    Faster backends are opt-in, per call with `codec` or for every call with
+    `register_json_codec(*get_json_codec("orjson"), default=True)`. They differ from `json` on edge cases:
+    `orjson` parses integers over 64 bits as `float` and can't write them, `orjson` and `msgspec` write
+    `NaN`/`Infinity` as `null`, and none of them parse `NaN`/`Infinity` except `ujson`.
+
+    ### Returns:
+    - `JSONCodec`.
+
+    ### Raises:
+    - `ValueError` - If the backend is not installed or registered.
+    """
+    return _get_json_codec(name)
+
+async def json_to_dict(d: bytes | str | bytearray | memoryview | io.IOBase, codec: str | None = None, **kwargs) -> dict[str, Any]:
     """
     Converts JSON data to a Python dictionary.
 
     ### Parameters:
-    - `d` - JSON data, which can be provided as `bytes`, `string`, `bytearray`, or a `text file`.
-    - `**kwargs` - Additional keyword arguments to pass to the `json.loads` function.
+    - `d` - JSON data, which can be provided as `bytes`, `string`, `bytearray`, `memoryview` or a `file` (text or binary).
+        *`bytes` are parsed directly, open files in `rb` mode to skip decoding.*
+    - `codec` - Name of JSON backend, see `get_json_codec` (default is the standard library `json`).
+    - `**kwargs` - Additional keyword arguments to pass to the `json.loads` function, uses the standard library whatever the default codec is.
 
     ### Returns:
     - A `dictionary` containing the parsed JSON data.
+
+    ### Raises:
+    - `ValueError` - If `**kwargs` are given with a `codec` other than `json`.
     """
-    if isinstance(d, io.TextIOWrapper):
-        d = d.read()
-    return json.loads(d, **kwargs)
+    return _json_to_dict(d, codec, **kwargs)
 
-async def dict_to_json(dictionary: dict[str, Any], indent: int = 4, **kwargs) -> str:
+async def dict_to_json(dictionary: dict[str, Any], indent: int | None = None, default: Callable[[Any], Any] | None = json_default, codec: str | None = None, **kwargs) -> str:
     """
     Converts a dictionary to a JSON string with optional indentation and additional keyword arguments.
 
     ### Parameters:
     - `dictionary` - The dictionary to convert to JSON.
-    - `indent` - The number of spaces used for indentation (default is `4`).  *Made for better readablity of JSON, can be set to `None`*
-    - `**kwargs` - Additional keyword arguments to pass to the `json.dumps` function.
+    - `indent` - The number of spaces used for indentation (default is `None`, compact output without spaces).
+    - `default` - Sync function called on objects the backend can't serialize (default is `json_default`, handles `datetime`, `UUID` and `set`). *Not used with `cls`, the encoder's `default` method is.*
+    - `codec` - Name of JSON backend, see `get_json_codec` (default is the standard library `json`).
+    - `**kwargs` - Additional keyword arguments to pass to the `json.dumps` function, uses the standard library whatever the default codec is.
 
     ### Returns:
     - A JSON string representing the dictionary.
+
+    ### Raises:
+    - `ValueError` - If `**kwargs` are given with a `codec` other than `json`.
     """
-    return json.dumps(dictionary, indent=indent, **kwargs)
+    return _dict_to_json(dictionary, indent, default, codec, **kwargs)
+
+async def encode_json(data: Any, indent: int | None = None, default: Callable[[Any], Any] | None = json_default, codec: str | None = None, **kwargs) -> bytes:
+    """
+    Converts data to UTF-8 encoded JSON, the backends that produce `bytes` skip the `str` round trip.
+
+    ### Parameters:
+    - `data` - Any JSON serializable data.
+    - `indent` - The number of spaces used for indentation (default is `None`, compact output without spaces).
+    - `default` - Called on objects the backend can't serialize (default is `json_default`, handles `datetime`, `UUID` and `set`). *Not used with `cls`, the encoder's `default` method is.*
+    - `codec` - Name of JSON backend, see `get_json_codec` (default is the standard library `json`).
+    - `**kwargs` - Additional keyword arguments to pass to the `json.dumps` function, uses the standard library whatever the default codec is.
+
+    ### Returns:
+    - JSON as `bytes`.
+
+    ### Raises:
+    - `ValueError` - If `**kwargs` are given with a `codec` other than `json`.
+    """
+    return _encode_json(data, indent, default, codec, **kwargs)
+
+async def iter_json_lines(source: str | os.PathLike | IO, codec: str | None = None, processes: int = 0, chunk_size: int = 10_000) -> Iterator[Any]:
+    """
+    Lazily parses a JSON Lines (NDJSON) file, one document per line, blank lines are skipped. Memory is bounded by the longest line.
+
+    ### Parameters:
+    - `source` - Path to the file, or a file object opened in binary (preferred, no decoding) or text mode.
+    - `codec` - Name of JSON backend, see `get_json_codec` (default is the standard library `json`).
+    - `processes` - Parses chunks of lines in a process pool of this size, `0` parses in the current process.
+        *Pays off for large documents, small ones are cheaper to parse than to send to a process.*
+    - `chunk_size` - Number of lines sent to a process at once.
+
+    ### Returns:
+    - Sync generator of parsed documents in the file order, a path is closed once it is exhausted or closed.
+
+    ### Raises:
+    - `ValueError` - If `processes` is negative or `chunk_size` is smaller than 1.
+    """
+    return _iter_json_lines(source, codec, processes, chunk_size)
+
+async def iter_json_stream(source: str | os.PathLike | IO, chunk_size: int = 64 * 1024, max_buffer: int = 64 * 1024 ** 2) -> Iterator[Any]:
+    """
+    Lazily parses concatenated JSON documents (`{"a": 1}{"a": 2}`, any whitespace between them) with `JSONStreamDecoder`.
+
+    ### Parameters:
+    - `source` - Path to the file, or a file object opened in binary or text mode.
+    - `chunk_size` - Size of chunks read from the file.
+    - `max_buffer` - Maximum length of one document in characters.
+
+    ### Returns:
+    - Sync generator of parsed documents, a path is closed once it is exhausted or closed.
+    """
+    return _iter_json_stream(source, chunk_size, max_buffer)
+
+async def write_json_lines(target: str | os.PathLike | IO, records: Iterable[Any], codec: str | None = None, default: Callable[[Any], Any] | None = json_default, batch_size: int = 1_000, mode: Literal["w", "a"] = "w") -> int:
+    """
+    Writes documents as JSON Lines (NDJSON), encoded lines are joined and written in batches.
+
+    ### Parameters:
+    - `target` - Path to the file, or a file object opened in binary or text mode.
+    - `records` - Documents to write, generators included.
+    - `codec` - Name of JSON backend, see `get_json_codec` (default is the standard library `json`).
+    - `default` - Sync function called on objects the backend can't serialize (default is `json_default`).
+    - `batch_size` - Number of lines written at once.
+    - `mode` - `"w"` overwrites, `"a"` appends to the file. (paths only)
+
+    ### Returns:
+    - Number of written lines.
+    """
+    return _write_json_lines(target, records, codec, default, batch_size, mode)
 
 async def get_value(dictionary: dict[Hashable, Any], key: Any) -> Any | None:  
     """
@@ -169,7 +392,7 @@ async def get_key(dictionary: dict[Hashable, Any], value: Any) -> Any | None:
     Gets key of specified value.
     
     ## ! WARNING !
-    This will find the first value in the dictionary. 
+    This will find the first value in the dictionary. Scans the dictionary once, use `BidirectionalDict` for O(1) lookups.
     
     ### Parameters:
     - `dictionary` - The dictionary to search.
@@ -178,20 +401,7 @@ async def get_key(dictionary: dict[Hashable, Any], value: Any) -> Any | None:
     ### Returns:
     - Key of the value or `None` if value does not exist in dictionary.  
     """
-    # iter on dict only returns keys, so no point in optimizing that
-    values = tuple(dictionary.values())
-
-    try:
-        index: int = values.index(value)
-        key_iterator: Iterator[Hashable] = iter(dictionary)
-
-        # moves until index -1
-        for _ in range(index):
-            next(key_iterator)
-        else:
-            return next(key_iterator)
-    except:
-        return None
+    return _get_key(dictionary, value)
 
 async def isEmpty(dictionary: dict[Hashable, Any]) -> bool:
     """
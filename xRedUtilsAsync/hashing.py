@@ -3,12 +3,15 @@ This module provides async functions for working with dictionaries and JSON data
 
 ### Constants:
 - `AVAILABLE_ALGORITHMS` - `Set` containing all supported hashing algorithms.
+- `NON_CRYPTOGRAPHIC_ALGORITHMS` - `Set` of fast, non-cryptographic checksums (`crc32` and `xxhash` ones if installed).
 - `_LIT_ALGO` - `typing.Literal` of AVAILABLE_ALGORITHMS (for typehinting only)
 
 ### Functions:
 - `random_hash` - Generates a random hash.
 - `create_hash` - Hashes specified data with or without salt.
 - `file_hash` - Calculates file hash.
+- `digest` - Hashes raw data as is, without salt or decoding.
+- `get_hasher` - Returns the fastest `bytes` -> digest function of an algorithm.
 
 ### Usage:
 ```py
@@ -21,16 +24,18 @@ from xRedUtilsAsync import hashing
 
 import sys, hashlib, io
 sys.dont_write_bytecode = True
-from .annotations import Literal
+from .annotations import Literal, Callable, BINARY
 from .generators import generate_string
+from xRedUtils.hashing import NON_CRYPTOGRAPHIC_ALGORITHMS, get_hasher as _get_hasher
 
 __all__: tuple[str, ...] = (
-    "AVAILABLE_ALGORITHMS"
-    "random_hash", "create_hash", "file_hash"
+    "AVAILABLE_ALGORITHMS", "NON_CRYPTOGRAPHIC_ALGORITHMS",
+    "random_hash", "create_hash", "file_hash", "digest", "get_hasher"
 )
 
 AVAILABLE_ALGORITHMS: set[str] = hashlib.algorithms_guaranteed
 _LIT_ALGO = Literal['blake2b', 'md5', 'sha1', 'sha3_384', 'sha512', 'sha3_256', 'shake_128', 'sha224', 'blake2s', 'sha256', 'shake_256', 'sha3_224', 'sha384', 'sha3_512']
+_LIT_FAST = Literal['crc32', 'xxh32', 'xxh64', 'xxh3_64', 'xxh3_128']
 
 
 async def random_hash(algorithm: _LIT_ALGO, length: int = 16, _enc: str = "utf-8") -> bytes:
@@ -88,3 +93,36 @@ async def file_hash(algorithm: _LIT_ALGO, file_path_or_io: str | io.BufferedRead
             return hashlib.file_digest(f, algorithm).digest()
     
     return hashlib.file_digest(file_path_or_io, algorithm).digest()
+
+async def digest(algorithm: _LIT_ALGO | _LIT_FAST, data: str | BINARY, _enc: str = "utf-8") -> bytes:
+    """
+    Hashes raw data as is, without salt or decoding. Made for keys, checksums and fingerprints.
+    
+    ### Parameters:
+    - `algorithm` - Hashing algorithm, non-cryptographic ones included.
+    - `data` - Data that will be hashed, `str` is encoded with `_enc`.
+    - `_enc` - Encoding used for encoding string.
+
+    ### Returns:
+    - `Bytes` presentation of hash. (use `.hex()` to convert it to hexstring)
+    """
+    if isinstance(data, str):
+        data = data.encode(_enc)
+
+    return _get_hasher(algorithm)(data)
+
+async def get_hasher(algorithm: _LIT_ALGO | _LIT_FAST) -> Callable[[bytes], bytes]:
+    """
+    Returns the fastest `bytes` -> digest function of an algorithm, made for hashing many small items (filters, sketches).
+    The returned function is sync.
+    
+    ### Parameters:
+    - `algorithm` - Hashing algorithm, any of `AVAILABLE_ALGORITHMS` or `NON_CRYPTOGRAPHIC_ALGORITHMS`.
+
+    ### Returns:
+    - Function returning digest `bytes` of its argument. (`shake_*` digests are 32/64 bytes long)
+
+    ### Raises:
+    - `ValueError` - If the algorithm is not supported.
+    """
+    return _get_hasher(algorithm)
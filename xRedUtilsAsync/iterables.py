@@ -1,14 +1,32 @@
 """
 This module provides async functions for manipulating with iterables.
 
+Numeric `numpy.ndarray` and `array.array` inputs are vectorized with numpy, if it is installed.
+
 ### Functions:
+- `iflatten` - Lazily flattens nested iterables, without recursion.
 - `flatten_iterable` - Flattens a iterable into a single level list.
 - `remove_items` - Removes all occurrences of a specified item from the iterable.
 - `remove_type` - Removes all items of a specified type from the iterable.
 - `compare_iterables` - Compare two iterables and return a list of items that are present in both iterables.
 - `count_occurrences` - Count the number of times a specific item occurs in an iterable.
+- `multi_count` - Counts occurrences of every item in one pass.
+- `intersection` - Unique items present in every iterable, order preserved.
+- `difference` - Unique items of the first iterable not present in the others, order preserved.
+- `symmetric_difference` - Unique items present in an odd number of iterables, order preserved.
 - `get_attr_data` - Retrieves attribute data from each object in the iterable. If no attribute was found, ignores the `item`.
+- `iremove_items` - Lazy `remove_items`, constant memory.
+- `iremove_type` - Lazy `remove_type`, constant memory.
+- `iget_attr_data` - Lazy `get_attr_data`, constant memory.
+- `sliding_window` - Lazily yields overlapping windows of the last `n` items.
+- `tumbling_window` - Lazily yields non overlapping windows of `n` items.
+- `session_window` - Lazily groups items into sessions separated by a time gap.
+- `external_sort` - Lazily sorts an iterable larger than memory, spilling sorted runs to disk.
+- `unique` - Lazily removes duplicates from an iterable larger than memory, spilling sorted runs to disk.
 - `chunker` - Slice iterable into chunks of specified size.
+- `parallel_map` - Lazily maps a (coroutine) function over an iterable, with a concurrency limit.
+- `parallel_filter` - Lazily filters an iterable with a (coroutine) function, with a concurrency limit.
+- `parallel_reduce` - Reduces chunks of an iterable in threads, with a concurrency limit.
 - `to_iterable` - Converts data into a list.
 
 ### Usage:
@@ -20,16 +38,52 @@ from xRedUtilsAsync import iterables
 ```
 """
 
-import sys, itertools
+import sys, itertools, functools, inspect, asyncio, contextlib
 sys.dont_write_bytecode = True
-from .annotations import Any, ITERABLE
+from collections import Counter
+from .annotations import Any, Literal, Awaitable, AsyncIterable, AsyncIterator, Callable, Hashable, Iterable, Iterator, UnionType, ITERABLE, BINARY
 from .errors import VersionMismatchError
+from xRedUtils.iterables import (
+    iflatten as _iflatten, get_attr_data as _get_attr_data, iget_attr_data as _iget_attr_data, sliding_window as _sliding_window, tumbling_window as _tumbling_window, session_window as _session_window,
+    remove_items as _remove_items, remove_type as _remove_type, compare_iterables as _compare_iterables, count_occurrences as _count_occurrences,
+    intersection as _intersection, difference as _difference, symmetric_difference as _symmetric_difference, external_sort as _external_sort, unique as _unique
+)
 
 __all__: tuple[str, ...] = (
-    "flatten_iterable", "remove_items", "remove_type", "compare_iterables", "count_occurrences", "get_attr_data", "chunker", "to_iterable"
+    "iflatten", "flatten_iterable", "remove_items", "remove_type", "compare_iterables", "count_occurrences", "multi_count",
+    "intersection", "difference", "symmetric_difference", "get_attr_data", "chunker", "to_iterable",
+    "iremove_items", "iremove_type", "iget_attr_data", "sliding_window", "tumbling_window", "session_window",
+    "external_sort", "unique",
+    "parallel_map", "parallel_filter", "parallel_reduce"
 )
 
-async def flatten_iterable(iterable: ITERABLE) -> list[Any]:
+# sentinel for optional arguments, `None` is a valid value
+_MISSING: Any = object()
+
+async def iflatten(iterable: Iterable[Any], max_depth: int | None = None, exclude: type | tuple[type, ...] = (str, BINARY, dict), types: type | UnionType | tuple[type, ...] = Iterable) -> Iterator[Any]:
+    """
+    Lazily flattens nested iterables, without recursion and without copying sub-lists.
+
+    Aka. this:
+    ```python
+    >>> list(await iflatten([1, [2, 3], [[4, 5], 6]]))
+    [1, 2, 3, 4, 5, 6]
+    >>> list(await iflatten([1, [2, [3, [4]]]], max_depth=1))
+    [1, 2, [3, [4]]]
+    ```
+
+    ### Parameters:
+    - `iterable` - Any iterable, generators included.
+    - `max_depth` - How many levels are flattened, `None` for all of them.
+    - `exclude` - Types that are never flattened, `str`, `bytes` and `dict` by default.
+    - `types` - Types that are flattened (unless excluded), any iterable by default.
+
+    ### Returns:
+    - Generator of elements in depth first order.
+    """
+    return _iflatten(iterable, max_depth, exclude, types)
+
+async def flatten_iterable(iterable: ITERABLE, max_depth: int | None = None) -> list[Any]:
     """
     Flattens a iterable into a single level list.
 
@@ -41,6 +95,7 @@ async def flatten_iterable(iterable: ITERABLE) -> list[Any]:
 
     ### Parameters:
     - `iterable` - Any iterable (`list`, `tuple`, `set`...)
+    - `max_depth` - How many levels are flattened, `None` for all of them.
 
     ### Returns:
     - A `list` containing all the elements of the iterable in one level.
@@ -49,15 +104,7 @@ async def flatten_iterable(iterable: ITERABLE) -> list[Any]:
     if not isinstance(iterable, ITERABLE):
         return iterable
 
-    new: list[Any] = list()
-
-    for element in iterable:
-        if isinstance(element, ITERABLE):
-            elements: list[Any] = await flatten_iterable(element)
-            new.extend(elements)
-        else:
-            new.append(element)
-    return new
+    return list(_iflatten(iterable, max_depth, exclude=(), types=ITERABLE))
 
 async def remove_items(iterable: ITERABLE, item: Any) -> list[Any]:
     """
@@ -68,9 +115,9 @@ async def remove_items(iterable: ITERABLE, item: Any) -> list[Any]:
     - `item` - The item to remove from the iterable.
     
     ### Returns:
-    -  A new `list` with the specified item removed.
+    -  A new `list` with the specified item removed. (vectorized for numeric arrays if numpy is installed)
     """
-    return [element for element in iterable if element != item]
+    return _remove_items(iterable, item)
 
 async def remove_type(iterable: ITERABLE, obj: type) -> list[Any]:
     """
@@ -83,20 +130,21 @@ async def remove_type(iterable: ITERABLE, obj: type) -> list[Any]:
     ### Returns:
     - A new `list` with items of the specified type removed.
     """
-    return [element for element in iterable if not isinstance(element, obj)]
+    return _remove_type(iterable, obj)
 
 async def compare_iterables(iterable1: ITERABLE, iterable2: ITERABLE) -> list[Any]:
     """
     Compare two iterables and return a list of items that are present in both iterables.
+    Hashed lookups, unhashable items fall back to `==` comparison, a string as `iterable2` is searched for substrings.
     
     ### Parameters:
     - `iterable1` - The first iterable to compare.
     - `iterable2` - The second iterable to compare.
     
     ### Returns:
-    -  A `list` of items present in both iterables.
+    -  A `list` of items present in both iterables. (vectorized for numeric arrays if numpy is installed)
     """
-    return [item for item in iterable1 if item in iterable2]
+    return _compare_iterables(iterable1, iterable2)
 
 async def count_occurrences(iterable: ITERABLE, item: Any) -> int:
     """
@@ -107,9 +155,65 @@ async def count_occurrences(iterable: ITERABLE, item: Any) -> int:
     - `item` - The item to count occurrences of within the iterable.
 
     ### Returns:
-    - The number of times the item occurs in the iterable.
+    - The number of times the item occurs in the iterable. (items equal to `item` by `==`, `nan` is never counted)
     """
-    return len([element for element in iterable if element == item])
+    return _count_occurrences(iterable, item)
+
+async def multi_count(iterable: ITERABLE, key: Callable[[Any], Hashable] | None = None) -> Counter[Any]:
+    """
+    Counts occurrences of every item in one pass.
+
+    ### Parameters:
+    - `iterable` - The `iterable` to count.
+    - `key` - Optional function returning what is counted for an item, needed for unhashable items.
+
+    ### Returns:
+    - `collections.Counter` of item (or key) ➜ occurrences, in first seen order.
+
+    ### Raises:
+    - `TypeError` - If an item (or key) is unhashable.
+    """
+    return Counter(iterable if key is None else map(key, iterable))
+
+async def intersection(iterable: ITERABLE, *others: ITERABLE) -> list[Any]:
+    """
+    Unique items of `iterable` that are present in every other iterable, in order of `iterable`.
+
+    ### Parameters:
+    - `iterable` - Iterable that gives the order.
+    - `*others` - Iterables to intersect with.
+
+    ### Returns:
+    - A `list` of unique items.
+    """
+    return _intersection(iterable, *others)
+
+async def difference(iterable: ITERABLE, *others: ITERABLE) -> list[Any]:
+    """
+    Unique items of `iterable` that are not present in any other iterable, in order of `iterable`.
+
+    ### Parameters:
+    - `iterable` - Iterable that gives the order.
+    - `*others` - Iterables which items are removed.
+
+    ### Returns:
+    - A `list` of unique items.
+    """
+    return _difference(iterable, *others)
+
+async def symmetric_difference(iterable: ITERABLE, *others: ITERABLE) -> list[Any]:
+    """
+    Unique items present in an odd number of iterables (`a ^ b ^ ...`), in first seen order.
+    For two iterables, items that are in exactly one of them.
+
+    ### Parameters:
+    - `iterable` - First iterable.
+    - `*others` - Other iterables.
+
+    ### Returns:
+    - A `list` of unique items.
+    """
+    return _symmetric_difference(iterable, *others)
 
 async def get_attr_data(iterable: ITERABLE, attr: str) -> list[Any]:
     """
@@ -117,12 +221,148 @@ async def get_attr_data(iterable: ITERABLE, attr: str) -> list[Any]:
 
     ### Parameters:
     - `iterable` - The `iterable` to search through.
-    - `attr` - Name of the attribute.
+    - `attr` - Name of the attribute, taken literally (dotted paths are only followed by `iget_attr_data`).
 
     ### Returns:
     - `Iterable` of returned attribute data.
     """
-    return [data if (data := getattr(item, attr, "_NO_ATTR")) != "_NO_ATTR" else item for item in iterable]
+    return _get_attr_data(iterable, attr)
+
+async def iremove_items(iterable: Iterable[Any], item: Any) -> Iterator[Any]:
+    """
+    Lazily removes all occurrences of a specified item, constant memory. Can be passed on to `chunker`.
+    
+    ### Parameters:
+    - `iterable` - Any iterable, generators included.
+    - `item` - The item to remove from the iterable.
+    
+    ### Returns:
+    - Generator of items that are not equal to `item`.
+    """
+    return (element for element in iterable if element != item)
+
+async def iremove_type(iterable: Iterable[Any], obj: type | tuple[type, ...]) -> Iterator[Any]:
+    """
+    Lazily removes all items of a specified type, constant memory. Can be passed on to `chunker`.
+    
+    ### Parameters:
+    - `iterable` - Any iterable, generators included.
+    - `obj` - The type (or tuple of types) of items to remove.
+    
+    ### Returns:
+    - Generator of items that are not instances of `obj`.
+    """
+    return (element for element in iterable if not isinstance(element, obj))
+
+async def iget_attr_data(iterable: Iterable[Any], attr: str) -> Iterator[Any]:
+    """
+    Lazily retrieves attribute data from each object, constant memory. If no attribute was found, yields the `item` itself.
+    Can be passed on to `chunker`.
+
+    ### Parameters:
+    - `iterable` - Any iterable, generators included.
+    - `attr` - Name of the attribute, dotted paths (`"user.name"`) are followed.
+
+    ### Returns:
+    - Generator of attribute data.
+    """
+    return _iget_attr_data(iterable, attr)
+
+async def sliding_window(iterable: Iterable[Any], n: int, step: int = 1, typecode: str | None = None) -> Iterator[tuple[Any, ...] | memoryview]:
+    """
+    Lazily yields windows of the last `n` items, every `step` items. Works on infinite generators.
+
+    ### Parameters:
+    - `iterable` - Any iterable, generators included.
+    - `n` - Window size.
+    - `step` - Items between windows, `step > n` skips items.
+    - `typecode` - `array.array` typecode (`"d"`, `"q"`...) for numeric items, windows are then zero-copy `memoryview` slices.
+
+    ### Returns:
+    - Generator of `tuple` windows, or `memoryview` windows that are valid until the next one is requested (copy them to keep).
+
+    ### Raises:
+    - `ValueError` - If `n` or `step` is smaller than 1.
+    """
+    if n < 1 or step < 1:
+        raise ValueError("`n` and `step` must be at least 1.")
+    
+    return _sliding_window(iterable, n, step, typecode)
+
+async def tumbling_window(iterable: Iterable[Any], n: int, typecode: str | None = None) -> Iterator[tuple[Any, ...] | memoryview]:
+    """
+    Lazily yields consecutive, non overlapping windows of `n` items, the last one can be shorter. Works on infinite generators.
+
+    ### Parameters:
+    - `iterable` - Any iterable, generators included.
+    - `n` - Window size.
+    - `typecode` - `array.array` typecode (`"d"`, `"q"`...) for numeric items, windows are then zero-copy `memoryview` slices.
+
+    ### Returns:
+    - Generator of `tuple` windows, or `memoryview` windows that are valid until the next one is requested (copy them to keep).
+
+    ### Raises:
+    - `ValueError` - If `n` is smaller than 1.
+    """
+    if n < 1:
+        raise ValueError("`n` must be at least 1.")
+    
+    return _tumbling_window(iterable, n, typecode)
+
+async def session_window(iterable: Iterable[Any], key: Callable[[Any], Any], gap: Any) -> Iterator[list[Any]]:
+    """
+    Lazily groups consecutive items into sessions, a new session starts when `key` of an item is more than `gap` after the previous one.
+    Works on infinite generators, a session is yielded once the next one starts.
+
+    ### Parameters:
+    - `iterable` - Any iterable of items ordered by `key`.
+    - `key` - Function returning the time of an item (`float`, `datetime`...).
+    - `gap` - Max difference of two consecutive keys in one session (`float`, `timedelta`...).
+
+    ### Returns:
+    - Generator of sessions (`list` of items).
+    """
+    return _session_window(iterable, key, gap)
+
+async def external_sort(iterable: Iterable[Any], key: Callable[[Any], Any] | None = None, max_memory: int = 64 * 1024 ** 2, codec: Literal["pickle", "marshal"] = "pickle", temp_dir: str | None = None) -> Iterator[Any]:
+    """
+    Lazily sorts an iterable larger than memory. Sorted runs of about `max_memory` bytes are spilled to temporary files and k-way merged.
+    Sorting is stable, data that fits into `max_memory` never touches the disk.
+
+    ### Parameters:
+    - `iterable` - Any iterable, generators included.
+    - `key` - Same as `sorted` key.
+    - `max_memory` - Approximate memory of one run in bytes (shallow `sys.getsizeof` of items).
+    - `codec` - Run encoding, `"pickle"` for any picklable item, `"marshal"` is more compact and faster, but builtin types only.
+    - `temp_dir` - Directory for run files, system temp directory by default.
+
+    ### Returns:
+    - Generator of sorted items, run files are removed once it is exhausted or closed.
+
+    ### Raises:
+    - `ValueError` - If `max_memory` is smaller than 1 or `codec` is unknown.
+    """
+    return _external_sort(iterable, key, max_memory, codec, temp_dir)
+
+async def unique(iterable: Iterable[Any], key: Callable[[Any], Hashable] | None = None, max_memory: int = 64 * 1024 ** 2, codec: Literal["pickle", "marshal"] = "pickle", temp_dir: str | None = None) -> Iterator[Any]:
+    """
+    Lazily removes duplicates from an iterable larger than memory, the first occurrence is kept. Items are yielded sorted by `key`.
+    Runs are deduplicated in memory before they are spilled, so data with many duplicates rarely touches the disk.
+
+    ### Parameters:
+    - `iterable` - Any iterable, generators included.
+    - `key` - Function returning a hashable, comparable key of an item. Items themselves by default.
+    - `max_memory` - Approximate memory of one run in bytes (shallow `sys.getsizeof` of unique items).
+    - `codec` - Run encoding, `"pickle"` for any picklable item, `"marshal"` is more compact and faster, but builtin types only.
+    - `temp_dir` - Directory for run files, system temp directory by default.
+
+    ### Returns:
+    - Generator of unique items sorted by `key`, run files are removed once it is exhausted or closed.
+
+    ### Raises:
+    - `ValueError` - If `max_memory` is smaller than 1 or `codec` is unknown.
+    """
+    return _unique(iterable, key, max_memory, codec, temp_dir)
 
 async def chunker(iterable: ITERABLE, chunk_size: int, strict: bool = False) -> itertools.batched:
     """
@@ -158,3 +398,114 @@ async def to_iterable(data: Any, slice: bool = False) -> list[Any]:
         return list(data)
 
     return [data]
+
+async def _parallel(func: Callable[[Any], Any], iterable: Iterable[Any] | AsyncIterable[Any], concurrency: int, ordered: bool, max_in_flight: int | None) -> AsyncIterator[tuple[Any, Any]]:
+    """Yields `(item, result)`, while at most `max_in_flight` tasks are created and not yet consumed."""
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+    call: Callable[[Any], Awaitable[Any]] = func if inspect.iscoroutinefunction(func) else functools.partial(asyncio.to_thread, func)
+    limit: int = max_in_flight or 2 * concurrency
+
+    async def run(item: Any) -> tuple[Any, Any]:
+        async with semaphore:
+            return item, await call(item)
+
+    async def items() -> AsyncIterator[Any]:
+        if isinstance(iterable, AsyncIterable):
+            async for item in iterable:
+                yield item
+        else:
+            for item in iterable:
+                yield item
+
+    source: AsyncIterator[Any] = items()
+    # insertion ordered, so the first task is the oldest
+    pending: dict[asyncio.Task, None] = {}
+
+    try:
+        exhausted: bool = False
+        while True:
+            while not exhausted and len(pending) < limit:
+                try:
+                    pending[asyncio.ensure_future(run(await anext(source)))] = None
+                except StopAsyncIteration:
+                    exhausted = True
+            
+            if not pending:
+                return
+
+            if ordered:
+                task: asyncio.Task = next(iter(pending))
+                del pending[task]
+                yield await task
+            else:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    del pending[task]
+                    yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        
+        await asyncio.gather(*pending, return_exceptions=True)
+        await source.aclose()
+
+async def parallel_map(func: Callable[[Any], Any], iterable: Iterable[Any] | AsyncIterable[Any], concurrency: int = 16, ordered: bool = True, max_in_flight: int | None = None) -> AsyncIterator[Any]:
+    """
+    Lazily maps `func` over `iterable` with at most `concurrency` calls running at once.
+
+    ### Parameters:
+    - `func` - Coroutine function, or a regular function (runs in threads with `asyncio.to_thread`).
+    - `iterable` - Any iterable or async iterable, read lazily, can be infinite.
+    - `concurrency` - Max number of running calls (semaphore).
+    - `ordered` - Results in input order, or in completion order (`False`).
+    - `max_in_flight` - Max created tasks not consumed yet, bounds memory. Defaults to `2 * concurrency`.
+
+    ### Returns:
+    - Async generator of results (`async for`). Closing it early cancels pending tasks.
+
+    ### Raises:
+    - Any exception raised by `func`, when its result is reached.
+    """
+    # `aclosing`, so closing this generator cancels tasks right away, not when garbage collected
+    async with contextlib.aclosing(_parallel(func, iterable, concurrency, ordered, max_in_flight)) as results:
+        async for _, result in results:
+            yield result
+
+async def parallel_filter(func: Callable[[Any], Any], iterable: Iterable[Any] | AsyncIterable[Any], concurrency: int = 16, ordered: bool = True, max_in_flight: int | None = None) -> AsyncIterator[Any]:
+    """
+    Lazily keeps items of `iterable` for which `func` is truthy, with at most `concurrency` calls running at once.
+    Parameters are the same as `parallel_map`.
+
+    ### Returns:
+    - Async generator of kept items (`async for`).
+    """
+    async with contextlib.aclosing(_parallel(func, iterable, concurrency, ordered, max_in_flight)) as results:
+        async for item, result in results:
+            if result:
+                yield item
+
+async def parallel_reduce(func: Callable[[Any, Any], Any], iterable: ITERABLE, initial: Any = _MISSING, chunk_size: int = 10_000, concurrency: int = 4) -> Any:
+    """
+    Reduces `chunker` chunks in threads, at most `concurrency` at once, then reduces chunk results in order.
+    `func` must be associative (`a + b`, `max`, merging dicts...), like for any parallel reduce.
+
+    ### Parameters:
+    - `func` - Regular function of two arguments.
+    - `iterable` - Any iterable, read lazily.
+    - `initial` - Optional value placed before all items, used once.
+    - `chunk_size` - Items per chunk.
+    - `concurrency` - Max number of chunks reduced at once.
+
+    ### Returns:
+    - Reduced value.
+
+    ### Raises:
+    - `TypeError` - If `iterable` is empty and `initial` was not given.
+    """
+    partials: list[Any] = [
+        partial async for partial in parallel_map(functools.partial(functools.reduce, func), await chunker(iterable, chunk_size), concurrency)
+    ]
+
+    if initial is _MISSING:
+        return functools.reduce(func, partials)
+    return functools.reduce(func, partials, initial)
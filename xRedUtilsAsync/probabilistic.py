@@ -0,0 +1,25 @@
+"""
+This module provides probabilistic structures, approximate versions of `set` membership and distinct counting
+for streams too big for exact sets. Memory stays fixed no matter how many items are added.
+## NOTE: Methods are not async, they never wait on I/O.
+
+### Objects:
+- `BloomFilter` - `bytearray` backed Bloom filter, membership with false positives but no false negatives.
+- `HyperLogLog` - Distinct counter, about `1.04 / sqrt(2 ** precision)` relative error.
+
+### Usage:
+```py
+
+import xRedUtilsAsync.probabilistic as probabilistic
+or
+from xRedUtilsAsync import probabilistic
+```
+"""
+
+import sys
+sys.dont_write_bytecode = True
+from xRedUtils.probabilistic import BloomFilter, HyperLogLog
+
+__all__: tuple[str, ...] = (
+    "BloomFilter", "HyperLogLog"
+)
@@ -20,12 +20,13 @@ def load_modules() -> list:
         errors as test_errors,
         generators as test_generators,
         hashing as test_hashing,
+        probabilistic as test_probabilistic,
         type_converters as test_tconverters
     )
 
     return [
         test_dicts, test_iterables, test_dates, test_maths, test_strings, test_funcs, test_paths,
-        test_general, test_objects, test_errors, test_generators, test_hashing, test_tconverters
+        test_general, test_objects, test_errors, test_generators, test_hashing, test_probabilistic, test_tconverters
     ]
 
 async def main_test() -> None:
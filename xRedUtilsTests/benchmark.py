@@ -0,0 +1,54 @@
+"""
+Main benchmarking module
+
+### Usage:
+```sh
+python -m xRedUtilsTests.benchmark           # every benchmark
+python -m xRedUtilsTests.benchmark cache     # only selected modules
+```
+"""
+
+import sys, timeit
+sys.dont_write_bytecode = True
+from xRedUtils.annotations import Callable
+
+def load_modules() -> dict[str, object]:
+    from .benchmarks import (
+        cache as bench_cache,
+        dicts as bench_dicts,
+        iterables as bench_iterables,
+        probabilistic as bench_probabilistic
+    )
+
+    return {
+        "cache": bench_cache,
+        "dicts": bench_dicts,
+        "iterables": bench_iterables,
+        "probabilistic": bench_probabilistic
+    }
+
+def main_benchmark(*names: str) -> None:
+    for name, module in load_modules().items():
+        if names and name not in names:
+            continue
+
+        if (bench := getattr(module, "bench", None)):
+            print(f"== {name} ==")
+            bench()
+    else:
+        print("All benchmarks complete.")
+
+def measure(func: Callable[[], object], number: int = 1, repeat: int = 5) -> float:
+    """Best time of `repeat` runs, each calling `func` `number` times."""
+    return min(timeit.repeat(func, number=number, repeat=repeat))
+
+def report(title: str, results: dict[str, float], unit: str = "s") -> None:
+    """Prints results, relative to the first entry (the baseline)."""
+    print(f"{title}:")
+    baseline: float = next(iter(results.values()), 0) or 1
+
+    for name, value in results.items():
+        print(f"  {name:<32} {value:>12.4f} {unit}  ({baseline / value if value else 0:.2f}x)")
+
+if __name__ == "__main__":
+    main_benchmark(*sys.argv[1:])
@@ -0,0 +1,233 @@
+import sys, random, threading, time, functools, multiprocessing, tracemalloc
+sys.dont_write_bytecode = True
+from collections import OrderedDict
+
+import xRedUtils.cache as sync_cache
+from xRedUtilsTests.benchmark import measure, report
+
+
+class _OrderedDictLRU(OrderedDict):
+    """`LRUCache` as it was before the linked list engine, kept as a baseline."""
+    def __init__(self, max_capacity: int) -> None:
+        super().__init__()
+        self._max_capacity: int = max_capacity
+
+    def get(self, key, default=None):
+        if key in self:
+            self.move_to_end(key, last=True)
+            return super().get(key)
+        return default
+
+    def put(self, key, value) -> None:
+        if key in self:
+            self.move_to_end(key, last=True)
+
+        super().__setitem__(key, value)
+
+        if len(self) > self._max_capacity:
+            self.popitem(last=False)
+
+
+def bench_lru(lookups: int = 200_000, key_space: int = 2_000, capacity: int = 1_000) -> None:
+    keys: list[int] = [random.randint(0, key_space) for _ in range(lookups)]
+
+    def run(cache) -> None:
+        get, put = cache.get, cache.put
+        for key in keys:
+            if get(key) is None:
+                put(key, key)
+
+    report(f"LRU get/put, {lookups} lookups over {key_space} keys, capacity {capacity}", {
+        "OrderedDict LRU (baseline)": measure(lambda: run(_OrderedDictLRU(capacity))),
+        "LRUCache": measure(lambda: run(sync_cache.LRUCache(capacity)))
+    })
+
+class _GlobalLockLRU:
+    """`BetterLRU` behind one global lock, the naive thread-safe baseline."""
+    def __init__(self, max_capacity: int) -> None:
+        self._cache = sync_cache.BetterLRU(max_capacity)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._cache.get(key, default)
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._cache.put(key, value)
+
+
+def bench_contention(operations: int = 200_000, key_space: int = 20_000, capacity: int = 10_000) -> None:
+    keys: list[int] = [random.randint(0, key_space) for _ in range(operations)]
+
+    def throughput(cache, thread_count: int) -> float:
+        chunk: int = operations // thread_count
+
+        def worker(part: list[int]) -> None:
+            get, put = cache.get, cache.put
+            for key in part:
+                if get(key) is None:
+                    put(key, key)
+
+        threads = [threading.Thread(target=worker, args=(keys[i * chunk:(i + 1) * chunk],)) for i in range(thread_count)]
+        start: float = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return chunk * thread_count / (time.perf_counter() - start)
+
+    for thread_count in (1, 4, 16, 64):
+        global_lock: float = max(throughput(_GlobalLockLRU(capacity), thread_count) for _ in range(3))
+        striped: float = max(throughput(sync_cache.ConcurrentLRU(capacity), thread_count) for _ in range(3))
+        
+        print(f"  {thread_count:>2} threads: global lock {global_lock:>12,.0f} ops/s | ConcurrentLRU {striped:>12,.0f} ops/s ({striped / global_lock:.2f}x)")
+
+def bench_ttl_sweep(expired: int = 1_000, sizes: tuple[int, ...] = (10_000, 100_000, 1_000_000)) -> None:
+    print(f"TTL sweep of {expired} expired items:")
+
+    for size in sizes:
+        clock: list[float] = [0.0]
+        cache = sync_cache.TTLCache(size + expired, timer=lambda: clock[0])
+        
+        for key in range(size):
+            cache.put(key, key, ttl=1, unit="day")
+
+        def sweep() -> float:
+            for key in range(-expired, 0):
+                cache.put(key, key, ttl=1)
+            clock[0] += 5
+
+            start: float = time.perf_counter()
+            cache.expire()
+            return time.perf_counter() - start
+
+        def scan() -> None:
+            # what a sweep without the timer wheel costs, a check of every item
+            now: float = clock[0]
+            [link for link in cache._map.values() if link[4] <= now]
+
+        print(f"  {size:>9,} live items: timer wheel {min(sweep() for _ in range(3)):.4f} s | full scan {measure(scan, repeat=3):.4f} s")
+
+def bench_memoize(calls: int = 200_000, key_space: int = 1_000) -> None:
+    keys: list[int] = [random.randint(0, key_space) for _ in range(calls)]
+
+    def by_hand():
+        # what a hand written wrapper with tuple keys looks like
+        cache: sync_cache.BetterLRU = sync_cache.BetterLRU(key_space * 2)
+        def wrapper(*args):
+            key = tuple(args)
+            if (value := cache.get(key)) is None:
+                value = abs(*args)
+                cache.put(key, value)
+            return value
+        return wrapper
+
+    def run(func) -> None:
+        for key in keys:
+            func(key)
+
+    report(f"Memoized calls, {calls} calls over {key_space} keys", {
+        "hand written, not thread-safe": measure(lambda: run(by_hand())),
+        "memoize (thread-safe)": measure(lambda: run(sync_cache.memoize(maxsize=key_space * 2)(abs))),
+        "functools.lru_cache (C, no locks)": measure(lambda: run(functools.lru_cache(maxsize=key_space * 2)(abs)))
+    })
+
+def zipf_trace(length: int, key_space: int, s: float = 1.0) -> list[int]:
+    weights: list[float] = [1 / (rank ** s) for rank in range(1, key_space + 1)]
+    return random.choices(range(key_space), weights=weights, k=length)
+
+def scan_mixed_trace(length: int, key_space: int, scan_every: int, scan_length: int) -> list[int]:
+    # zipf traffic, interrupted by scans over keys that are never used again
+    trace: list[int] = zipf_trace(length, key_space)
+    mixed: list[int] = []
+    scanned: int = key_space
+
+    for start in range(0, length, scan_every):
+        mixed.extend(trace[start:start + scan_every])
+        mixed.extend(range(scanned, scanned + scan_length))
+        scanned += scan_length
+    return mixed
+
+def hit_ratio(cache, trace: list[int]) -> float:
+    get, put = cache.get, cache.put
+    hits: int = 0
+
+    for key in trace:
+        if get(key) is None:
+            put(key, key)
+        else:
+            hits += 1
+    return hits / len(trace)
+
+def bench_hit_ratio(capacity: int = 1_000, key_space: int = 50_000, length: int = 200_000) -> None:
+    traces: dict[str, list[int]] = {
+        "zipf": zipf_trace(length, key_space),
+        "zipf + scans": scan_mixed_trace(length, key_space, scan_every=10_000, scan_length=5_000)
+    }
+
+    print(f"Hit ratio, capacity {capacity}, {key_space} keys:")
+    for name, trace in traces.items():
+        ratios: list[str] = [
+            f"{policy.__name__} {hit_ratio(policy(capacity), trace):.2%}"
+            for policy in (sync_cache.LRUCache, sync_cache.TinyLFUCache, sync_cache.ARCCache, sync_cache.TwoQueueCache)
+        ]
+        print(f"  {name:<14} {' | '.join(ratios)}")
+
+def _worker(cache, capacity: int, trace: list[int], value: bytes, results) -> None:
+    # own `LRUCache` per process if no shared cache is passed, memory is traced for those
+    tracemalloc.start()
+    if cache is None:
+        cache = sync_cache.LRUCache(capacity)
+
+    get, put = cache.get, cache.put
+    hits: int = 0
+    for key in trace:
+        if get(key) is None:
+            put(key, value)
+        else:
+            hits += 1
+
+    results.put((hits, tracemalloc.get_traced_memory()[0]))
+
+def bench_shared_memory(processes: int = 16, capacity: int = 10_000, key_space: int = 100_000, length: int = 50_000, value_size: int = 100) -> None:
+    context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+    value: bytes = b"x" * value_size
+
+    def run(make_cache, cache_capacity: int) -> tuple[float, int]:
+        results = context.Queue()
+        cache = make_cache()
+        workers = [
+            context.Process(target=_worker, args=(cache, cache_capacity, zipf_trace(length, key_space), value, results))
+            for _ in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+
+        outcome: list[tuple[int, int]] = [results.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+
+        memory: int = sum(used for _, used in outcome)
+        if cache is not None:
+            memory = cache.nbytes
+            cache.close()
+        return sum(hits for hits, _ in outcome) / (processes * length), memory
+
+    print(f"Multi-process cache, {processes} processes, {length} zipf lookups each over {key_space} keys, {value_size} byte values:")
+    for name, make_cache, cache_capacity in (
+        (f"LRUCache({capacity}) per process", lambda: None, capacity),
+        (f"LRUCache({capacity // processes}) per process", lambda: None, capacity // processes),
+        (f"SharedMemoryCache({capacity})", lambda: sync_cache.SharedMemoryCache(capacity, slot_size=value_size + 32, context=context.get_start_method()), capacity)
+    ):
+        ratio, memory = run(make_cache, cache_capacity)
+        print(f"  {name:<32} hit ratio {ratio:>7.2%}  memory {memory / 2 ** 20:>8.2f} MiB")
+
+def bench() -> None:
+    bench_lru()
+    print(f"Thread contention, GIL {'enabled' if getattr(sys, '_is_gil_enabled', lambda: True)() else 'disabled'}:")
+    bench_contention()
+    bench_ttl_sweep()
+    bench_memoize()
+    bench_hit_ratio()
+    bench_shared_memory()
@@ -0,0 +1,245 @@
+import sys, copy, random, tracemalloc, json, datetime, os, tempfile, io
+sys.dont_write_bytecode = True
+
+import xRedUtils.dicts as sync_dicts
+from xRedUtils.annotations import Any
+from xRedUtilsTests.benchmark import measure, report
+
+
+def _recursive_flatten_dict(dictionary: dict[str, Any], _sep: str = "_", _parent_key: str = "") -> dict[str, Any]:
+    """`flatten_dict` as it was before `iter_flatten_dict`, kept as a baseline."""
+    items: dict[str, Any] = {}
+    
+    for k, v in dictionary.items():
+        new_key: str = f"{_parent_key}{_sep}{k}" if _parent_key else k
+        if isinstance(v, dict):
+            items.update(_recursive_flatten_dict(v, _sep=_sep, _parent_key=new_key).items())
+        else:
+            items[new_key] = v
+    return items
+
+def _document(records: int, depth: int) -> dict[str, Any]:
+    # JSON like document, `records` objects nested `depth` levels deep
+    document: dict[str, Any] = {}
+    
+    for record in range(records):
+        node: dict[str, Any] = {"id": record, "name": f"record-{record}", "score": record / 7}
+        for level in range(depth):
+            node = {f"level{level}": node, "flag": bool(level % 2)}
+        document[f"record{record}"] = node
+    return document
+
+def bench_flatten(records: int = 100_000) -> None:
+    for depth in (2, 8, 32):
+        document: dict[str, Any] = _document(records // depth, depth)
+        
+        report(f"Flatten {records // depth} records, {depth} levels deep", {
+            "recursive (baseline)": measure(lambda: _recursive_flatten_dict(document), repeat=3),
+            "flatten_dict": measure(lambda: sync_dicts.flatten_dict(document), repeat=3),
+            "iter_flatten_dict, consumed lazily": measure(lambda: sum(1 for _ in sync_dicts.iter_flatten_dict(document)), repeat=3)
+        })
+
+    flat: dict[str, Any] = sync_dicts.flatten_dict(_document(records // 8, 8))
+    report(f"Unflatten {len(flat)} keys", {
+        "unflatten_dict": measure(lambda: sync_dicts.unflatten_dict(flat), repeat=3)
+    })
+
+def _split_walk(dictionary: dict[str, Any], path: str, _sep: str = ".") -> Any:
+    """`dict_walk` as it was before `compile_path`, kept as a baseline."""
+    current: Any = dictionary
+    
+    for key in path.split(_sep):
+        if key in current:
+            current = current[key]
+        else:
+            raise MemoryError(f"Failed to reach value specified: `{key}` on `{path}`")
+    return current
+
+def bench_paths(calls: int = 200_000) -> None:
+    document: dict[str, Any] = {"tenant": {"routing": {"rules": {f"rule{index}": {"target": {"queue": f"q{index}"}} for index in range(300)}}}}
+    paths: list[str] = [f"tenant.routing.rules.rule{index}.target.queue" for index in range(300)]
+    accessors: list[sync_dicts.CompiledPath] = [sync_dicts.compile_path(path) for path in paths]
+    rounds: int = calls // len(paths)
+
+    report(f"{rounds * len(paths)} lookups of {len(paths)} paths", {
+        "split on every call (baseline)": measure(lambda: [_split_walk(document, path) for _ in range(rounds) for path in paths], repeat=3),
+        "dict_walk": measure(lambda: [sync_dicts.dict_walk(document, path) for _ in range(rounds) for path in paths], repeat=3),
+        "CompiledPath.get": measure(lambda: [accessor.get(document) for _ in range(rounds) for accessor in accessors], repeat=3),
+        "get_many": measure(lambda: [sync_dicts.get_many(document, accessors) for _ in range(rounds)], repeat=3)
+    })
+
+def _copying_get_key(dictionary: dict[str, Any], value: Any) -> Any:
+    """`get_key` as it was before the single pass scan, kept as a baseline."""
+    values = tuple(dictionary.values())
+
+    try:
+        index: int = values.index(value)
+        key_iterator = iter(dictionary)
+
+        for _ in range(index):
+            next(key_iterator)
+        else:
+            return next(key_iterator)
+    except:
+        return None
+
+def bench_get_key(size: int = 100_000, lookups: int = 20) -> None:
+    table: dict[str, str] = {f"key{index}": f"value{index}" for index in range(size)}
+    lookup: sync_dicts.BidirectionalDict[str, str] = sync_dicts.BidirectionalDict(table)
+    values: list[str] = [f"value{index * (size // lookups)}" for index in range(lookups)]
+
+    report(f"{lookups} get_key lookups, {size} items", {
+        "tuple copy + index (baseline)": measure(lambda: [_copying_get_key(table, value) for value in values], repeat=3),
+        "get_key": measure(lambda: [sync_dicts.get_key(table, value) for value in values], repeat=3),
+        "BidirectionalDict.get_key": measure(lambda: [lookup.get_key(value) for value in values], repeat=3)
+    })
+    report(f"Building a {size} item table", {
+        "dict (baseline)": measure(lambda: dict(table), repeat=3),
+        "BidirectionalDict": measure(lambda: sync_dicts.BidirectionalDict(table), repeat=3)
+    })
+
+def _copying_merge(*dictionaries: dict[str, Any]) -> dict[str, Any]:
+    """Deep merge by deep copying the base and updating it in place, kept as a baseline."""
+    merged: dict[str, Any] = copy.deepcopy(dictionaries[0])
+    
+    for overlay in dictionaries[1:]:
+        stack: list[tuple[dict[str, Any], dict[str, Any]]] = [(merged, overlay)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                if isinstance(value, dict) and isinstance(target.get(key), dict):
+                    stack.append((target[key], value))
+                else:
+                    target[key] = copy.deepcopy(value)
+    return merged
+
+def _allocated(func: Any) -> float:
+    """MiB allocated by `func` and still alive after it returned."""
+    tracemalloc.start()
+    result: Any = func()
+    allocated: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    del result
+    return allocated / 1024 ** 2
+
+def bench_merge(tenants: int = 2_000) -> None:
+    rng: random.Random = random.Random(0)
+    base: dict[str, Any] = {f"service{index}": {"limits": {"rps": 100, "burst": 10}, "hosts": [f"h{index}"], "flags": {"beta": False}} for index in range(200)}
+    overlays: list[list[dict[str, Any]]] = [
+        [{f"service{rng.randrange(200)}": {"limits": {"rps": rng.randrange(1_000)}}} for _ in range(rng.randrange(5, 11))]
+        for _ in range(tenants)
+    ]
+
+    report(f"Memory of merged configs, {tenants} tenants, 5-10 overlays each", {
+        "deepcopy + update (baseline)": _allocated(lambda: [_copying_merge(base, *layers) for layers in overlays]),
+        "deep_merge": _allocated(lambda: [sync_dicts.deep_merge(base, *layers) for layers in overlays]),
+        "MergedView": _allocated(lambda: [sync_dicts.MergedView(base, *layers) for layers in overlays])
+    }, "MiB")
+    report(f"Merging configs of {tenants} tenants", {
+        "deepcopy + update (baseline)": measure(lambda: [_copying_merge(base, *layers) for layers in overlays], repeat=1),
+        "deep_merge": measure(lambda: [sync_dicts.deep_merge(base, *layers) for layers in overlays], repeat=3),
+        "MergedView": measure(lambda: [sync_dicts.MergedView(base, *layers) for layers in overlays], repeat=3)
+    })
+
+def bench_json(records: int = 20_000) -> None:
+    rng: random.Random = random.Random(0)
+    payload: dict[str, Any] = {"events": [
+        {"id": index, "user": f"user-{rng.randrange(1_000)}", "score": rng.random(), "tags": ["a", "b", "c"][:rng.randrange(4)],
+         "at": datetime.datetime(2024, 1, 1, second=index % 60).isoformat(), "meta": {"ok": bool(index % 2), "retries": None}}
+        for index in range(records)
+    ]}
+    text: str = json.dumps(payload, indent=4)
+    compact: bytes = sync_dicts.dict_to_json(payload).encode()
+    codecs: list[str] = [name for name in ("json", "ujson", "msgspec", "orjson") if name in sync_dicts._JSON_CODECS]
+
+    report(f"Encoding {records} records", {
+        "json.dumps, indent=4 (baseline)": measure(lambda: json.dumps(payload, indent=4), repeat=3),
+        **{f"dict_to_json, {name}": measure(lambda name=name: sync_dicts.dict_to_json(payload, codec=name), repeat=3) for name in codecs}
+    })
+    report(f"Decoding {records} records", {
+        "json.loads, indented (baseline)": measure(lambda: json.loads(text), repeat=3),
+        **{f"json_to_dict of bytes, {name}": measure(lambda name=name: sync_dicts.json_to_dict(compact, codec=name), repeat=3) for name in codecs}
+    })
+    report(f"Size of {records} records", {
+        "indent=4 (baseline)": len(text.encode()) / 1024 ** 2,
+        "compact": len(compact) / 1024 ** 2
+    }, "MiB")
+
+def _read_whole_lines(path: str) -> list[Any]:
+    """`open_file` + one `json.loads` per line, kept as a baseline."""
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file.read().splitlines() if line]
+
+def _peak(func: Any) -> float:
+    """Peak MiB allocated while `func` runs."""
+    tracemalloc.start()
+    func()
+    peak: int = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024 ** 2
+
+def bench_json_lines(records: int = 200_000) -> None:
+    rng: random.Random = random.Random(0)
+    documents: list[dict[str, Any]] = [
+        {"ts": f"2024-01-01T00:00:{index % 60:02}", "level": rng.choice(("info", "warn", "error")), "msg": f"request {index} served", "latency": rng.random(), "labels": {"host": f"h{rng.randrange(50)}"}}
+        for index in range(records)
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, "log.jsonl")
+        
+        def write_lines() -> None:
+            with open(path, "w", encoding="utf-8") as file:
+                for document in documents:
+                    file.write(json.dumps(document) + "\n")
+
+        report(f"Writing {records} JSON lines", {
+            "json.dumps per line (baseline)": measure(write_lines, repeat=3),
+            "write_json_lines": measure(lambda: sync_dicts.write_json_lines(path, documents), repeat=3)
+        })
+        report(f"Reading {records} JSON lines", {
+            "read all, json.loads (baseline)": measure(lambda: _read_whole_lines(path), repeat=3),
+            "iter_json_lines": measure(lambda: sum(1 for _ in sync_dicts.iter_json_lines(path)), repeat=3),
+            "iter_json_lines, 4 processes": measure(lambda: sum(1 for _ in sync_dicts.iter_json_lines(path, processes=4)), repeat=3)
+        })
+        report(f"Peak memory of reading {records} JSON lines", {
+            "read all, json.loads (baseline)": _peak(lambda: len(_read_whole_lines(path))),
+            "iter_json_lines": _peak(lambda: sum(1 for _ in sync_dicts.iter_json_lines(path)))
+        }, "MiB")
+        
+        stream: bytes = b"".join(line.replace(b"\n", b" ") for line in open(path, "rb"))
+        report(f"Decoding {records} concatenated documents", {
+            "JSONStreamDecoder, 64 KiB chunks": measure(lambda: sum(1 for _ in sync_dicts.iter_json_stream(io.BytesIO(stream))), repeat=3)
+        })
+
+def bench_compact(records: int = 500_000) -> None:
+    rng: random.Random = random.Random(0)
+    # parsed lines, so every record owns its value objects like `json_to_dict` output does
+    lines: list[bytes] = [
+        sync_dicts.dict_to_json({"id": index, "user": f"u{rng.randrange(10_000)}", "latency": rng.random(), "status": rng.choice((200, 404, 500)), "cached": bool(index % 3)}).encode()
+        for index in range(records)
+    ]
+
+    report(f"Bytes per record, {records} records of 5 keys", {
+        "list of dicts (baseline)": _allocated(lambda: [sync_dicts.json_to_dict(line) for line in lines]) * 1024 ** 2 / records,
+        "compact_records, pack=False": _allocated(lambda: sync_dicts.compact_records((sync_dicts.json_to_dict(line) for line in lines), pack=False)) * 1024 ** 2 / records,
+        "compact_records": _allocated(lambda: sync_dicts.compact_records(sync_dicts.json_to_dict(line) for line in lines)) * 1024 ** 2 / records
+    }, "B")
+
+    dicts: list[dict[str, Any]] = [sync_dicts.json_to_dict(line) for line in lines]
+    compact: sync_dicts.CompactRecords = sync_dicts.compact_records(dicts)
+    report(f"Reading one key of {records} records", {
+        "list of dicts (baseline)": measure(lambda: [record["latency"] for record in dicts], repeat=3),
+        "CompactRecord views": measure(lambda: [record["latency"] for record in compact], repeat=3),
+        "CompactRecords.column": measure(lambda: compact.column("latency"), repeat=3)
+    })
+
+def bench() -> None:
+    bench_flatten()
+    bench_paths()
+    bench_get_key()
+    bench_merge()
+    bench_json()
+    bench_json_lines()
+    bench_compact()
@@ -0,0 +1,135 @@
+import sys, random
+sys.dont_write_bytecode = True
+
+import xRedUtils.iterables as sync_iterables
+from xRedUtils.annotations import Any, ITERABLE
+from xRedUtilsTests.benchmark import measure, report
+
+
+def _recursive_flatten(iterable: ITERABLE) -> list[Any]:
+    """`flatten_iterable` as it was before `iflatten`, kept as a baseline."""
+    if not isinstance(iterable, ITERABLE):
+        return iterable
+
+    new: list[Any] = list()
+    for element in iterable:
+        if isinstance(element, ITERABLE):
+            new.extend(_recursive_flatten(element))
+        else:
+            new.append(element)
+    return new
+
+def _timed(func) -> float | str:
+    try:
+        return measure(func, repeat=3)
+    except RecursionError:
+        return "RecursionError"
+
+def bench_flatten(elements: int = 10_000_000, depth: int = 10_000) -> None:
+    # 10M elements in rows of 1000, 4 levels deep
+    wide: list[Any] = [[list(range(row, row + 10)) for row in range(block, block + 1_000, 10)] for block in range(0, elements, 1_000)]
+    deep: list[Any] = [0]
+    for level in range(depth):
+        deep = [deep, level]
+
+    for title, data in ((f"Flatten {elements} elements", wide), (f"Flatten {depth} levels deep", deep)):
+        results: dict[str, float | str] = {
+            "recursive (baseline)": _timed(lambda: _recursive_flatten(data)),
+            "flatten_iterable": _timed(lambda: sync_iterables.flatten_iterable(data)),
+            "iflatten, consumed lazily": _timed(lambda: sum(1 for _ in sync_iterables.iflatten(data)))
+        }
+
+        # a baseline that crashed can not be compared against
+        failed: dict[str, str] = {name: value for name, value in results.items() if isinstance(value, str)}
+        report(title, {name: value for name, value in results.items() if name not in failed})
+        for name, error in failed.items():
+            print(f"  {name:<32} {error}")
+
+def bench_sets(size: int = 2_000_000, small: int = 5_000) -> None:
+    first: list[int] = [random.randrange(size) for _ in range(size)]
+    second: list[int] = [random.randrange(size) for _ in range(size)]
+    first_small, second_small = first[:small], second[:small]
+
+    # old `in list` comparison is quadratic, measured on a small input only
+    report(f"compare_iterables, {small} x {small} items", {
+        "item in list (baseline)": measure(lambda: [item for item in first_small if item in second_small], repeat=3),
+        "compare_iterables": measure(lambda: sync_iterables.compare_iterables(first_small, second_small), repeat=3)
+    })
+    report(f"Set operations, {size} x {size} items", {
+        "set operators, unordered (baseline)": measure(lambda: (set(first) & set(second), set(first) - set(second), set(first) ^ set(second)), repeat=3),
+        "intersection + difference + symmetric_difference": measure(lambda: (
+            sync_iterables.intersection(first, second), sync_iterables.difference(first, second), sync_iterables.symmetric_difference(first, second)
+        ), repeat=3)
+    })
+
+    with_unhashable: list[Any] = first_small + [[1]]
+    report(f"compare_iterables with an unhashable item, {small} x {small} items", {
+        "item in list (baseline)": measure(lambda: [item for item in first_small if item in with_unhashable], repeat=3),
+        "compare_iterables": measure(lambda: sync_iterables.compare_iterables(first_small, with_unhashable), repeat=3)
+    })
+
+    digits: list[int] = [item % 10 for item in first]
+    report(f"Counting, {size} items", {
+        "len(list comprehension) (baseline)": measure(lambda: len([element for element in digits if element == 7]), repeat=3),
+        "count_occurrences": measure(lambda: sync_iterables.count_occurrences(digits, 7), repeat=3)
+    })
+    report(f"Histogram of 10 distinct values, {size} items", {
+        "count_occurrences per value (baseline)": measure(lambda: {key: sync_iterables.count_occurrences(digits, key) for key in set(digits)}, repeat=3),
+        "multi_count": measure(lambda: sync_iterables.multi_count(digits), repeat=3)
+    })
+
+def _without_numpy(operation, data) -> Any:
+    # python loop, as if numpy was not installed
+    np, sync_iterables.np = sync_iterables.np, None
+    try:
+        return operation(data)
+    finally:
+        sync_iterables.np = np
+
+def bench_numpy(sizes: tuple[int, ...] = (10, 100, 1_000, 10_000, 100_000, 1_000_000)) -> None:
+    if sync_iterables.np is None:
+        print("numpy is not installed, skipping vectorized benchmark.")
+        return
+
+    np = sync_iterables.np
+    operations: dict[str, Any] = {
+        "remove_items": lambda data: sync_iterables.remove_items(data, 7),
+        "count_occurrences": lambda data: sync_iterables.count_occurrences(data, 7),
+        "compare_iterables": lambda data: sync_iterables.compare_iterables(data, range(0, 1_000, 3))
+    }
+
+    # python loop over ndarray is what these functions did before dispatch, list -> ndarray shows why lists are not converted
+    print("Vectorized dispatch, ms per call (list | ndarray without numpy | ndarray | list converted to ndarray):")
+    for name, operation in operations.items():
+        print(f"  {name}:")
+        for size in sizes:
+            data: list[int] = [random.randrange(1_000) for _ in range(size)]
+            vector = np.array(data)
+            number: int = max(1, 100_000 // size)
+
+            timings: list[float] = [
+                measure(lambda: operation(data), number=number, repeat=3) / number * 1_000,
+                measure(lambda: _without_numpy(operation, vector), number=number, repeat=3) / number * 1_000,
+                measure(lambda: operation(vector), number=number, repeat=3) / number * 1_000,
+                measure(lambda: operation(np.array(data)), number=number, repeat=3) / number * 1_000
+            ]
+            print(f"    {size:>9} items  " + " | ".join(f"{timing:>9.4f}" for timing in timings))
+
+def bench_external(size: int = 2_000_000, max_memory: int = 16 * 1024 ** 2) -> None:
+    records: list[tuple[int, str]] = [(random.randrange(size), f"record-{index}") for index in range(size)]
+
+    report(f"Sorting {size} records, {max_memory // 1024 ** 2} MiB runs", {
+        "sorted, in memory (baseline)": measure(lambda: sorted(records), repeat=3),
+        "external_sort, pickle runs": measure(lambda: sum(1 for _ in sync_iterables.external_sort(records, max_memory=max_memory)), repeat=3),
+        "external_sort, marshal runs": measure(lambda: sum(1 for _ in sync_iterables.external_sort(records, max_memory=max_memory, codec="marshal")), repeat=3)
+    })
+    report(f"Deduplicating {size} records on 1000 keys, {max_memory // 1024 ** 2} MiB runs", {
+        "dict, in memory (baseline)": measure(lambda: sorted({record[0] % 1_000: record for record in reversed(records)}.items()), repeat=3),
+        "unique": measure(lambda: sum(1 for _ in sync_iterables.unique(records, key=lambda record: record[0] % 1_000, max_memory=max_memory)), repeat=3)
+    })
+
+def bench() -> None:
+    bench_flatten()
+    bench_sets()
+    bench_numpy()
+    bench_external()
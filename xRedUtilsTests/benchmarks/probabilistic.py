@@ -0,0 +1,42 @@
+import sys
+sys.dont_write_bytecode = True
+
+import xRedUtils.probabilistic as sync_probabilistic
+from xRedUtils.hashing import NON_CRYPTOGRAPHIC_ALGORITHMS
+from xRedUtilsTests.benchmark import measure, report
+
+ALGORITHMS: tuple[str, ...] = ("blake2b", "blake2s", "md5", "sha1", "sha256", "sha3_256", *sorted(NON_CRYPTOGRAPHIC_ALGORITHMS))
+
+
+def bench_bloom(capacity: int = 200_000, error_rate: float = 0.01) -> None:
+    items: list[str] = [f"user-{index}" for index in range(capacity)]
+    absent: list[str] = [f"user-{index}" for index in range(capacity, 2 * capacity)]
+
+    timings: dict[str, float] = {"set (baseline)": measure(lambda: set(items), repeat=3)}
+    print(f"BloomFilter false-positive rate, {capacity} items, target {error_rate:.2%}:")
+
+    for algorithm in ALGORITHMS:
+        bloom = sync_probabilistic.BloomFilter(capacity, error_rate, algorithm)
+        timings[algorithm] = measure(lambda: bloom.update(items), repeat=3)
+        
+        rate: float = sum(item in bloom for item in absent) / len(absent)
+        print(f"  {algorithm:<32} {rate:>12.4%}")
+
+    report(f"BloomFilter inserts, {capacity} items", timings)
+
+def bench_hyperloglog(items: int = 500_000, precision: int = 14) -> None:
+    data: list[str] = [f"user-{index % (items // 2)}" for index in range(items)]
+
+    timings: dict[str, float] = {"set (baseline)": measure(lambda: len(set(data)), repeat=3)}
+    print(f"HyperLogLog relative error, {items // 2} distinct items, precision {precision}:")
+
+    for algorithm in ALGORITHMS:
+        counter = sync_probabilistic.HyperLogLog(precision, algorithm)
+        timings[algorithm] = measure(lambda: counter.update(data), repeat=3)
+        print(f"  {algorithm:<32} {abs(counter.count() / (items // 2) - 1):>12.4%}")
+
+    report(f"HyperLogLog inserts, {items} items", timings)
+
+def bench() -> None:
+    bench_bloom()
+    bench_hyperloglog()
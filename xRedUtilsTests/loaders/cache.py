@@ -1,4 +1,4 @@
-import sys, random
+import sys, os, random, threading, tempfile, multiprocessing, collections, copy, pickle, inspect
 sys.dont_write_bytecode = True
 
 import xRedUtils.cache as sync_cache
@@ -60,6 +60,78 @@ def sync_custom(_cmodule = None) -> None:
             print(f"Error with LRUCache, not reached max_capacity (20) after {iterations} iterations.\nRestart test, sometime randomness can fail.")
 
 
+    # Weighted
+    weighted_lru = CACHE.BetterLRU(max_capacity=100, max_weight=5_000)
+    weighted_limited = CACHE.BetterLimitedCache(max_capacity=100, max_weight=5_000)
+    for d in data:
+        weighted_lru.put(d, bytes(d * 10))
+        try:
+            weighted_limited.put(d, bytes(d * 10))
+        except MemoryError:
+            pass
+
+    if weighted_lru.weight > 5_000 or weighted_limited.weight > 5_000:
+        print(f"Error with max_weight, weight budget exceeded. Got: {weighted_lru.weight}, {weighted_limited.weight}")
+
+    if weighted_lru.weight != sum(map(CACHE.default_weigher, weighted_lru.values())):
+        print("Error with BetterLRU, tracked weight does not match stored values.")
+
+    weighted_lru.change_size(max_weight=1_000)
+    weighted_limited.change_size(max_weight=1_000)
+    if weighted_lru.weight > 1_000 or weighted_limited.weight > 1_000:
+        print("Error with max_weight, `change_size` did not shed weight.")
+
+    # LRU engine
+    lru_engine = CACHE.LRUCache(max_capacity=2)
+    lru_engine.put("a", 1)
+    lru_engine.put("b", 2)
+    lru_engine.get("a")
+    lru_engine.put("c", 3)
+
+    if list(lru_engine) != ["a", "c"]:
+        print(f"Error with LRUCache, wrong eviction order. Got: {list(lru_engine)}")
+
+    try:
+        lru_engine["b"]
+        print("Error with LRUCache, `__getitem__` did not raise KeyError on missing key.")
+    except KeyError:
+        pass
+
+    if (lru_engine.hits, lru_engine.misses, lru_engine.evictions) != (1, 1, 1):
+        print(f"Error with LRUCache counters. Got: {(lru_engine.hits, lru_engine.misses, lru_engine.evictions)}")
+
+    lru_copy = lru_engine.copy()
+    lru_copy.put("d", 4)
+    if list(lru_engine) != ["a", "c"] or list(lru_copy) != ["c", "d"]:
+        print(f"Error with LRUCache, `copy` shares links with the original. Got: {list(lru_engine)}, {list(lru_copy)}")
+
+    big_lru = CACHE.BetterLRU(max_capacity=50_000, max_weight=10**9)
+    for i in range(50_000):
+        big_lru.put(i, i)
+    big_lru.get(0)
+    for restored in (pickle.loads(pickle.dumps(big_lru)), copy.deepcopy(big_lru)):
+        if list(restored.items()) != list(big_lru.items()) or restored.weight != big_lru.weight or restored.max_capacity != 50_000:
+            print("Error with LRUCache, pickle/deepcopy did not keep items and order.")
+
+    merged = lru_engine | {"e": 5}
+    if type(merged) is not CACHE.LRUCache or list(merged.items()) != [("c", 3), ("e", 5)] or ("a", 1) not in lru_engine.items():
+        print(f"Error with LRUCache, `|` or items view. Got: {merged}")
+
+    # Stats
+    stats_cache = CACHE.BetterLRU(max_capacity=20)
+    stats = stats_cache.enable_stats(window=10)
+    for d in data:
+        if stats_cache.get(d) is None:
+            stats_cache[d] = d
+
+    snapshot = stats_cache.stats_snapshot()
+    if snapshot["hits"] + snapshot["misses"] != iterations or snapshot["inserts"] - snapshot["evictions"] != len(stats_cache) or snapshot["latency"]["put"]["count"] != snapshot["misses"]:
+        print(f"Error with stats, counters do not add up. Got: {snapshot}")
+
+    stats_cache.disable_stats()
+    if stats_cache.stats is not None or stats_cache.get(data[-1]) != data[-1] or stats.hits != snapshot["hits"]:
+        print("Error with stats, `disable_stats` did not restore plain `get`/`put`.")
+
     # Better lru
     better_lru_cache = CACHE.BetterLRU(max_capacity=20)
     for d in data:
@@ -76,9 +148,227 @@ def sync_custom(_cmodule = None) -> None:
         if len(better_lru_cache) <= 20:
             print(f"Error with BetterLRU, not higher than intial max_capacity (20) after {iterations} iterations.\nRestart test, sometime randomness can fail.")
 
-    
-    del limited_cache, better_limited_cache, lru_cache, better_lru_cache
+
+    # Concurrent
+    concurrent_lru = CACHE.ConcurrentLRU(max_capacity=20, shards=4)
+    concurrent_limited = CACHE.ConcurrentLimitedCache(max_capacity=20, shards=4)
+
+    def worker(offset: int) -> None:
+        for d in data:
+            concurrent_lru.put(d + offset, d)
+            concurrent_lru.get(d)
+            try:
+                concurrent_limited.put(d + offset, d)
+            except MemoryError:
+                pass
+
+    threads: list[threading.Thread] = [threading.Thread(target=worker, args=(i * max_value,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if len(concurrent_lru) != 20 or len(list(concurrent_lru)) != 20:
+        print(f"Error with ConcurrentLRU, expected 20 items after concurrent puts. Got: {len(concurrent_lru)}")
+
+    if len(concurrent_limited) != 20 or len(list(concurrent_limited)) != 20:
+        print(f"Error with ConcurrentLimitedCache, expected 20 items after concurrent puts. Got: {len(concurrent_limited)}")
+
+    concurrent_lru.change_size(5)
+    concurrent_limited.change_size(5)
+    if len(concurrent_lru) > 5 or len(concurrent_limited) > 5:
+        print("Error with Concurrent caches, `change_size` did not shrink the cache.")
+
+    small_lru = CACHE.ConcurrentLRU(max_capacity=2, shards=8)
+    small_lru.put("a", 1)
+    small_lru.get("a")
+    small_lru.change_size(64)
+    for i in range(64):
+        small_lru.put(i, i)
+    if len(small_lru._layout[0]) != 8 or len(small_lru) != 64 or (small_lru.hits, small_lru.inserts) != (1, 65):
+        print(f"Error with ConcurrentLRU, growing did not re-shard the cache. Got: {len(small_lru._layout[0])} shards, {len(small_lru)} items")
+
+    # TTL
+    clock: list[float] = [0.0]
+    ttl_cache = CACHE.TTLCache(max_capacity=20, ttl=10, timer=lambda: clock[0])
+    ttl_cache.put("short", 1)
+    ttl_cache.put("long", 2, ttl=1, unit="minute")
+    ttl_cache.put("forever", 3, ttl=float("inf"))
+
+    clock[0] = 30
+    if ttl_cache.get("short") is not None or "short" in ttl_cache:
+        print("Error with TTLCache, item did not expire after its TTL.")
+
+    if ttl_cache.get("long") != 2:
+        print("Error with TTLCache, per key TTL override was ignored.")
+
+    clock[0] = 3600
+    if len(ttl_cache) != 1 or "long" in repr(ttl_cache) or len(ttl_cache._map) != 2:
+        print("Error with TTLCache, `len`/`repr` removed expired items or counted them.")
+
+    if ttl_cache.expire() != 1 or list(ttl_cache) != ["forever"]:
+        print(f"Error with TTLCache, bulk expiry failed. Left: {list(ttl_cache)}")
+
+    ttl_stats = ttl_cache.enable_stats()
+    ttl_cache.put("short", 1)
+    clock[0] = 3700
+    ttl_cache.put("other", 2)
+    if (ttl_stats.inserts, ttl_stats.evictions) != (2, 0):
+        print(f"Error with TTLCache stats, expired items were counted as evictions. Got: {(ttl_stats.inserts, ttl_stats.evictions)}")
+    ttl_cache.disable_stats()
+
+    for d in data:
+        ttl_cache.put(d, d)
+    if len(ttl_cache) != 20:
+        print(f"Error with TTLCache, not reached max_capacity (20) after {iterations} iterations.")
+
+    # TinyLFU
+    tiny_lfu = CACHE.TinyLFUCache(max_capacity=100)
+    for _ in range(10):
+        for hot in range(50):
+            if tiny_lfu.get(hot) is None:
+                tiny_lfu.put(hot, hot)
+
+    for cold in range(1_000, 5_000):
+        tiny_lfu.put(cold, cold)
+
+    if len(tiny_lfu) != 100 or sum(hot in tiny_lfu for hot in range(50)) < 45:
+        print(f"Error with TinyLFUCache, scan flushed the hot set. Hot keys left: {sum(hot in tiny_lfu for hot in range(50))}")
+
+    # ARC / 2Q
+    for policy in (CACHE.ARCCache, CACHE.TwoQueueCache):
+        policy_cache = policy(max_capacity=20)
+        for d in data:
+            if policy_cache.get(d) is None:
+                policy_cache.put(d, d)
+
+        if len(policy_cache) != 20 or policy_cache.hits + policy_cache.misses != iterations:
+            print(f"Error with {policy.__name__}, not reached max_capacity (20) after {iterations} iterations.")
+
+        policy_cache.max_capacity = 5
+        if len(policy_cache) != 5 or any(policy_cache[key] != key for key in policy_cache):
+            print(f"Error with {policy.__name__}, `change_size` did not shrink the cache.")
+
+    # Memoize
+    memo_calls: list[int] = []
+
+    @CACHE.memoize(maxsize=20)
+    def square(x: int, power: int = 2) -> int:
+        memo_calls.append(x)
+        return x ** power
+
+    for d in data:
+        square(d)
+    square(3, power=3)
+
+    info = square.cache_info()
+    if len(memo_calls) != info.misses or info.hits + info.misses != iterations + 1 or info.currsize != 20:
+        print(f"Error with memoize, unexpected cache_info. Got: {info}")
+
+    square.cache_clear()
+    memo_cache = inspect.getclosurevars(square.cache_clear).nonlocals["cache"]
+    if square.cache_info().currsize != 0 or (memo_cache.hits, memo_cache.misses, memo_cache.inserts, memo_cache.evictions) != (0, 0, 0, 0):
+        print("Error with memoize, `cache_clear` did not clear the cache.")
+
+    Point = collections.namedtuple("Point", "x y")
+
+    @CACHE.memoize
+    def first(*args) -> object:
+        return args[0]
+
+    if first(1, 2) != 1 or first(Point(1, 2)) != Point(1, 2):
+        print("Error with memoize, a namedtuple argument collided with the tuple of its fields.")
+
+    @CACHE.memoize(maxsize=2)
+    def identity(x: int) -> int:
+        memo_calls.append(x)
+        return x
+
+    memo_calls.clear()
+    for x in (1, 2, 1, 3, 1, 2):
+        identity(x)
+    if memo_calls != [1, 2, 3, 2]:
+        print(f"Error with memoize, buffered hits did not update the LRU order. Calls: {memo_calls}")
+
+    # Disk
+    with tempfile.TemporaryDirectory() as directory:
+        with CACHE.DiskCache(directory, memory_capacity=5) as disk_cache:
+            for d in data:
+                disk_cache[str(d)] = d
+            disk_cache[b"blob"] = b"x" * 10_000
+            disk_cache.pop("0", None)
+
+        with CACHE.DiskCache(directory, memory_capacity=5) as disk_cache:
+            view = disk_cache.get_view(b"blob")
+            if len(disk_cache) != len(set(data) - {0}) + 1 or "0" in disk_cache or disk_cache["1"] != 1 or view != b"x" * 10_000:
+                print(f"Error with DiskCache, items were not persisted. Got: {len(disk_cache)} items")
+            del view
+
+            target_size: int = disk_cache.size // 2
+            disk_cache.compact(target_size)
+            if disk_cache.size > target_size or b"blob" not in disk_cache or len(disk_cache) != len(list(disk_cache)):
+                print(f"Error with DiskCache, `compact` did not keep the newest items. Got: {disk_cache!r}")
+
+            disk_cache["array"] = bytearray(b"abc")
+            disk_cache["view"] = memoryview(b"def")
+            if disk_cache["array"] != b"abc" or type(disk_cache["array"]) is not bytes or type(disk_cache["view"]) is not bytes or disk_cache.get_view("view") != b"def":
+                print("Error with DiskCache, bytes-like values were not stored as `bytes`.")
+
+            disk_cache["popped"] = 1
+            for index in range(5):
+                disk_cache[f"filler{index}"] = index
+            if disk_cache.pop("popped") != 1 or "popped" in disk_cache or list(disk_cache._front) != [f"filler{index}" for index in range(5)]:
+                print("Error with DiskCache, `pop` of an item on disk returned a wrong value or loaded it into memory.")
+
+        os.makedirs(f"{directory}/other")
+        with open(f"{directory}/other/data.log", "wb") as file:
+            file.write(b"not a log")
+        try:
+            CACHE.DiskCache(f"{directory}/other")
+            print("Error with DiskCache, opened a file that is not a log.")
+        except ValueError:
+            pass
+
+    # Shared memory
+    with CACHE.SharedMemoryCache(max_capacity=20, slot_size=64, ways=4) as shared_cache:
+        for d in data:
+            if shared_cache.get(d) is None:
+                shared_cache.put(d, d)
+
+        if len(shared_cache) != 20 or shared_cache.hits + shared_cache.misses != iterations:
+            print(f"Error with SharedMemoryCache, not reached max_capacity (20) after {iterations} iterations.")
+
+        shared_cache.put(10 ** 20, "int")
+        result = (shared_cache.get(10 ** 20), shared_cache.get(1e20), shared_cache.get(str(10 ** 20)))
+        if result != ("int", "int", None):
+            print("Error with SharedMemoryCache, equal int keys did not match. Returned:", result)
+
+        try:
+            shared_cache.put(frozenset((1, 2)), 1)
+            print("Error with SharedMemoryCache, accepted a key without canonical bytes.")
+        except TypeError:
+            pass
+
+        if "fork" in multiprocessing.get_all_start_methods():
+            child = multiprocessing.get_context("fork").Process(target=shared_cache.put, args=("child", "value"))
+            child.start()
+            child.join()
+
+            if shared_cache.get("child") != "value":
+                print("Error with SharedMemoryCache, item written by a child process is missing.")
+
+    del limited_cache, better_limited_cache, weighted_lru, weighted_limited, lru_cache, lru_engine, better_lru_cache, concurrent_lru, concurrent_limited, ttl_cache, tiny_lfu, policy_cache, disk_cache, shared_cache, stats_cache, stats
 
 async def async_custom() -> None:
     # caches are sync, passing to sync_custom
-    sync_custom(async_cache)
\ No newline at end of file
+    sync_custom(async_cache)
+    @async_cache.memoize(maxsize=1)
+    async def double(x: int) -> int:
+        return x * 2
+
+    for x in (1, 1, 2):
+        await double(x)
+    double.cache_clear()
+    memo_cache = inspect.getclosurevars(double.cache_clear).nonlocals["cache"]
+    if double.cache_info().currsize != 0 or (memo_cache.hits, memo_cache.misses, memo_cache.inserts, memo_cache.evictions) != (0, 0, 0, 0):
+        print("Error with async memoize, `cache_clear` did not reset the counters.")
@@ -1,4 +1,4 @@
-import sys, typing, json
+import sys, typing, json, datetime, uuid, io
 sys.dont_write_bytecode = True
 from xRedUtils.annotations import Any
 
@@ -26,6 +26,11 @@ SECONDARY_DICT: dict[str, Any] = {
     "q": "14"
 }
 
+NESTED_DICT: dict[str, Any] = {
+    "a": [1, {"b": (2, 3)}],
+    "c": {"d": None, "e": {}}
+}
+
 def tester(_async: bool) -> None:
     DICTS = async_dicts if _async else sync_dicts
     
@@ -42,7 +47,7 @@ def tester(_async: bool) -> None:
                 "dictionary": PRIMARY_DICT,
                 "indent": None
             },
-            "result": '{"a": 1, "b": {"b": 10, "c": 30, "h": {"l": true}}, "q": "14"}'
+            "result": '{"a":1,"b":{"b":10,"c":30,"h":{"l":true}},"q":"14"}'
         },
         DICTS.dict_walk: {
             "kwargs": {
@@ -61,9 +66,17 @@ def tester(_async: bool) -> None:
             },
             "result": False
         },
+        DICTS.get_many: {
+            "kwargs": {
+                "dictionary": NESTED_DICT,
+                "paths": ["a.1.b.-1", ["c", "d"], "a.5", "c.d.e"],
+                "default": "-"
+            },
+            "result": [3, None, "-", "-"]
+        },
         DICTS.json_to_dict: {
             "kwargs": {
-                "d": json.dumps(PRIMARY_DICT),
+                "d": json.dumps(PRIMARY_DICT).encode(),
             },
             "result": PRIMARY_DICT
         },
@@ -73,6 +86,13 @@ def tester(_async: bool) -> None:
             },
             "result": {'a': 1, 'b_b': 10, 'b_c': 30, 'b_h_l': True, 'q': '14'}
         },
+        DICTS.unflatten_dict: {
+            "kwargs": {
+                "dictionary": {"a_0": 1, "a_1_b_0": 2, "a_1_b_1": 3, "c_d": None},
+                "unflatten_lists": True
+            },
+            "result": {"a": [1, {"b": [2, 3]}], "c": {"d": None}}
+        },
         DICTS.get_value: {
             "kwargs": {
                 "dictionary": PRIMARY_DICT,
@@ -95,3 +115,122 @@ def tester(_async: bool) -> None:
         }
     }
     return TESTS
+
+def sync_custom() -> None:
+    result = list(sync_dicts.iter_flatten_dict(NESTED_DICT, _sep=".", flatten_lists=True))
+    if result != [("a.0", 1), ("a.1.b.0", 2), ("a.1.b.1", 3), ("c.d", None)]:
+        print("dicts.iter_flatten_dict returned wrong pairs. Returned:", result)
+
+    cyclic: dict[str, Any] = {"a": {}}
+    cyclic["a"]["b"] = cyclic
+    try:
+        sync_dicts.flatten_dict(cyclic)
+        print("dicts.flatten_dict did not detect a reference cycle.")
+    except ValueError:
+        pass
+
+    accessor = sync_dicts.compile_path("b/h/l", _sep="/")
+    if accessor is not sync_dicts.compile_path("b/h/l", _sep="/") or accessor(PRIMARY_DICT) is not True or accessor.get(SECONDARY_DICT, 0) != 0:
+        print("dicts.compile_path returned wrong values or was not cached.")
+
+    lookup = sync_dicts.BidirectionalDict({"a": 1, "b": 2}, c=1)
+    lookup["a"] = 2
+    del lookup["b"]
+    result = (lookup.get_key(1), lookup.get_keys(2), sync_dicts.get_key(lookup, 3), lookup.has_value(1))
+    if result != ("c", ["a"], None, True):
+        print("dicts.BidirectionalDict reverse index out of sync. Returned:", result)
+
+    try:
+        lookup["a"] = []
+        print("dicts.BidirectionalDict accepted an unhashable value.")
+    except TypeError:
+        if lookup["a"] != 2 or lookup.get_keys(2) != ["a"]:
+            print("dicts.BidirectionalDict lost a link after an unhashable value. Returned:", lookup.get_keys(2))
+
+    result = sync_dicts.deep_merge(PRIMARY_DICT, {"b": {"h": {"m": 1}}, "q": [1]}, {"q": [2]}, strategies={list: "append"})
+    if result != {"a": 1, "b": {"b": 10, "c": 30, "h": {"l": True, "m": 1}}, "q": [1, 2]}:
+        print("dicts.deep_merge returned wrong values. Returned:", result)
+
+    overlay: dict[str, Any] = {"b": {"c": 31}}
+    merged = sync_dicts.deep_merge(PRIMARY_DICT, overlay)
+    view = sync_dicts.MergedView(PRIMARY_DICT, overlay)
+    if merged["b"]["h"] is not PRIMARY_DICT["b"]["h"] or view["b"]["c"] != 31 or view["b"]["h"] is not PRIMARY_DICT["b"]["h"] or view.to_dict() != merged:
+        print("dicts.deep_merge/MergedView copied a shared subtree or merged wrong values.")
+
+    document: dict[str, Any] = {"at": datetime.date(2024, 5, 1), "id": uuid.UUID(int=1), "tags": {"x"}}
+    for name in ("json", "orjson", "msgspec", "ujson"):
+        try:
+            sync_dicts.get_json_codec(name)
+        except ValueError:
+            continue
+
+        encoded = sync_dicts.dict_to_json(document, codec=name)
+        if encoded != '{"at":"2024-05-01","id":"00000000-0000-0000-0000-000000000001","tags":["x"]}' or sync_dicts.json_to_dict(encoded.encode(), codec=name)["tags"] != ["x"]:
+            print(f"dicts.dict_to_json/json_to_dict with `{name}` codec returned wrong values. Returned:", encoded)
+
+    if sync_dicts.encode_json({"é": [1]}) != b'{"\\u00e9":[1]}' or sync_dicts.encode_json({"é": 1}, ensure_ascii=False) != '{"é":1}'.encode():
+        print("dicts.encode_json returned wrong bytes. Returned:", sync_dicts.encode_json({"é": [1]}))
+
+    try:
+        sync_dicts.dict_to_json({}, codec="orjson", sort_keys=True)
+        print("dicts.dict_to_json ignored `codec` with extra arguments.")
+    except ValueError:
+        pass
+
+    class Encoder(json.JSONEncoder):
+        def default(self, obj: Any) -> Any:
+            return "X"
+
+    if sync_dicts.dict_to_json({"a": object()}, cls=Encoder) != '{"a":"X"}':
+        print("dicts.dict_to_json did not use the `default` method of `cls`.")
+
+    if sync_dicts.json_to_dict(sync_dicts.dict_to_json({"a": 2 ** 70, "b": float("nan")}))["a"] != 2 ** 70:
+        print("dicts.dict_to_json/json_to_dict with the default codec lost a big integer.")
+
+    stream = io.BytesIO()
+    written = sync_dicts.write_json_lines(stream, ({"id": index, "tags": {"é"}} for index in range(5)), batch_size=2)
+    result = list(sync_dicts.iter_json_lines(io.BytesIO(stream.getvalue() + b"\n\n")))
+    if written != 5 or result != [{"id": index, "tags": ["é"]} for index in range(5)]:
+        print("dicts.write_json_lines/iter_json_lines returned wrong documents. Returned:", written, result)
+
+    decoder = sync_dicts.JSONStreamDecoder()
+    data = '{"a": [1]}{"b": "é"} 12\n3'.encode()
+    result = decoder.feed(data[:3]) + decoder.feed(data[3:13]) + decoder.feed(data[13:]) + decoder.close()
+    if result != [{"a": [1]}, {"b": "é"}, 12, 3]:
+        print("dicts.JSONStreamDecoder returned wrong documents. Returned:", result)
+
+    data = '{"a": "}\\\\\\"{[", "b": ["\\\\"]} 3.5 "x]"'.encode()
+    result = [document for index in range(len(data)) for document in decoder.feed(data[index:index + 1])] + decoder.close()
+    if result != [{"a": '}\\"{[', "b": ["\\"]}, 3.5, "x]"]:
+        print("dicts.JSONStreamDecoder returned wrong documents for byte by byte chunks. Returned:", result)
+
+    records = sync_dicts.compact_records([{"id": 1, "score": 0.5, "ok": True}, {"id": 2, "score": 1.5, "ok": False}, {"id": 3, "note": "x"}])
+    result = (records.keys, records[-1], records[0] == {"id": 1, "score": 0.5, "ok": True}, records.column("score"), records.column("id"))
+    if result != (("id", "score", "ok", "note"), {"id": 3, "note": "x"}, True, [0.5, 1.5, None], [1, 2, 3]) or type(records._columns[0]).__name__ != "array":
+        print("dicts.compact_records returned wrong records. Returned:", result)
+
+async def async_custom() -> None:
+    result = list(await async_dicts.iter_flatten_dict(NESTED_DICT, _sep=".", flatten_lists=True))
+    if result != [("a.0", 1), ("a.1.b.0", 2), ("a.1.b.1", 3), ("c.d", None)]:
+        print("dicts.iter_flatten_dict returned wrong pairs. Returned:", result)
+
+    result = await async_dicts.deep_merge(PRIMARY_DICT, {"b": {"h": {"m": 1}}, "q": [1]}, {"q": [2]}, strategies={list: "append"})
+    if result != {"a": 1, "b": {"b": 10, "c": 30, "h": {"l": True, "m": 1}}, "q": [1, 2]}:
+        print("dicts.deep_merge returned wrong values. Returned:", result)
+
+    encoded = await async_dicts.dict_to_json({"at": datetime.date(2024, 5, 1)}, codec="json")
+    if encoded != '{"at":"2024-05-01"}' or await async_dicts.json_to_dict(encoded.encode()) != {"at": "2024-05-01"}:
+        print("dicts.dict_to_json/json_to_dict returned wrong values. Returned:", encoded)
+
+    if await async_dicts.encode_json([1, "x"], indent=None) != b'[1,"x"]':
+        print("dicts.encode_json returned wrong bytes.")
+
+    stream = io.StringIO()
+    await async_dicts.write_json_lines(stream, [{"a": 1}, [2]])
+    result = list(await async_dicts.iter_json_stream(io.StringIO(stream.getvalue()), chunk_size=3))
+    if result != [{"a": 1}, [2]]:
+        print("dicts.write_json_lines/iter_json_stream returned wrong documents. Returned:", result)
+
+    records = await async_dicts.compact_records({"i": index} for index in range(3))
+    if len(records) != 3 or records[1]["i"] != 1 or records.to_dicts() != [{"i": 0}, {"i": 1}, {"i": 2}]:
+        print("dicts.compact_records returned wrong records. Returned:", records)
@@ -23,5 +23,12 @@ def tester(_async: bool) -> None:
             },
             "result": b"D\x17\xa3\r\xc8\xc6\xb5?^.+\x90Q\x15\x93H\x03`\x17\xf9\x06\x1e\x8a\xce\x1f\x96j\x1a\xb5\x8f\xbe\xdd"
         },
+        HASHING.digest: {
+            "kwargs": {
+                "algorithm": "crc32",
+                "data": "test"
+            },
+            "result": b"\xd8\x7f~\x0c"
+        },
     }
     return TESTS
\ No newline at end of file
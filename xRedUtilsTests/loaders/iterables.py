@@ -1,4 +1,4 @@
-import sys, typing, itertools, asyncio
+import sys, typing, itertools, asyncio, operator, array, types
 sys.dont_write_bytecode = True
 from xRedUtils.annotations import Any
 
@@ -46,6 +46,12 @@ def tester(_async: bool) -> None:
             },
             "result": 3
         },
+        ITERABLES.multi_count: {
+            "kwargs": {
+                "iterable": SECONDARY_ITERABLE
+            },
+            "result": {"Yes": 1, None: 3, 124: 1, True: 1, False: 1, id: 1}
+        },
         ITERABLES.get_attr_data: {
             "kwargs": {
                 "iterable": [complex(10, 3), complex(523, 34), complex(12, 54)],
@@ -64,14 +70,128 @@ def tester(_async: bool) -> None:
     return TESTS
 
 
+DEEP_ITERABLE: list[Any] = [0]
+for level in range(10_000):
+    DEEP_ITERABLE = [DEEP_ITERABLE, level]
+
 def sync_custom() -> None:
     result = sync_iterables.chunker(SECONDARY_ITERABLE, 2)
 
     if not isinstance(result, itertools.batched):
         print("iterables.chunker did not return batched object. Returned:", result)
 
+    result = list(sync_iterables.iflatten(["ab", (x for x in [1, [2, [3]]])], max_depth=2))
+    if result != ["ab", 1, 2, [3]]:
+        print("iterables.iflatten did not respect max_depth or flattened a string. Returned:", result)
+
+    if len(sync_iterables.flatten_iterable(DEEP_ITERABLE)) != 10_001:
+        print("iterables.flatten_iterable failed on a deeply nested iterable.")
+
+    result = (
+        sync_iterables.intersection([None, [1], 124, None, "1"], [[1], None, 5], (None, [1])),
+        sync_iterables.difference([None, [1], 124, None, "1"], [[1]], (124,)),
+        sync_iterables.symmetric_difference([None, [1], 124, None], [[1], 5], (5, 6))
+    )
+    if result != ([None, [1]], [None, "1"], [None, 124, 6]):
+        print("iterables set operations returned wrong items or order. Returned:", result)
+
+    result = list(sync_iterables.parallel_map(abs, range(-500, 500)))
+    if result != [abs(x) for x in range(-500, 500)] or sync_iterables.parallel_reduce(max, range(1000), chunk_size=64) != 999:
+        print("iterables.parallel_map/parallel_reduce returned wrong results.")
+
+    records = (complex(x, x) if x % 2 else "_NO_ATTR" for x in range(1_000))
+    result = [sum(chunk) for chunk in sync_iterables.chunker(sync_iterables.iget_attr_data(sync_iterables.iremove_type(records, str), "imag"), 100)]
+    if result != [10_000.0 + 20_000 * n for n in range(5)] or sync_iterables.get_attr_data([complex(1, 2), "_NO_ATTR"], "real") != [1.0, "_NO_ATTR"]:
+        print("iterables streaming pipeline returned wrong results. Returned:", result)
+
+    nested = types.SimpleNamespace(**{"real.imag": 1}, real=complex(2, 3))
+    if sync_iterables.get_attr_data([nested], "real.imag") != [1] or list(sync_iterables.iget_attr_data([nested], "real.imag")) != [3.0]:
+        print("iterables.get_attr_data followed a dotted attribute name.")
+
+    result = (
+        list(itertools.islice(sync_iterables.sliding_window(itertools.count(), 3, step=2), 3)),
+        [view.tolist() for view in itertools.islice(sync_iterables.sliding_window(itertools.count(), 3, typecode="q"), 3)],
+        [view.tolist() for view in sync_iterables.tumbling_window(range(7), 3, typecode="q")],
+        list(sync_iterables.session_window([1, 2, 4, 10, 11, 20], key=float, gap=2))
+    )
+    if result != ([(0, 1, 2), (2, 3, 4), (4, 5, 6)], [[0, 1, 2], [1, 2, 3], [2, 3, 4]], [[0, 1, 2], [3, 4, 5], [6]], [[1, 2, 4], [10, 11], [20]]):
+        print("iterables window functions returned wrong windows. Returned:", result)
+
+    records = [(x * 7919 % 1_000, x) for x in range(5_000)]
+    result = (
+        list(sync_iterables.external_sort(records, key=operator.itemgetter(0), max_memory=4_096)) == sorted(records, key=operator.itemgetter(0)),
+        list(sync_iterables.unique((x % 97 for x in range(5_000)), max_memory=512, codec="marshal")) == list(range(97)),
+        list(sync_iterables.unique(records, key=operator.itemgetter(0), max_memory=512))[:2]
+    )
+    if result != (True, True, [(0, 0), (1, 679)]):
+        print("iterables.external_sort/unique returned wrong results. Returned:", result)
+
+    if sync_iterables.np is not None:
+        vector = sync_iterables.np.array([1, 7, 3, 7])
+        result = (list(sync_iterables.remove_items(vector, 7)), sync_iterables.count_occurrences(vector, 7), list(sync_iterables.compare_iterables(vector, range(5))))
+        if result != ([1, 3], 2, [1, 3]):
+            print("iterables vectorized dispatch returned wrong results. Returned:", result)
+
+        result = (sync_iterables.remove_type(sync_iterables.np.array([1, 2]), int), sync_iterables.remove_type(sync_iterables.np.array([1.5]), int), sync_iterables.remove_type(sync_iterables.np.array([True]), int))
+        if result != ([], [1.5], []):
+            print("iterables.remove_type did not match python types of array items. Returned:", result)
+
+    result = (sync_iterables.remove_items(array.array("q", [1, 2, 3]), 2), sync_iterables.remove_type(array.array("d", [1.5]), int), sync_iterables.compare_iterables(array.array("q", [1, 2, 3]), [3, 1]))
+    if result != ([1, 3], [1.5], [1, 3]) or type(result[0][0]) is not int:
+        print("iterables array dispatch did not return a list of python items. Returned:", result)
+
+    nan = float("nan")
+    result = (sync_iterables.count_occurrences([nan] * 3, nan), sync_iterables.count_occurrences((x for x in [nan, 1]), nan), sync_iterables.count_occurrences([1, 1.0, True], 1))
+    if result != (0, 0, 3):
+        print("iterables.count_occurrences did not compare items by `==`. Returned:", result)
+
+    result = sync_iterables.compare_iterables(["a", "bc", "x"], "abcd")
+    if result != ["a", "bc"]:
+        print("iterables.compare_iterables did not search a string for substrings. Returned:", result)
+
 async def async_custom() -> None:
     result = await async_iterables.chunker(SECONDARY_ITERABLE, 2)
 
     if not isinstance(result, itertools.batched):
-        print("iterables.chunker did not return batched object. Returned:", result)
\ No newline at end of file
+        print("iterables.chunker did not return batched object. Returned:", result)
+
+    result = list(await async_iterables.iflatten(["ab", (x for x in [1, [2, [3]]])], max_depth=2))
+    if result != ["ab", 1, 2, [3]]:
+        print("iterables.iflatten did not respect max_depth or flattened a string. Returned:", result)
+
+    if len(await async_iterables.flatten_iterable(DEEP_ITERABLE)) != 10_001:
+        print("iterables.flatten_iterable failed on a deeply nested iterable.")
+
+    result = (
+        await async_iterables.intersection([None, [1], 124, None, "1"], [[1], None, 5], (None, [1])),
+        await async_iterables.difference([None, [1], 124, None, "1"], [[1]], (124,)),
+        await async_iterables.symmetric_difference([None, [1], 124, None], [[1], 5], (5, 6))
+    )
+    if result != ([None, [1]], [None, "1"], [None, 124, 6]):
+        print("iterables set operations returned wrong items or order. Returned:", result)
+
+    result = [x async for x in async_iterables.parallel_map(abs, range(-500, 500), concurrency=10)]
+    if result != [abs(x) for x in range(-500, 500)] or await async_iterables.parallel_reduce(max, range(1000), chunk_size=64) != 999:
+        print("iterables.parallel_map/parallel_reduce returned wrong results.")
+
+    records = (complex(x, x) if x % 2 else "_NO_ATTR" for x in range(1_000))
+    stream = await async_iterables.iget_attr_data(await async_iterables.iremove_type(records, str), "imag")
+    result = [sum(chunk) for chunk in await async_iterables.chunker(stream, 100)]
+    if result != [10_000.0 + 20_000 * n for n in range(5)]:
+        print("iterables streaming pipeline returned wrong results. Returned:", result)
+
+    result = (
+        list(itertools.islice(await async_iterables.sliding_window(itertools.count(), 3, step=2), 3)),
+        [view.tolist() for view in await async_iterables.tumbling_window(range(7), 3, typecode="q")],
+        list(await async_iterables.session_window([1, 2, 4, 10, 11, 20], key=float, gap=2))
+    )
+    if result != ([(0, 1, 2), (2, 3, 4), (4, 5, 6)], [[0, 1, 2], [3, 4, 5], [6]], [[1, 2, 4], [10, 11], [20]]):
+        print("iterables window functions returned wrong windows. Returned:", result)
+
+    records = [(x * 7919 % 1_000, x) for x in range(5_000)]
+    result = (
+        list(await async_iterables.external_sort(records, key=operator.itemgetter(0), max_memory=4_096)) == sorted(records, key=operator.itemgetter(0)),
+        list(await async_iterables.unique((x % 97 for x in range(5_000)), max_memory=512, codec="marshal")) == list(range(97))
+    )
+    if result != (True, True):
+        print("iterables.external_sort/unique returned wrong results. Returned:", result)
\ No newline at end of file
@@ -8,13 +8,17 @@ def sync_custom() -> None:
     import xRedUtils.cache as cache_module
 
     result: list[type] = sync_modules.get_types_of_module(cache_module)
-    if len(result) != 5:
-        print(f"modules.get_types_of_module returned {len(result)}, expected 5.")
+    if len(result) != 22:
+        print(f"modules.get_types_of_module returned {len(result)}, expected 22.")
 
 
 async def async_custom() -> None:
     import xRedUtilsAsync.cache as cache_module
 
     result: list[type] = await async_modules.get_types_of_module(cache_module)
-    if len(result) != 5:
-        print(f"modules.get_types_of_module returned {len(result)}, expected 5.")
+    if len(result) != 0:
+        print(f"modules.get_types_of_module returned {len(result)}, expected 0.")
+
+    result = await async_modules.get_types_of_module(cache_module, include_imports=True)
+    if cache_module.LRUCache not in result or cache_module.CacheStats not in result:
+        print("modules.get_types_of_module did not include imported types. Returned:", result)
@@ -0,0 +1,66 @@
+import sys
+sys.dont_write_bytecode = True
+
+import xRedUtils.probabilistic as sync_probabilistic
+import xRedUtilsAsync.probabilistic as async_probabilistic
+
+
+def sync_custom(_pmodule = None) -> None:
+    PROBABILISTIC = _pmodule or sync_probabilistic
+
+    # Bloom filter
+    for algorithm in ("blake2b", "crc32"):
+        bloom = PROBABILISTIC.BloomFilter(capacity=10_000, error_rate=0.01, algorithm=algorithm)
+        bloom.update(range(10_000))
+
+        if not all(item in bloom for item in range(10_000)):
+            print(f"Error with BloomFilter ({algorithm}), an added item is missing.")
+
+        false_positives: int = sum(item in bloom for item in range(10_000, 20_000))
+        if false_positives > 200:
+            print(f"Error with BloomFilter ({algorithm}), {false_positives} false positives out of 10000, expected about 100.")
+
+    first = PROBABILISTIC.BloomFilter(capacity=1_000)
+    first.update(["a", "b", b"c"])
+    second = PROBABILISTIC.BloomFilter(capacity=1_000)
+    second.update([b"c", 4])
+
+    if not ("a" in first | second and 4 in first | second and "c" in first & second and "4" not in first | second):
+        print("Error with BloomFilter, union/intersection lost items.")
+
+    if PROBABILISTIC.BloomFilter.from_bytes(first.to_bytes()) != first:
+        print("Error with BloomFilter, serialized filter differs after loading.")
+
+    numbers = PROBABILISTIC.BloomFilter(capacity=1_000)
+    numbers.update([1, 2.5])
+    if not (1.0 in numbers and True in numbers and 2.5 in numbers and "1" not in numbers):
+        print("Error with BloomFilter, equal numbers are not one item.")
+
+    try:
+        numbers.add(frozenset((1, 2)))
+        print("Error with BloomFilter, an item without canonical bytes was accepted.")
+    except TypeError:
+        pass
+
+    try:
+        first | PROBABILISTIC.BloomFilter(capacity=2_000)
+        print("Error with BloomFilter, filters of different sizes were combined.")
+    except ValueError:
+        pass
+
+    # HyperLogLog
+    counter = PROBABILISTIC.HyperLogLog(precision=12)
+    counter.update(item % 50_000 for item in range(100_000))
+    other = PROBABILISTIC.HyperLogLog(precision=12)
+    other.update(range(25_000, 75_000))
+
+    result = (len(counter), len(counter | other), len(PROBABILISTIC.HyperLogLog()))
+    if not (47_000 < result[0] < 53_000 and 70_000 < result[1] < 80_000 and result[2] == 0):
+        print(f"Error with HyperLogLog, estimates {result} too far from (50000, 75000, 0).")
+
+    if PROBABILISTIC.HyperLogLog.from_bytes(counter.to_bytes()) != counter:
+        print("Error with HyperLogLog, serialized counter differs after loading.")
+
+async def async_custom() -> None:
+    # structures are sync, passing to sync_custom
+    sync_custom(async_probabilistic)
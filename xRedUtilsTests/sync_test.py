@@ -22,6 +22,7 @@ def load_modules() -> list:
         modules as test_modules,
         objects as test_objects,
         paths as test_paths,
+        probabilistic as test_probabilistic,
         regexes as test_regexes,
         strings as test_strings,
         times as test_times,
@@ -30,7 +31,7 @@ def load_modules() -> list:
 
     return [
         test_cache, test_colors, test_dates, test_dicts, test_errors, test_funcs, test_general, test_generators,
-        test_hashing, test_iterables, test_maths, test_modules, test_objects, test_paths, test_regexes, test_strings,
+        test_hashing, test_iterables, test_maths, test_modules, test_objects, test_paths, test_probabilistic, test_regexes, test_strings,
         test_times, test_tconverters
     ]
 